@@ -1,14 +1,97 @@
 import os
 import re
+import sys
+import json
+import hashlib
+from multiprocessing import Pool
 from pathlib import Path
 from PyPDF2 import PdfReader
 import markdown
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from game.rules_index import build_index
+
+# Patterns are compiled once and shared by the main process and the page workers
+HEADER_FOOTER_PATTERNS = [
+    re.compile(r'Cepheus Engine SRD\s+\d+\s+Samardan Pre?ss'),
+    re.compile(r'Tanaël Ghazarian \(order #\d+\)'),
+]
+WHITESPACE_PATTERN = re.compile(r'\s+')
+LINE_BREAK_PATTERN = re.compile(r'(?<=[a-z])\s*\n\s*(?=[a-z])')
+PUNCTUATION_SPACE_PATTERN = re.compile(r'\s+([.,;:!?])')
+
+SECTION_PATTERNS = {
+    'core': re.compile(r'(?i)(?:introduction|basic rules|game concepts)'),
+    'character': re.compile(r'(?i)(?:character creation|character development|characteristics)'),
+    'skills': re.compile(r'(?i)(?:skills|skill checks|skill list)'),
+    'combat': re.compile(r'(?i)(?:combat|weapons|armor|fighting)'),
+    'trade': re.compile(r'(?i)(?:trade|commerce|economics|market)'),
+    'space': re.compile(r'(?i)(?:space travel|starships|space combat|jump drive)'),
+}
+
+CACHE_VERSION = 1
+
+def clean_text(text: str) -> str:
+    """Clean up extracted text"""
+    # Remove page headers and footers
+    for pattern in HEADER_FOOTER_PATTERNS:
+        text = pattern.sub('', text)
+    
+    # Fix multiple spaces
+    text = WHITESPACE_PATTERN.sub(' ', text)
+    
+    # Fix line breaks
+    text = LINE_BREAK_PATTERN.sub(' ', text)
+    
+    # Remove duplicate spaces around punctuation
+    text = PUNCTUATION_SPACE_PATTERN.sub(r'\1', text)
+    
+    return text.strip()
+
+# Each pool worker opens the PDF once and then extracts pages by index
+_worker_reader: Optional[PdfReader] = None
+
+def _init_worker(pdf_path: str):
+    global _worker_reader
+    _worker_reader = PdfReader(pdf_path)
+
+def _process_page(index: int) -> str:
+    return clean_text(_worker_reader.pages[index].extract_text())
+
+class SectionWriter:
+    """Appends paragraphs to per-section markdown files as they arrive"""
+    def __init__(self, output_dir: str, sections: List[str]):
+        self.output_dir = output_dir
+        self.files = {}
+        for section in sections:
+            os.makedirs(os.path.join(output_dir, section), exist_ok=True)
+    
+    def path(self, section: str) -> str:
+        return os.path.join(self.output_dir, section, f"{section}.md")
+    
+    def write(self, section: str, paragraph: str):
+        f = self.files.get(section)
+        if f is None:
+            f = self.files[section] = open(self.path(section), 'w', encoding='utf-8')
+            f.write(f"# {section.title()} Rules\n\n")
+        else:
+            f.write('\n\n')
+        f.write(paragraph)
+    
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files.clear()
 
 class PDFConverter:
-    def __init__(self, pdf_path: str, output_dir: str):
+    def __init__(self, pdf_path: str, output_dir: str, workers: Optional[int] = None,
+                 cache_path: Optional[str] = None):
         self.pdf_path = pdf_path
         self.output_dir = output_dir
+        self.workers = workers
+        # Cleaned page text keyed by a hash of each page's content stream
+        self.cache_path = cache_path or f"{pdf_path}.pages.json"
         self.reader = PdfReader(pdf_path)
         self.sections = {
             'core': [],
@@ -21,52 +104,76 @@ class PDFConverter:
     
     def clean_text(self, text: str) -> str:
         """Clean up extracted text"""
-        # Remove page headers and footers
-        text = re.sub(r'Cepheus Engine SRD\s+\d+\s+Samardan Pre?ss', '', text)
-        text = re.sub(r'Tanaël Ghazarian \(order #\d+\)', '', text)
-        
-        # Fix multiple spaces
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Fix line breaks
-        text = re.sub(r'(?<=[a-z])\s*\n\s*(?=[a-z])', ' ', text)
-        
-        # Remove duplicate spaces around punctuation
-        text = re.sub(r'\s+([.,;:!?])', r'\1', text)
-        
-        return text.strip()
+        return clean_text(text)
+    
+    def page_hashes(self) -> List[str]:
+        """Hash each page's raw content, which is much cheaper than extracting its text"""
+        hashes = []
+        for page in self.reader.pages:
+            contents = page.get_contents()
+            data = contents.get_data() if contents is not None else b''
+            hashes.append(hashlib.sha256(data).hexdigest())
+        return hashes
+    
+    def load_cache(self) -> Dict[str, str]:
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('version') == CACHE_VERSION:
+                return cache['pages']
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+    
+    def save_cache(self, pages: Dict[str, str]):
+        Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'pages': pages}, f)
+        os.replace(tmp_path, self.cache_path)
+    
+    def iter_pages(self) -> Iterator[str]:
+        """Yield cleaned page text in page order, extracting only changed pages on a pool"""
+        hashes = self.page_hashes()
+        cache = self.load_cache()
+        missing = [i for i, page_hash in enumerate(hashes) if page_hash not in cache]
+        print(f"{len(hashes) - len(missing)} of {len(hashes)} pages unchanged since last run")
         
+        fresh = {}
+        pool = Pool(self.workers, _init_worker, (self.pdf_path,)) if missing else None
+        try:
+            extracted = pool.imap(_process_page, missing, chunksize=4) if pool else iter(())
+            for page_hash in hashes:
+                if page_hash in cache:
+                    text = cache[page_hash]
+                else:
+                    text = next(extracted)
+                fresh[page_hash] = text
+                yield text
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+        self.save_cache(fresh)
+    
     def extract_text(self) -> str:
         """Extract text from PDF"""
-        text = ""
-        for page in self.reader.pages:
-            page_text = page.extract_text()
-            text += self.clean_text(page_text) + "\n\n"
-        return text
+        return ''.join(page + "\n\n" for page in self.iter_pages())
+    
+    def classify(self, para: str, current_section: str) -> str:
+        """Switch sections when a paragraph matches a section header"""
+        for section, pattern in SECTION_PATTERNS.items():
+            if pattern.search(para):
+                return section
+        return current_section
     
     def organize_content(self, text: str) -> Dict[str, List[str]]:
         """Organize content into sections based on headers"""
-        # Define section headers and their corresponding categories
-        section_patterns = {
-            'core': r'(?i)(?:introduction|basic rules|game concepts)',
-            'character': r'(?i)(?:character creation|character development|characteristics)',
-            'skills': r'(?i)(?:skills|skill checks|skill list)',
-            'combat': r'(?i)(?:combat|weapons|armor|fighting)',
-            'trade': r'(?i)(?:trade|commerce|economics|market)',
-            'space': r'(?i)(?:space travel|starships|space combat|jump drive)'
-        }
-        
-        # Split text into sections
         current_section = 'core'
         sections = {k: [] for k in self.sections.keys()}
         
-        paragraphs = text.split('\n\n')
-        for para in paragraphs:
-            # Check if paragraph matches any section header
-            for section, pattern in section_patterns.items():
-                if re.search(pattern, para):
-                    current_section = section
-                    break
+        for para in text.split('\n\n'):
+            current_section = self.classify(para, current_section)
             
             # Add paragraph to current section if it's not empty
             if para.strip():
@@ -76,29 +183,30 @@ class PDFConverter:
     
     def create_markdown(self, sections: Dict[str, List[str]]) -> None:
         """Create markdown files for each section"""
-        # Create output directory structure
-        for section in sections.keys():
-            os.makedirs(os.path.join(self.output_dir, section), exist_ok=True)
-        
-        # Create markdown files
-        for section, content in sections.items():
-            if content:
-                output_path = os.path.join(self.output_dir, section, f"{section}.md")
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(f"# {section.title()} Rules\n\n")
-                    f.write('\n\n'.join(content))
+        writer = SectionWriter(self.output_dir, list(sections.keys()))
+        try:
+            for section, content in sections.items():
+                for para in content:
+                    writer.write(section, para)
+        finally:
+            writer.close()
     
     def convert(self):
-        """Main conversion process"""
-        print("Extracting text from PDF...")
-        text = self.extract_text()
-        
-        print("Organizing content into sections...")
-        sections = self.organize_content(text)
-        
-        print("Creating markdown files...")
-        self.create_markdown(sections)
+        """Main conversion process, writing sections as pages arrive"""
+        print("Extracting text from PDF and writing sections...")
+        writer = SectionWriter(self.output_dir, list(self.sections.keys()))
+        current_section = 'core'
+        try:
+            for page in self.iter_pages():
+                # Each cleaned page is a single paragraph
+                current_section = self.classify(page, current_section)
+                if page.strip():
+                    writer.write(current_section, page.strip())
+        finally:
+            writer.close()
         
+        # Offsets in the index point into the files just written
+        print(f"Indexed rules into {build_index(self.output_dir)}")
         print("Conversion complete!")
 
 if __name__ == "__main__":
@@ -108,4 +216,4 @@ if __name__ == "__main__":
     
     # Convert PDF
     converter = PDFConverter("Cepheus_SRD.pdf", output_dir)
-    converter.convert() 
\ No newline at end of file
+    converter.convert()
@@ -0,0 +1,48 @@
+import argparse
+import time
+from game.balance import BalanceRunner
+from game.simulation import ShipOperations
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded Space Tycoon campaigns for balance tuning")
+    parser.add_argument("--campaigns", type=int, default=100, help="number of campaigns to play")
+    parser.add_argument("--ticks", type=int, default=10000, help="ticks per campaign")
+    parser.add_argument("--seed", type=int, default=None, help="base random seed")
+    parser.add_argument("--schedule", default="In Space,In Space,Docked",
+                        help="comma separated activation contexts, cycled per tick")
+    parser.add_argument("--sample-every", type=int, default=100,
+                        help="ticks between credit and fuel samples")
+    parser.add_argument("--travel", default="In Space",
+                        help="comma separated contexts in which the ship is underway")
+    parser.add_argument("--dock", default="Docked",
+                        help="comma separated contexts in which the ship refuels and repairs")
+    parser.add_argument("--wear-rate", type=float, default=0.001,
+                        help="mean system health lost per tick underway")
+    parser.add_argument("--fuel-burn", type=float, default=0.1, help="fuel used per tick underway")
+    parser.add_argument("--fuel-price", type=float, default=5.0, help="credits per ton of fuel")
+    parser.add_argument("--repair-cost", type=float, default=1.0,
+                        help="credits per percentage point of system health repaired")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument("--npz", default="balance.npz", help="columnar output file")
+    parser.add_argument("--csv", default=None, help="optional per-event CSV summary")
+    args = parser.parse_args()
+    
+    runner = BalanceRunner(args.campaigns, args.ticks, seed=args.seed,
+                           context_schedule=args.schedule.split(","),
+                           sample_every=args.sample_every, workers=args.workers,
+                           operations=ShipOperations(args.travel.split(","), args.dock.split(","),
+                                                     args.wear_rate, args.fuel_burn,
+                                                     args.fuel_price, args.repair_cost))
+    start = time.perf_counter()
+    results = runner.run()
+    elapsed = time.perf_counter() - start
+    
+    results.write_npz(args.npz)
+    if args.csv:
+        results.write_csv(args.csv)
+    print(f"Played {args.campaigns} campaigns of {args.ticks} ticks in {elapsed:.2f}s")
+    for (context, title), rate in zip(results.event_keys, results.trigger_frequencies()):
+        print(f"  {context} / {title}: {rate:.4f} per tick")
+
+if __name__ == "__main__":
+    main()
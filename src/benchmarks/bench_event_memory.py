@@ -0,0 +1,72 @@
+import sys
+import os
+import gc
+import random
+import tempfile
+import tracemalloc
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.event_manager import EventManager
+
+CONTEXTS = ["In Space", "Docked", "Weekly", "Jump Engines Activated", "Any"]
+SOURCES = ["random", "location", "trade", "crew", "skill", "reputation", "mission"]
+OUTCOMES = ["fight", "flee", "trade", "ignore", "repair", "negotiate"]
+
+class LegacyEvent:
+    """The pre-__slots__ Event layout, kept for comparison"""
+    def __init__(self, source, activation_rate, context, title, description, choices):
+        self.source = source
+        self.activation_rate = activation_rate
+        self.context = context
+        self.title = title
+        self.description = description
+        self.choices = choices
+        self.return_to_stack = True
+
+def write_synthetic_pack(path: Path, count: int, seed: int = 0):
+    """Write an XML event pack with count randomly generated events"""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<events>\n')
+        for i in range(count):
+            f.write(f'    <event source="{rng.choice(SOURCES)}" '
+                    f'activation_rate="{rng.random():.3f}" context="{rng.choice(CONTEXTS)}">\n')
+            f.write(f'        <title>Synthetic Event {i}</title>\n')
+            f.write(f'        <description>Synthetic description {i}.</description>\n')
+            for outcome in rng.sample(OUTCOMES, 3):
+                f.write(f'        <choice text="{outcome.title()}" outcome="{outcome}" />\n')
+            f.write('    </event>\n')
+        f.write('</events>\n')
+
+def measure(build) -> tuple:
+    """Return (result, bytes allocated and still live after build())"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def main(count: int = 100_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        write_synthetic_pack(Path(tmp) / "synthetic.xml", count)
+        manager, compact_bytes = measure(
+            lambda: EventManager(events_dir=tmp, cache_path=None, load_workers=1))
+        
+    # Rebuild the same events in the legacy dict-per-choice layout for comparison
+    def build_legacy():
+        return [LegacyEvent(str(e.source), e.activation_rate, str(e.context), e.title,
+                            e.description, [{"text": c.text, "outcome": c.outcome}
+                                            for c in e.choices])
+                for e in manager.event_stack]
+    _, legacy_bytes = measure(build_legacy)
+    
+    loaded = len(manager.event_stack)
+    print(f"Events loaded:        {loaded}")
+    print(f"Compact bytes/event:  {compact_bytes / loaded:.0f}")
+    print(f"Legacy bytes/event:   {legacy_bytes / loaded:.0f} (layout only, shares strings)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
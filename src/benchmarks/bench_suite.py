@@ -0,0 +1,245 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from benchmarks.bench_event_memory import CONTEXTS, measure, write_synthetic_pack
+from game.crew import CrewManager, CrewMember
+from game.event_manager import EventManager
+from game.fleet import Fleet
+from game.ship import Ship
+from game.simulation import Simulation
+
+DEFAULT_SIZES = [1_000, 100_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SKILLS = ["Pilot", "Engineering", "Medic", "Gunnery", "Broker", "Navigation", "Steward", "Admin"]
+GOODS = [f"Trade Good {i}" for i in range(1000)]
+
+# metric name: {"value": ..., "unit": ..., "better": "lower" or "higher"}
+Results = Dict[str, Dict]
+
+def timed(function: Callable, repeat: int = 5) -> float:
+    """Best wall time of function() over repeat runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def record(results: Results, name: str, value: float, unit: str, better: str = "lower"):
+    results[name] = {"value": value, "unit": unit, "better": better}
+
+def make_crew(count: int, seed: int = 0) -> List[CrewMember]:
+    rng = random.Random(seed)
+    return [CrewMember(f"Crew {i}", {skill: rng.randint(0, 4) for skill in rng.sample(SKILLS, 3)},
+                       {"STR": rng.randint(2, 12), "DEX": rng.randint(2, 12),
+                        "EDU": rng.randint(2, 12)})
+            for i in range(count)]
+
+def make_ship(crew: List[CrewMember], cargo_items: int, passengers: int) -> Ship:
+    ship = Ship()
+    for member in crew:
+        ship.add_crew(member)
+    for item in GOODS[:cargo_items]:
+        ship.add_cargo(item, 10)
+    for i in range(passengers):
+        ship.add_passenger({"name": f"Passenger {i}"})
+    return ship
+
+def bench_events(results: Results, size: int, workdir: Path):
+    """load_events time and memory, activation throughput and resolve cost for one pack size"""
+    events_dir = workdir / f"events_{size}"
+    events_dir.mkdir()
+    write_synthetic_pack(events_dir / "synthetic.xml", size)
+    cache_path = workdir / f"events_{size}.pickle"
+
+    def load(cache: Optional[Path]) -> EventManager:
+        return EventManager(events_dir=str(events_dir), cache_path=str(cache) if cache else None)
+    record(results, f"events.{size}.load_cold_s", timed(lambda: load(None), repeat=1), "s")
+    load(cache_path)
+    record(results, f"events.{size}.load_cached_s", timed(lambda: load(cache_path), repeat=3), "s")
+    manager, live_bytes = measure(lambda: EventManager(
+        events_dir=str(events_dir), cache_path=None, load_workers=1))
+    record(results, f"events.{size}.load_bytes_per_event", live_bytes / size, "B")
+
+    # Per-event rolls are the slow path; keep its call count proportional to the work
+    calls = max(1, 200_000 // size)
+    elapsed = timed(lambda: [manager.get_active_events(CONTEXTS[i % 4]) for i in range(calls)],
+                    repeat=3)
+    record(results, f"events.{size}.get_active_events_per_s", calls / elapsed, "calls/s", "higher")
+    manager.batch_activation = True
+    manager.seed(0)
+    elapsed = timed(lambda: [manager.get_active_events(CONTEXTS[i % 4])
+                             for i in range(calls * 10)], repeat=3)
+    record(results, f"events.{size}.batch_active_events_per_s", calls * 10 / elapsed,
+           "calls/s", "higher")
+
+    # Resolve a full batch of drawn events back onto the stack; drawing them is setup
+    batch = list(manager.event_stack)[:min(size, 1000)]
+    def resolve_batch() -> float:
+        for event in batch:
+            manager.remove_event(event)
+            manager.active_events.append(event)
+        start = time.perf_counter()
+        for event in batch:
+            manager.resolve_event(event, 0)
+        return time.perf_counter() - start
+    best = min(resolve_batch() for _ in range(5))
+    record(results, f"events.{size}.resolve_event_us", best / len(batch) * 1e6, "us")
+
+def bench_crew(results: Results, size: int):
+    """Skill queries and checks over a large crew"""
+    manager = CrewManager(seed=0)
+    for member in make_crew(size):
+        manager.add_crew(member)
+    # Time joining a crew of this size, then leave it as it was for the queries
+    batches = iter([make_crew(100, seed=repeat + 1) for repeat in range(3)])
+    joined = []
+    def join_batch():
+        batch = next(batches)
+        for member in batch:
+            manager.add_crew(member)
+        joined.extend(batch)
+    record(results, f"crew.{size}.add_crew_us", timed(join_batch, repeat=3) / 100 * 1e6, "us")
+    for member in joined:
+        manager.remove_crew(member)
+    record(results, f"crew.{size}.get_crew_with_skill_us",
+           timed(lambda: manager.get_crew_with_skill("Pilot", 2)) * 1e6, "us")
+    record(results, f"crew.{size}.group_skill_check_us",
+           timed(lambda: manager.group_skill_check("Engineering", 2)) * 1e6, "us")
+
+def bench_fleet(results: Results, size: int):
+    """Vectorized wear, fuel burn and repair over a large fleet"""
+    fleet = Fleet(capacity=size)
+    for i in range(size):
+        ship = Ship()
+        fleet.add(ship, npc=True, wear_rate=0.001, fuel_burn=0.01)
+        fleet.set_underway(ship, i % 2 == 0)
+    record(results, f"fleet.{size}.update_us", timed(fleet.update) * 1e6, "us")
+    record(results, f"fleet.{size}.repair_us",
+           timed(lambda: fleet.repair(0.01, cost_per_point=1.0)) * 1e6, "us")
+
+def bench_ui(results: Results, crew: int, cargo_items: int, passengers: int):
+    """Frame time for a full redraw and for an unchanged frame with a crowded ship"""
+    import pygame
+    from game.ui import UIManager
+
+    class BenchGame:
+        def __init__(self):
+            self.ship = make_ship(make_crew(crew), cargo_items, passengers)
+
+    pygame.init()
+    try:
+        screen = pygame.Surface((1024, 768))
+        ui = UIManager(BenchGame())
+        ui.render(screen)
+        def full_frame():
+            ui.invalidate()
+            ui.render(screen)
+        record(results, "ui.full_frame_ms", timed(full_frame, repeat=20) * 1e3, "ms")
+        record(results, "ui.idle_frame_ms", timed(lambda: ui.render(screen), repeat=20) * 1e3, "ms")
+    finally:
+        pygame.quit()
+
+def bench_headless(results: Results, ticks: int, size: int, workdir: Path):
+    """Headless tick rate over the synthetic pack bench_events wrote for one size"""
+    manager = EventManager(batch_activation=True, events_dir=str(workdir / f"events_{size}"),
+                           cache_path=None)
+    simulation = Simulation(seed=0, context_schedule=CONTEXTS, event_manager=manager)
+    elapsed = timed(lambda: simulation.run(ticks), repeat=3)
+    record(results, f"headless.{size}.ticks_per_s", ticks / elapsed, "ticks/s", "higher")
+
+def run_suite(sizes: List[int], crew: int, cargo_items: int, passengers: int,
+              ticks: int, fleet: int) -> Results:
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            print(f"Benchmarking {size} events...")
+            bench_events(results, size, Path(tmp))
+        print(f"Benchmarking headless ticks over {min(sizes)} events...")
+        bench_headless(results, ticks, min(sizes), Path(tmp))
+    print(f"Benchmarking crew of {crew}...")
+    bench_crew(results, crew)
+    print(f"Benchmarking fleet of {fleet}...")
+    bench_fleet(results, fleet)
+    print("Benchmarking UI frames...")
+    bench_ui(results, crew, cargo_items, passengers)
+    return results
+
+def machine() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(), "numpy": np.__version__}
+
+def compare(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    """Metrics that got worse than the baseline by more than tolerance (a fraction)"""
+    regressions = []
+    for name, result in sorted(results.items()):
+        before = baseline.get(name)
+        if before is None or not before["value"]:
+            continue
+        ratio = result["value"] / before["value"]
+        if result["better"] == "higher":
+            ratio = 1 / ratio if ratio else float("inf")
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {before['value']:.4g} -> {result['value']:.4g} "
+                               f"{result['unit']} ({(ratio - 1) * 100:.0f}% worse)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Space Tycoon core systems")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated synthetic event pack sizes, e.g. 1000,100000,1000000")
+    parser.add_argument("--crew", type=int, default=1000, help="crew size")
+    parser.add_argument("--cargo", type=int, default=500, help="distinct cargo items")
+    parser.add_argument("--passengers", type=int, default=200, help="passengers aboard")
+    parser.add_argument("--ticks", type=int, default=20000, help="headless ticks to time")
+    parser.add_argument("--fleet", type=int, default=10000, help="ships in the fleet")
+    parser.add_argument("--output", default=None, help="write this run's results as JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="fraction a metric may worsen before it counts as a regression")
+    args = parser.parse_args()
+
+    results = run_suite([int(size) for size in args.sizes.split(",")], args.crew, args.cargo,
+                        args.passengers, args.ticks, args.fleet)
+    report = {"machine": machine(), "results": results}
+    for name, result in sorted(results.items()):
+        print(f"  {name}: {result['value']:.4g} {result['unit']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["machine"] != report["machine"]:
+        print("Warning: baseline was recorded on a different machine or toolchain")
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print("Regressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("No regressions against baseline")
+
+if __name__ == "__main__":
+    main()
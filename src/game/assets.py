@@ -0,0 +1,152 @@
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional, Set, Tuple
+import pygame
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Posted by the loader thread whenever an image finishes, so an idle game loop wakes to show it
+ASSET_LOADED = pygame.event.custom_type()
+
+class TextureCache:
+    """LRU cache of decoded surfaces, bounded by their total pixel memory"""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.surfaces: "OrderedDict[str, pygame.Surface]" = OrderedDict()
+
+    @staticmethod
+    def surface_bytes(surface: pygame.Surface) -> int:
+        return surface.get_pitch() * surface.get_height()
+
+    def get(self, path: str) -> Optional[pygame.Surface]:
+        surface = self.surfaces.get(path)
+        if surface is not None:
+            self.surfaces.move_to_end(path)
+        return surface
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.surfaces
+
+    def put(self, path: str, surface: pygame.Surface):
+        """Cache a surface, evicting least recently used ones to stay within budget"""
+        size = self.surface_bytes(surface)
+        if size > self.max_bytes:
+            return
+        if path in self.surfaces:
+            self.size -= self.surface_bytes(self.surfaces.pop(path))
+        while self.surfaces and self.size + size > self.max_bytes:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.size -= self.surface_bytes(evicted)
+        self.surfaces[path] = surface
+        self.size += size
+
+    def clear(self):
+        self.surfaces.clear()
+        self.size = 0
+
+class AssetManager:
+    """Loads event artwork on a background thread so opening an event never waits on disk.
+
+    The worker only reads and decodes images. Finished surfaces are handed back
+    through a queue and moved into the texture cache by poll() on the main thread,
+    which is also where they are converted to the display format.
+    """
+    def __init__(self, art_dir: str = "data/art", max_bytes: int = 64 * 1024 * 1024,
+                 art_size: Tuple[int, int] = (400, 300), max_prefetch: int = 32):
+        self.art_dir = Path(art_dir)
+        self.cache = TextureCache(max_bytes)
+        self.art_size = art_size  # Images are scaled down to fit this box as they load
+        self.max_prefetch = max_prefetch  # Most likely events to prefetch per context
+        self.requests: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.loaded: "queue.Queue[Tuple[str, Optional[pygame.Surface]]]" = queue.Queue()
+        self.pending: Set[str] = set()  # Requested and not yet in the cache; main thread only
+        self.missing: Set[str] = set()  # Failed to load; not retried
+        self.thread = threading.Thread(target=self._work, name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def _work(self):
+        while True:
+            path = self.requests.get()
+            if path is None:
+                return
+            try:
+                surface = self._load(path)
+            except Exception as e:
+                logger.warning("Could not load artwork %s: %s", path, e)
+                surface = None
+            self.loaded.put((path, surface))
+            if pygame.display.get_init():
+                pygame.event.post(pygame.event.Event(ASSET_LOADED, path=path))
+
+    def _load(self, path: str) -> pygame.Surface:
+        surface = pygame.image.load(str(self.art_dir / path))
+        width, height = surface.get_size()
+        scale = min(self.art_size[0] / width, self.art_size[1] / height, 1.0)
+        if scale < 1.0:
+            surface = pygame.transform.smoothscale(
+                surface, (max(1, int(width * scale)), max(1, int(height * scale))))
+        return surface
+
+    def request(self, path: Optional[str]):
+        """Queue an image for loading unless it is cached, queued or known to be missing"""
+        if not path or path in self.pending or path in self.missing or path in self.cache:
+            return
+        self.pending.add(path)
+        self.requests.put(path)
+
+    def prefetch(self, events: Iterable):
+        """Queue the screen and conclusion artwork of the given events"""
+        for event in events:
+            self.request(event.artwork)
+            self.request(event.conclusion_artwork)
+
+    def prefetch_context(self, event_manager, context: str):
+        """Queue artwork for the events most likely to trigger in a context"""
+        candidates = sorted(event_manager.get_candidate_events(context),
+                            key=lambda event: -event.activation_rate)
+        self.prefetch(candidates[:self.max_prefetch])
+
+    def poll(self, limit: int = 4) -> int:
+        """Move up to limit finished images into the cache; returns how many arrived"""
+        arrived = 0
+        while arrived < limit:
+            try:
+                path, surface = self.loaded.get_nowait()
+            except queue.Empty:
+                break
+            self.pending.discard(path)
+            if surface is None:
+                self.missing.add(path)
+                continue
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha() if surface.get_alpha() else surface.convert()
+            self.cache.put(path, surface)
+            arrived += 1
+        metrics.count("assets.loaded", arrived)
+        return arrived
+
+    def get(self, path: Optional[str]) -> Optional[pygame.Surface]:
+        """The image if it is ready; otherwise request it and return None"""
+        if not path:
+            return None
+        surface = self.cache.get(path)
+        if surface is None:
+            self.request(path)
+        return surface
+
+    def is_ready(self, path: Optional[str]) -> bool:
+        return path in self.cache
+        
+    def is_missing(self, path: Optional[str]) -> bool:
+        """True once an image has failed to load; it will never become ready"""
+        return path in self.missing
+
+    def close(self):
+        """Stop the loader thread"""
+        self.requests.put(None)
+        self.thread.join(timeout=1.0)
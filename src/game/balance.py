@@ -0,0 +1,131 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from .event_manager import EventManager
+from .rng import RandomService
+from .simulation import ShipOperations, Simulation
+
+def run_campaign(seed: int, ticks: int, context_schedule: Sequence[str], sample_every: int,
+                 events_dir: str, cache_path: Optional[str],
+                 operations: Optional[ShipOperations] = None) -> Dict:
+    """Play one seeded campaign headlessly and return its raw statistics"""
+    event_manager = EventManager(batch_activation=True, seed=seed,
+                                 events_dir=events_dir, cache_path=cache_path)
+    simulation = Simulation(seed=seed, context_schedule=list(context_schedule),
+                            event_manager=event_manager, operations=operations)
+    ship = simulation.ship
+    credits = [ship.credits]
+    fuel = [ship.fuel]
+    while simulation.tick_count < ticks:
+        simulation.run(min(sample_every, ticks - simulation.tick_count))
+        credits.append(ship.credits)
+        fuel.append(ship.fuel)
+    return {
+        "seed": seed,
+        "trigger_counts": simulation.trigger_counts,
+        "context_ticks": simulation.context_ticks,
+        "credits": credits,
+        "fuel": fuel,
+        "systems": dict(ship.systems),
+    }
+
+class BalanceResults:
+    """Aggregated statistics from a batch of campaigns, stored column-wise"""
+    def __init__(self, campaigns: List[Dict], ticks: int, sample_every: int):
+        self.ticks = ticks
+        self.seeds = np.array([c["seed"] for c in campaigns], dtype=np.uint64)
+        
+        # One column per (context, event title) seen in any campaign
+        self.event_keys = sorted({(context, title) for c in campaigns
+                                  for context, counts in c["trigger_counts"].items()
+                                  for title in counts})
+        self.trigger_counts = np.array(
+            [[c["trigger_counts"].get(context, {}).get(title, 0)
+              for context, title in self.event_keys] for c in campaigns],
+            dtype=np.int64).reshape(len(campaigns), len(self.event_keys))
+        self.context_ticks = np.array(
+            [[c["context_ticks"].get(context, 0) for context, _ in self.event_keys]
+             for c in campaigns], dtype=np.int64).reshape(self.trigger_counts.shape)
+        
+        self.sample_ticks = np.minimum(np.arange(len(campaigns[0]["credits"])) * sample_every, ticks)
+        self.credits = np.array([c["credits"] for c in campaigns], dtype=np.float64)
+        self.fuel = np.array([c["fuel"] for c in campaigns], dtype=np.float64)
+        
+        self.system_names = sorted(campaigns[0]["systems"])
+        self.systems = np.array([[c["systems"][name] for name in self.system_names]
+                                 for c in campaigns], dtype=np.float64)
+        
+    def trigger_frequencies(self) -> np.ndarray:
+        """Mean triggers per tick spent in the event's context, per event column"""
+        totals = self.context_ticks.sum(axis=0)
+        return np.divide(self.trigger_counts.sum(axis=0), totals,
+                         out=np.zeros(len(self.event_keys)), where=totals > 0)
+        
+    def write_npz(self, path: str):
+        """Write all columns to a compressed NPZ file"""
+        np.savez_compressed(
+            path,
+            seeds=self.seeds,
+            event_contexts=np.array([context for context, _ in self.event_keys], dtype=str),
+            event_titles=np.array([title for _, title in self.event_keys], dtype=str),
+            trigger_counts=self.trigger_counts,
+            context_ticks=self.context_ticks,
+            sample_ticks=self.sample_ticks,
+            credits=self.credits,
+            fuel=self.fuel,
+            system_names=np.array(self.system_names, dtype=str),
+            systems=self.systems,
+        )
+        
+    def write_csv(self, path: str):
+        """Write per-event trigger statistics across campaigns as CSV"""
+        frequencies = self.trigger_frequencies()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["context", "title", "mean_triggers", "std_triggers", "rate_per_tick"])
+            for i, (context, title) in enumerate(self.event_keys):
+                column = self.trigger_counts[:, i]
+                writer.writerow([context, title, f"{column.mean():.4f}",
+                                 f"{column.std():.4f}", f"{frequencies[i]:.6f}"])
+
+class BalanceRunner:
+    """Plays independent seeded campaigns on a process pool for balance tuning"""
+    def __init__(self, campaigns: int, ticks: int, seed: Optional[int] = None,
+                 context_schedule: Optional[Sequence[str]] = None, sample_every: int = 100,
+                 workers: Optional[int] = None, events_dir: str = "data/events",
+                 cache_path: Optional[str] = "data/cache/events.pickle",
+                 operations: Optional[ShipOperations] = None):
+        if campaigns < 1:
+            raise ValueError("At least one campaign is required")
+        self.campaigns = campaigns
+        self.ticks = ticks
+        self.seed = seed
+        self.context_schedule = list(context_schedule or ["In Space"])
+        self.sample_every = max(1, sample_every)
+        self.workers = workers
+        self.events_dir = events_dir
+        self.cache_path = cache_path
+        # Travel wears the ship and burns fuel; docking refuels and repairs it for credits
+        self.operations = operations or ShipOperations(wear_rate=0.001, fuel_burn=0.1,
+                                                       fuel_price=5.0, repair_cost=1.0)
+        
+    def campaign_seeds(self) -> List[int]:
+        """Derive an independent RNG stream seed for every campaign"""
+        return RandomService(self.seed).spawn_seeds(self.campaigns)
+        
+    def run(self) -> BalanceResults:
+        """Run all campaigns and aggregate their statistics"""
+        # Warm the compiled event cache once so workers skip XML parsing
+        EventManager(events_dir=self.events_dir, cache_path=self.cache_path)
+        
+        args = (self.ticks, self.context_schedule, self.sample_every,
+                self.events_dir, self.cache_path, self.operations)
+        seeds = self.campaign_seeds()
+        if self.workers == 1:
+            campaigns = [run_campaign(seed, *args) for seed in seeds]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(run_campaign, seed, *args) for seed in seeds]
+                campaigns = [future.result() for future in futures]
+        return BalanceResults(campaigns, self.ticks, self.sample_every)
@@ -0,0 +1,168 @@
+import operator
+from typing import Callable, Dict, List, NamedTuple, Set, Tuple
+
+# XML-friendly names as well as symbols, since "<" has to be escaped in attributes
+OPERATORS: Dict[str, Callable] = {
+    "lt": operator.lt, "<": operator.lt,
+    "le": operator.le, "<=": operator.le,
+    "gt": operator.gt, ">": operator.gt,
+    "ge": operator.ge, ">=": operator.ge,
+    "eq": operator.eq, "==": operator.eq,
+    "ne": operator.ne, "!=": operator.ne,
+}
+
+# Keys are "<kind>.<name>" for these kinds, or one of the plain keys
+NAMED_KEYS = ("skill", "cargo", "passenger", "system", "reputation")
+PLAIN_KEYS = ("fuel", "credits", "location", "crew")
+
+class Condition(NamedTuple):
+    """A trigger condition comparing a game state key against a value"""
+    key: str
+    op: str
+    value: object
+
+def parse_value(text: str):
+    """Numbers compare numerically, anything else as a string"""
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return text
+
+def make_condition(key: str, op: str = "ge", value: str = "1") -> Condition:
+    """Build a condition from XML attributes; the default means "at least one" """
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown condition operator {op!r}")
+    validate_key(key)
+    return Condition(key, op, parse_value(value))
+
+def validate_key(key: str):
+    """Reject unknown state keys when events are parsed rather than when they are bound"""
+    kind, _, name = (key or "").partition(".")
+    if not ((kind in NAMED_KEYS and name) or key in PLAIN_KEYS):
+        raise ValueError(f"Unknown condition key {key!r}")
+
+class GameState:
+    """Reads state keys from the ship and crew.
+
+    Keys:
+        skill.<name>       best crew level in a skill (-1 if nobody has it)
+        cargo.<item>       quantity of a cargo item aboard
+        passenger.<name>   number of passengers with that name
+        system.<name>      ship system health (0.0 to 1.0)
+        reputation.<name>  standing with a faction
+        fuel, credits, location, crew
+    """
+    def __init__(self, ship, crew_manager):
+        self.ship = ship
+        self.crew_manager = crew_manager
+        self._getters: Dict[str, Callable[[], object]] = {}
+        
+    def getter(self, key: str) -> Callable[[], object]:
+        """Compile a state key into a zero-argument reader"""
+        getter = self._getters.get(key)
+        if getter is None:
+            getter = self._getters[key] = self._compile_key(key)
+        return getter
+        
+    def _compile_key(self, key: str) -> Callable[[], object]:
+        ship = self.ship
+        crew_manager = self.crew_manager
+        kind, _, name = key.partition(".")
+        if kind == "skill" and name:
+            def best_skill():
+                levels = crew_manager.roster.skill_levels(name)
+                return int(levels.max()) if len(levels) else -1
+            return best_skill
+        if kind == "cargo" and name:
+            return lambda: ship.cargo.get(name, 0)
+        if kind == "passenger" and name:
+            return lambda: ship.passenger_names.get(name, 0)
+        if kind == "system" and name:
+            return lambda: ship.systems.get(name, 0.0)
+        if kind == "reputation" and name:
+            return lambda: ship.reputation.get(name, 0.0)
+        if key in ("fuel", "credits", "location"):
+            return lambda: getattr(ship, key)
+        if key == "crew":
+            return lambda: len(crew_manager.crew)
+        raise ValueError(f"Unknown condition key {key!r}")
+        
+    def compile(self, conditions: Tuple[Condition, ...]) -> Callable[[], bool]:
+        """Compile conditions into a single predicate that is true when all hold"""
+        checks = [(self.getter(c.key), OPERATORS[c.op], c.value) for c in conditions]
+        def predicate() -> bool:
+            for getter, op, value in checks:
+                try:
+                    if not op(getter(), value):
+                        return False
+                except TypeError:
+                    return False  # e.g. comparing a number against a string
+            return True
+        return predicate
+
+class ConditionIndex:
+    """Tracks which conditional events are satisfied, re-checking only on state changes"""
+    def __init__(self, state: GameState):
+        self.state = state
+        self.predicates: Dict[int, Callable[[], bool]] = {}  # id(event): predicate
+        self.events: Dict[int, object] = {}
+        self.dependents: Dict[str, Set[int]] = {}  # state key: ids of events reading it
+        self.values: Dict[str, object] = {}  # state key: value when last checked
+        self.satisfied: Set[int] = set()
+        self.order: Dict[int, int] = {}  # id(event): registration number, for stable ordering
+        self._registered = 0
+        
+    def register(self, event) -> bool:
+        """Start tracking an event; returns whether its conditions hold now"""
+        event_id = id(event)
+        self.events[event_id] = event
+        self.order[event_id] = self._registered
+        self._registered += 1
+        self.predicates[event_id] = self.state.compile(event.conditions)
+        for condition in event.conditions:
+            if condition.key not in self.dependents:
+                self.dependents[condition.key] = set()
+                self.values[condition.key] = self.state.getter(condition.key)()
+            self.dependents[condition.key].add(event_id)
+        if self.predicates[event_id]():
+            self.satisfied.add(event_id)
+            return True
+        return False
+        
+    def unregister(self, event):
+        event_id = id(event)
+        if event_id not in self.events:
+            return
+        for condition in event.conditions:
+            dependents = self.dependents.get(condition.key)
+            if dependents is not None:
+                dependents.discard(event_id)
+                if not dependents:
+                    del self.dependents[condition.key]
+                    del self.values[condition.key]
+        del self.events[event_id]
+        del self.order[event_id]
+        del self.predicates[event_id]
+        self.satisfied.discard(event_id)
+        
+    def is_satisfied(self, event) -> bool:
+        return id(event) in self.satisfied
+        
+    def update(self) -> Tuple[List[object], List[object]]:
+        """Re-evaluate events whose state keys changed; returns (now true, now false)"""
+        stale: Set[int] = set()
+        for key, dependents in self.dependents.items():
+            value = self.state.getter(key)()
+            if value != self.values[key]:
+                self.values[key] = value
+                stale |= dependents
+        became_true, became_false = [], []
+        for event_id in sorted(stale, key=self.order.__getitem__):
+            holds = self.predicates[event_id]()
+            if holds and event_id not in self.satisfied:
+                self.satisfied.add(event_id)
+                became_true.append(self.events[event_id])
+            elif not holds and event_id in self.satisfied:
+                self.satisfied.discard(event_id)
+                became_false.append(self.events[event_id])
+        return became_true, became_false
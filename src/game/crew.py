@@ -1,5 +1,7 @@
-from typing import Dict, List
-import random
+from typing import Dict, List, Optional, Set
+import numpy as np
+from .registry import Registry
+from .rng import RandomService, RandomStream, random_service
 
 class CrewMember:
     def __init__(self, name: str, skills: Dict[str, int], characteristics: Dict[str, int]):
@@ -17,13 +19,14 @@ class CrewMember:
         # Update relationships
         pass
         
-    def skill_check(self, skill: str, difficulty: int = 0) -> bool:
+    def skill_check(self, skill: str, difficulty: int = 0,
+                    rng: Optional[RandomStream] = None) -> bool:
         """Make a skill check using Cepheus Engine rules"""
         if skill not in self.skills:
             return False  # Untrained skill check
         
         # Roll 2d6
-        roll = random.randint(1, 6) + random.randint(1, 6)
+        roll = (rng or random_service.stream("crew")).roll_2d6()
         
         # Add skill level and characteristic modifier
         total = roll + self.skills[skill] + difficulty
@@ -31,9 +34,317 @@ class CrewMember:
         # Success if total >= 8
         return total >= 8
 
+class CrewRoster:
+    """Array-backed crew store: a members x skills matrix plus characteristic columns"""
+    UNTRAINED = -1  # Skill matrix value for skills a member does not have
+    
+    def __init__(self, seed: Optional[int] = None, capacity: int = 16,
+                 rng: Optional[RandomStream] = None):
+        self.members: List[CrewMember] = []
+        self.rows: Dict[int, int] = {}  # id(member): row
+        self.skill_columns: Dict[str, int] = {}
+        self.characteristic_columns: Dict[str, int] = {}
+        self.skills = np.full((capacity, 8), self.UNTRAINED, dtype=np.int16)
+        self.characteristics = np.zeros((capacity, 6), dtype=np.int16)
+        self.rng = rng or RandomService(seed).stream("crew")
+        # skill: (rows ordered by level descending, negated levels ascending)
+        self._skill_index: Dict[str, tuple] = {}
+        
+    @classmethod
+    def from_arrays(cls, members: List[CrewMember], skills: np.ndarray, characteristics: np.ndarray,
+                    skill_columns: Dict[str, int], characteristic_columns: Dict[str, int],
+                    rng: Optional[RandomStream] = None) -> "CrewRoster":
+        """Rebuild a roster from saved matrices, one row per member in order"""
+        count = len(members)
+        roster = cls(capacity=max(16, count), rng=rng)
+        roster.members = list(members)
+        roster.rows = {id(member): row for row, member in enumerate(roster.members)}
+        roster.skill_columns = dict(skill_columns)
+        roster.characteristic_columns = dict(characteristic_columns)
+        roster.skills = np.full((roster.skills.shape[0], max(8, skills.shape[1])),
+                                cls.UNTRAINED, dtype=np.int16)
+        roster.skills[:count, :skills.shape[1]] = skills
+        roster.characteristics = np.zeros((roster.characteristics.shape[0],
+                                           max(6, characteristics.shape[1])), dtype=np.int16)
+        roster.characteristics[:count, :characteristics.shape[1]] = characteristics
+        return roster
+        
+    def __len__(self):
+        return len(self.members)
+        
+    def _column(self, columns: Dict[str, int], name: str, matrix_name: str, fill: int) -> int:
+        """Get the column for a skill or characteristic, growing the matrix if needed"""
+        column = columns.get(name)
+        if column is None:
+            column = columns[name] = len(columns)
+            matrix = getattr(self, matrix_name)
+            if column >= matrix.shape[1]:
+                grown = np.full((matrix.shape[0], matrix.shape[1] * 2), fill, dtype=matrix.dtype)
+                grown[:, :matrix.shape[1]] = matrix
+                setattr(self, matrix_name, grown)
+        return column
+        
+    def _write_row(self, row: int, member: CrewMember):
+        self.skills[row] = self.UNTRAINED
+        for skill, level in member.skills.items():
+            column = self._column(self.skill_columns, skill, "skills", self.UNTRAINED)
+            self.skills[row, column] = level
+        self.characteristics[row] = 0
+        for name, value in member.characteristics.items():
+            column = self._column(self.characteristic_columns, name, "characteristics", 0)
+            self.characteristics[row, column] = value
+        self._skill_index.clear()
+        
+    def add(self, member: CrewMember):
+        """Add a member as a new row"""
+        row = len(self.members)
+        if row >= self.skills.shape[0]:
+            self.skills = np.vstack([self.skills, np.full_like(self.skills, self.UNTRAINED)])
+            self.characteristics = np.vstack([self.characteristics,
+                                              np.zeros_like(self.characteristics)])
+        self.members.append(member)
+        self.rows[id(member)] = row
+        self._write_row(row, member)
+        
+    def remove(self, member: CrewMember):
+        """Remove a member by moving the last row into its place"""
+        row = self.rows.pop(id(member), None)
+        if row is None:
+            return
+        last = len(self.members) - 1
+        if row != last:
+            moved = self.members[last]
+            self.members[row] = moved
+            self.rows[id(moved)] = row
+            self.skills[row] = self.skills[last]
+            self.characteristics[row] = self.characteristics[last]
+        self.members.pop()
+        self.skills[last] = self.UNTRAINED
+        self.characteristics[last] = 0
+        self._skill_index.clear()
+        
+    def refresh(self, member: CrewMember):
+        """Re-read a member's skills and characteristics after they change"""
+        row = self.rows.get(id(member))
+        if row is not None:
+            self._write_row(row, member)
+            
+    def skill_levels(self, skill: str) -> np.ndarray:
+        """Get every member's level in a skill (UNTRAINED where they lack it)"""
+        column = self.skill_columns.get(skill)
+        if column is None:
+            return np.full(len(self.members), self.UNTRAINED, dtype=np.int16)
+        return self.skills[:len(self.members), column]
+        
+    def characteristic(self, name: str) -> np.ndarray:
+        """Get every member's value for a characteristic"""
+        column = self.characteristic_columns.get(name)
+        if column is None:
+            return np.zeros(len(self.members), dtype=np.int16)
+        return self.characteristics[:len(self.members), column]
+        
+    def with_skill(self, skill: str, min_level: int = 0) -> List[CrewMember]:
+        """Get members with a skill at min_level or above via the sorted skill index"""
+        index = self._skill_index.get(skill)
+        if index is None:
+            levels = self.skill_levels(skill)
+            order = np.argsort(-levels, kind="stable")
+            index = self._skill_index[skill] = (order, -levels[order])
+        order, negated = index
+        count = np.searchsorted(negated, -max(min_level, 0), side="right")
+        return [self.members[row] for row in np.sort(order[:count])]
+        
+    def skill_checks(self, skill: str, difficulty: int = 0,
+                     members: Optional[List[CrewMember]] = None) -> np.ndarray:
+        """Roll 2d6 skill checks for a group (default: everyone) in one vectorized pass"""
+        if members is None:
+            rows = np.arange(len(self.members))
+        else:
+            rows = np.fromiter((self.rows[id(member)] for member in members),
+                               dtype=np.intp, count=len(members))
+        levels = self.skill_levels(skill)[rows]
+        rolls = self.rng.roll_2d6_array(len(rows))
+        # Same rule as CrewMember.skill_check: untrained fails, otherwise 8+ succeeds
+        return (levels != self.UNTRAINED) & (rolls + levels + difficulty >= 8)
+
+class RelationshipGraph:
+    """Directed crew relationships in a dense matrix indexed by member row.
+
+    matrix[a, b] is how member a feels about member b; linked marks which entries exist.
+    Bulk operations work on the matrix only; call write_back() to refresh the
+    per-member relationships dicts afterwards.
+    """
+    def __init__(self, capacity: int = 16):
+        self.members: List[CrewMember] = []
+        self.rows: Dict[int, int] = {}  # id(member): row
+        self.named: Dict[str, List[CrewMember]] = {}  # name: members with it, in joining order
+        self.mentions: Dict[str, Set[int]] = {}  # name: id() of members whose dicts mention it
+        self.matrix = np.zeros((capacity, capacity), dtype=np.float64)
+        self.linked = np.zeros((capacity, capacity), dtype=bool)
+        self.dirty = False  # True when the matrix has changes not in the members' dicts
+        
+    @classmethod
+    def from_arrays(cls, members: List[CrewMember], linked: tuple,
+                    values: np.ndarray) -> "RelationshipGraph":
+        """Rebuild a graph from saved (rows, columns) of linked cells and their values"""
+        graph = cls(capacity=max(16, len(members)))
+        graph.members = list(members)
+        graph.matrix[linked] = values
+        graph.linked[linked] = True
+        for row, member in enumerate(graph.members):
+            graph.rows[id(member)] = row
+            graph.named.setdefault(member.name, []).append(member)
+            for name in member.relationships:
+                graph.mentions.setdefault(name, set()).add(id(member))
+        return graph
+        
+    def __len__(self):
+        return len(self.members)
+        
+    def add(self, member: CrewMember):
+        """Add a member and import relationships to and from existing members"""
+        row = len(self.members)
+        if row >= self.matrix.shape[0]:
+            size = self.matrix.shape[0] * 2
+            for name in ("matrix", "linked"):
+                old = getattr(self, name)
+                grown = np.zeros((size, size), dtype=old.dtype)
+                grown[:row, :row] = old[:row, :row]
+                setattr(self, name, grown)
+        self.members.append(member)
+        self.rows[id(member)] = row
+        self.named.setdefault(member.name, []).append(member)
+        # Names resolve to the earliest member holding them, as they always have
+        for name, value in member.relationships.items():
+            self.mentions.setdefault(name, set()).add(id(member))
+            other_row = self.rows[id(self.named[name][0])] if name in self.named else row
+            if other_row != row:
+                self.matrix[row, other_row] = value
+                self.linked[row, other_row] = True
+        for other_id in self.mentions.get(member.name, ()):
+            other_row = self.rows.get(other_id)
+            if other_row is None or other_row == row:
+                continue
+            value = self.members[other_row].relationships.get(member.name)
+            if value is not None:
+                self.matrix[other_row, row] = value
+                self.linked[other_row, row] = True
+                
+    def remove(self, member: CrewMember):
+        """Remove a member by moving the last row and column into its place"""
+        row = self.rows.pop(id(member), None)
+        if row is None:
+            return
+        if self.dirty:
+            self.write_back()
+        named = self.named[member.name]
+        named.remove(member)
+        if not named:
+            del self.named[member.name]
+        for name in member.relationships:
+            mentioning = self.mentions.get(name)
+            if mentioning is not None:
+                mentioning.discard(id(member))
+                if not mentioning:
+                    del self.mentions[name]
+        last = len(self.members) - 1
+        for m in (self.matrix, self.linked):
+            if row != last:
+                m[row, :] = m[last, :]
+                m[:, row] = m[:, last]
+                m[row, row] = 0
+            m[last, :] = 0
+            m[:, last] = 0
+        if row != last:
+            moved = self.members[last]
+            self.members[row] = moved
+            self.rows[id(moved)] = row
+        self.members.pop()
+        
+    def set(self, member: CrewMember, other: CrewMember, value: float):
+        """Set how member feels about other"""
+        row, column = self.rows[id(member)], self.rows[id(other)]
+        self.matrix[row, column] = value
+        self.linked[row, column] = True
+        member.relationships[other.name] = value
+        self.mentions.setdefault(other.name, set()).add(id(member))
+        
+    def get(self, member: CrewMember, other: CrewMember) -> Optional[float]:
+        row, column = self.rows[id(member)], self.rows[id(other)]
+        return float(self.matrix[row, column]) if self.linked[row, column] else None
+        
+    def _view(self):
+        n = len(self.members)
+        return self.matrix[:n, :n], self.linked[:n, :n]
+        
+    def decay(self, factor: float):
+        """Scale every relationship towards neutral, e.g. once a week"""
+        matrix, _ = self._view()
+        matrix *= factor
+        self.dirty = True
+        
+    def adjust(self, rows: np.ndarray, columns: np.ndarray, deltas: np.ndarray,
+               low: float = -1.0, high: float = 1.0):
+        """Add deltas to many (row, column) relationships at once, clamped to [low, high]"""
+        matrix, linked = self._view()
+        np.add.at(matrix, (rows, columns), deltas)
+        linked[rows, columns] = True
+        # Only the touched cells can have left the range
+        matrix[rows, columns] = np.clip(matrix[rows, columns], low, high)
+        self.dirty = True
+        
+    def pairs(self, rows: np.ndarray, columns: np.ndarray) -> List[tuple]:
+        matrix, _ = self._view()
+        return [(self.members[r], self.members[c], float(matrix[r, c]))
+                for r, c in zip(rows.tolist(), columns.tolist())]
+        
+    def top_k(self, k: int, hostile: bool = True) -> List[tuple]:
+        """The k most hostile (or friendly) directed relationships as (member, other, value)"""
+        matrix, linked = self._view()
+        fill = np.inf if hostile else -np.inf
+        values = np.where(linked, matrix, fill).ravel()
+        k = min(k, int(linked.sum()))
+        if k <= 0:
+            return []
+        keys = values if hostile else -values
+        picked = np.argpartition(keys, k - 1)[:k]
+        picked = picked[np.argsort(keys[picked], kind="stable")]
+        return self.pairs(*np.unravel_index(picked, matrix.shape))
+        
+    def below(self, threshold: float) -> List[tuple]:
+        """All directed relationships with a value below threshold"""
+        matrix, linked = self._view()
+        return self.pairs(*np.nonzero(linked & (matrix < threshold)))
+        
+    def above(self, threshold: float) -> List[tuple]:
+        """All directed relationships with a value above threshold"""
+        matrix, linked = self._view()
+        return self.pairs(*np.nonzero(linked & (matrix > threshold)))
+        
+    def average(self) -> np.ndarray:
+        """Each member's mean feeling towards the people they have relationships with"""
+        matrix, linked = self._view()
+        counts = linked.sum(axis=1)
+        totals = np.where(linked, matrix, 0).sum(axis=1)
+        return np.divide(totals, counts, out=np.zeros(len(self.members)), where=counts > 0)
+        
+    def write_back(self):
+        """Copy matrix values into each member's relationships dict"""
+        matrix, linked = self._view()
+        for row, member in enumerate(self.members):
+            for column in np.flatnonzero(linked[row]).tolist():
+                name = self.members[column].name
+                member.relationships[name] = float(matrix[row, column])
+                self.mentions.setdefault(name, set()).add(id(member))
+        self.dirty = False
+
 class CrewManager:
-    def __init__(self):
-        self.crew: List[CrewMember] = []
+    def __init__(self, seed: Optional[int] = None,
+                 random_service: Optional[RandomService] = None):
+        self.crew: Registry[CrewMember] = Registry()
+        self.rng = (random_service or RandomService(seed)).stream("crew")
+        self.roster = CrewRoster(rng=self.rng)
+        self.relationships = RelationshipGraph()
         
     def update(self):
         """Update all crew members"""
@@ -43,16 +354,49 @@ class CrewManager:
     def add_crew(self, member: CrewMember):
         """Add a crew member"""
         self.crew.append(member)
+        self.roster.add(member)
+        self.relationships.add(member)
         
     def remove_crew(self, member: CrewMember):
         """Remove a crew member"""
-        if member in self.crew:
-            self.crew.remove(member)
+        if self.crew.discard(member):
+            self.roster.remove(member)
+            self.relationships.remove(member)
             
-    def get_crew_with_skill(self, skill: str) -> List[CrewMember]:
-        """Get all crew members with a specific skill"""
-        return [member for member in self.crew if skill in member.skills]
+    def set_skill(self, member: CrewMember, skill: str, level: int):
+        """Set a crew member's skill level, keeping the roster in sync"""
+        member.skills[skill] = level
+        self.roster.refresh(member)
+            
+    def get_crew_with_skill(self, skill: str, min_level: int = 0) -> List[CrewMember]:
+        """Get all crew members with a specific skill, optionally at a minimum level"""
+        return self.roster.with_skill(skill, min_level)
+        
+    def group_skill_check(self, skill: str, difficulty: int = 0,
+                          members: Optional[List[CrewMember]] = None) -> List[bool]:
+        """Make the same skill check for a group of crew members (default: whole crew)"""
+        if members is None:
+            members = self.crew
+        return self.roster.skill_checks(skill, difficulty, members).tolist()
         
     def get_crew_relationships(self, member: CrewMember) -> Dict[str, float]:
         """Get relationships for a specific crew member"""
-        return member.relationships 
\ No newline at end of file
+        if self.relationships.dirty:
+            self.relationships.write_back()
+        return member.relationships
+        
+    def set_relationship(self, member: CrewMember, other: CrewMember, value: float):
+        """Set how one crew member feels about another"""
+        self.relationships.set(member, other, value)
+        
+    def decay_relationships(self, factor: float):
+        """Move every crew relationship towards neutral by a factor"""
+        self.relationships.decay(factor)
+        
+    def most_hostile_pairs(self, k: int = 1) -> List[tuple]:
+        """The k worst relationships on board as (member, other, value)"""
+        return self.relationships.top_k(k, hostile=True)
+        
+    def relationships_below(self, threshold: float) -> List[tuple]:
+        """All relationships worse than threshold as (member, other, value)"""
+        return self.relationships.below(threshold) 
\ No newline at end of file
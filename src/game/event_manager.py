@@ -1,99 +1,467 @@
-import random
-from typing import List, Dict
-import xml.etree.ElementTree as ET
+import heapq
+import itertools
+import logging
+import sys
+from typing import List, Dict, Optional, NamedTuple, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import os
+import pickle
+import numpy as np
+from lxml import etree
+from .conditions import Condition, ConditionIndex, GameState, make_condition
+from .metrics import metrics
+from .registry import Registry
+from .rng import RandomService, RandomStream, random_service
+
+logger = logging.getLogger(__name__)
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern repeated strings so identical values share one object"""
+    return sys.intern(value) if value is not None else None
+
+class Choice(NamedTuple):
+    """An event choice; also readable as choice["text"] / choice["outcome"]"""
+    text: str
+    outcome: str
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in self._fields else default
+
+    def __reduce__(self):
+        # Route unpickling through the shared table so cached choices stay deduplicated
+        return (make_choice, (self.text, self.outcome))
+
+# Shared table of choices; identical (text, outcome) pairs across events are one object
+_choice_table: Dict[tuple, Choice] = {}
+
+def make_choice(text: str, outcome: str) -> Choice:
+    """Get the shared Choice for a text/outcome pair"""
+    key = (text, outcome)
+    choice = _choice_table.get(key)
+    if choice is None:
+        choice = _choice_table[key] = Choice(_intern(text), _intern(outcome))
+    return choice
+
+def _as_choice(choice) -> Choice:
+    """Accept Choice objects or the legacy {"text", "outcome"} dicts"""
+    return make_choice(choice["text"], choice.get("outcome"))
 
 class Event:
+    __slots__ = ("source", "activation_rate", "context", "title",
+                 "description", "choices", "return_to_stack", "conditions",
+                 "artwork", "conclusion_artwork")
+
     def __init__(self, source: str, activation_rate: float, context: str, 
-                 title: str, description: str, choices: List[Dict]):
-        self.source = source
+                 title: str, description: str, choices: List[Dict],
+                 conditions: Tuple[Condition, ...] = (),
+                 artwork: Optional[str] = None, conclusion_artwork: Optional[str] = None):
+        self.source = _intern(source)
         self.activation_rate = activation_rate
-        self.context = context
+        self.context = _intern(context)
         self.title = title
         self.description = description
-        self.choices = choices
+        self.choices: Tuple[Choice, ...] = tuple(_as_choice(choice) for choice in choices)
         self.return_to_stack = True  # Default behavior
+        # Trigger conditions on ship, crew or reputation state; all must hold to stack
+        self.conditions: Tuple[Condition, ...] = tuple(conditions)
+        # Image paths relative to the art directory, for the event screen and its conclusion
+        self.artwork = artwork
+        self.conclusion_artwork = conclusion_artwork
         
-    def should_activate(self, current_context: str) -> bool:
+    def should_activate(self, current_context: str, rng: Optional[RandomStream] = None) -> bool:
         """Check if the event should activate based on context and rate"""
         if self.context != "Any" and self.context != current_context:
             return False
-        return random.random() < self.activation_rate
+        if rng is None:
+            rng = random_service.stream("events")
+        return rng.random() < self.activation_rate
         
+    def __reduce__(self):
+        return (_restore_event, (self.source, self.activation_rate, self.context, self.title,
+                                 self.description, self.choices, self.return_to_stack,
+                                 self.conditions, self.artwork, self.conclusion_artwork))
+
     def __str__(self):
         return f"Event(title='{self.title}', context='{self.context}', rate={self.activation_rate})"
 
+class TimedEvent:
+    """Handle for an event scheduled to fire at a game time"""
+    __slots__ = ("due_time", "seq", "event", "cancelled")
+
+    def __init__(self, due_time: float, seq: int, event: Event):
+        self.due_time = due_time
+        self.seq = seq
+        self.event = event
+        self.cancelled = False
+
+    def __lt__(self, other: "TimedEvent") -> bool:
+        # Ties fire in scheduling order
+        return (self.due_time, self.seq) < (other.due_time, other.seq)
+
+    def __repr__(self):
+        return f"TimedEvent(due={self.due_time}, event={self.event}, cancelled={self.cancelled})"
+
+def _restore_event(source, activation_rate, context, title, description, choices,
+                   return_to_stack, conditions=(), artwork=None, conclusion_artwork=None) -> Event:
+    """Unpickle an Event, re-interning its strings in this process"""
+    event = Event(source, activation_rate, context, title, description, choices, conditions,
+                  artwork, conclusion_artwork)
+    event.return_to_stack = return_to_stack
+    return event
+
+def parse_event_file(event_file: Path) -> List[Event]:
+    """Stream-parse a single XML event file into Event objects"""
+    events = []
+    for _, event_elem in etree.iterparse(str(event_file), events=("end",), tag="event"):
+        art = event_elem.find("artwork")
+        event = Event(
+            source=event_elem.get("source"),
+            activation_rate=float(event_elem.get("activation_rate")),
+            context=event_elem.get("context"),
+            title=event_elem.findtext("title"),
+            description=event_elem.findtext("description"),
+            choices=[make_choice(choice.get("text"), choice.get("outcome"))
+                     for choice in event_elem.iterfind("choice")],
+            conditions=[make_condition(condition.get("key"), condition.get("op", "ge"),
+                                       condition.get("value", "1"))
+                        for condition in event_elem.iterfind("condition")],
+            artwork=art.get("screen") if art is not None else None,
+            conclusion_artwork=art.get("conclusion") if art is not None else None
+        )
+        events.append(event)
+        # Free the materialized element and any already-processed siblings
+        event_elem.clear(keep_tail=True)
+        while event_elem.getprevious() is not None:
+            del event_elem.getparent()[0]
+    return events
+
+def _parse_event_file_in_worker(event_file: Path) -> List[Event]:
+    """Pool entry point; lxml errors carry unpicklable logs, so resend them as plain errors"""
+    try:
+        return parse_event_file(event_file)
+    except Exception as e:
+        raise ValueError(str(e)) from None
+
 class EventManager:
-    def __init__(self):
-        self.event_stack: List[Event] = []
-        self.active_events: List[Event] = []
-        print("Initializing EventManager...")
+    ANY_CONTEXT = "Any"
+    CACHE_VERSION = 4
+
+    def __init__(self, batch_activation: bool = False, seed: Optional[int] = None,
+                 events_dir: str = "data/events",
+                 cache_path: Optional[str] = "data/cache/events.pickle",
+                 load_workers: Optional[int] = None,
+                 random_service: Optional[RandomService] = None):
+        self.events_dir = Path(events_dir)
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.load_workers = load_workers
+        # A registry so events leave the stack in O(1), matched by identity
+        self.event_stack: Registry[Event] = Registry()
+        self.active_events: Registry[Event] = Registry()
+        # Stacked events bucketed by activation context ("Any" has its own bucket). Buckets
+        # are insertion-ordered dicts used as sets; events hash by identity.
+        self.context_index: Dict[str, Dict[Event, None]] = {}
+        self.stack_revision = 0  # Bumped whenever the stack changes
+        # Conditional events only join their context bucket while their conditions hold
+        self.conditions: Optional[ConditionIndex] = None
+        # Batched activation: one vectorized roll per query against cached rate arrays
+        self.batch_activation = batch_activation
+        self.use_random(random_service or RandomService(seed))
+        self._rate_cache: Dict[str, tuple] = {}
+        # Timed events: a heap of handles ordered by due time; cancelled ones are skipped lazily
+        self.game_time = 0.0
+        self.timed_events: List[TimedEvent] = []
+        self.pending_timed = 0
+        self._timed_seq = itertools.count()
         self.load_events()
         
     def load_events(self):
-        """Load events from XML files"""
-        events_dir = Path("data/events")
-        print(f"Looking for events in {events_dir.absolute()}")
+        """Load events from XML files, reusing the compiled cache for unchanged files"""
+        events_dir = self.events_dir
+        logger.info("Looking for events in %s", events_dir.absolute())
         
         # Create events directory if it doesn't exist
         if not events_dir.exists():
             events_dir.mkdir(parents=True, exist_ok=True)
-            print(f"Created events directory at {events_dir}")
+            logger.info("Created events directory at %s", events_dir)
             return
             
         # Load all XML files in the events directory
-        xml_files = list(events_dir.glob("*.xml"))
+        xml_files = sorted(events_dir.glob("*.xml"))
         if not xml_files:
-            print("No event XML files found")
+            logger.warning("No event XML files found in %s", events_dir)
             return
             
-        print(f"Found {len(xml_files)} event file(s)")
+        logger.debug("Found %d event file(s)", len(xml_files))
+        cache = self.load_event_cache()
+        keys: Dict[str, tuple] = {}
+        loaded: Dict[str, List[Event]] = {}
+        errors: Dict[str, Exception] = {}
         for event_file in xml_files:
             try:
-                print(f"Loading events from {event_file}")
-                tree = ET.parse(event_file)
-                root = tree.getroot()
-                
-                for event_elem in root.findall("event"):
-                    event = Event(
-                        source=event_elem.get("source"),
-                        activation_rate=float(event_elem.get("activation_rate")),
-                        context=event_elem.get("context"),
-                        title=event_elem.find("title").text,
-                        description=event_elem.find("description").text,
-                        choices=[{
-                            "text": choice.get("text"),
-                            "outcome": choice.get("outcome")
-                        } for choice in event_elem.findall("choice")]
-                    )
-                    self.event_stack.append(event)
-                    print(f"Loaded event: {event}")
+                keys[str(event_file)] = self.cache_key(event_file)
             except Exception as e:
-                print(f"Error loading event file {event_file}: {e}")
+                errors[str(event_file)] = e
+                continue
+            entry = cache.get(str(event_file))
+            if entry is not None and entry[0] == keys[str(event_file)]:
+                logger.debug("Loading cached events for %s", event_file)
+                loaded[str(event_file)] = entry[1]
+                
+        stale = [f for f in xml_files if str(f) in keys and str(f) not in loaded]
+        for event_file, result in zip(stale, self.parse_event_files(stale)):
+            if isinstance(result, Exception):
+                errors[str(event_file)] = result
+            else:
+                loaded[str(event_file)] = result
                 
-        print(f"Total events loaded: {len(self.event_stack)}")
+        # Merge in sorted file order so the stack is deterministic
+        compiled: Dict[str, tuple] = {}
+        for event_file in xml_files:
+            path = str(event_file)
+            if path in errors:
+                logger.error("Error loading event file %s: %s", event_file, errors[path])
+                continue
+            compiled[path] = (keys[path], loaded[path])
+            for event in loaded[path]:
+                self.add_event(event)
+            logger.debug("Loaded %d event(s) from %s", len(loaded[path]), event_file)
                 
-    def update(self):
-        """Update event states and check for activations"""
-        # Check for timed events
-        # Check for random events
-        # Check for location-based events
-        # etc.
+        if compiled.keys() != cache.keys() or any(
+                cache[path][0] != entry[0] for path, entry in compiled.items()):
+            self.save_event_cache(compiled)
+        logger.info("Total events loaded: %d", len(self.event_stack))
+
+    def parse_event_files(self, event_files: List[Path]) -> List:
+        """Parse event files, on a process pool when there is more than one"""
+        for event_file in event_files:
+            logger.debug("Parsing events from %s", event_file)
+        if len(event_files) <= 1 or self.load_workers == 1:
+            results = []
+            for event_file in event_files:
+                try:
+                    results.append(parse_event_file(event_file))
+                except Exception as e:
+                    results.append(e)
+            return results
+            
+        with ProcessPoolExecutor(max_workers=self.load_workers) as pool:
+            futures = [pool.submit(_parse_event_file_in_worker, event_file) for event_file in event_files]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    @staticmethod
+    def cache_key(event_file: Path) -> tuple:
+        """Identify a version of an event file by path, mtime and size"""
+        stat = event_file.stat()
+        return (str(event_file), stat.st_mtime_ns, stat.st_size)
+
+    def load_event_cache(self) -> Dict[str, tuple]:
+        """Load the compiled event cache, or an empty one if missing or stale"""
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, "rb") as f:
+                version, entries = pickle.load(f)
+            if version != self.CACHE_VERSION:
+                return {}
+            return entries
+        except Exception as e:
+            logger.warning("Ignoring unreadable event cache %s: %s", self.cache_path, e)
+            return {}
+
+    def save_event_cache(self, entries: Dict[str, tuple]):
+        """Write compiled events so unchanged files skip XML parsing next time"""
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump((self.CACHE_VERSION, entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.error("Error writing event cache %s: %s", self.cache_path, e)
+                
+    def add_event(self, event: Event):
+        """Push an event onto the stack and index it by activation context"""
+        # Activation leaves events on the stack, so resolving one must not stack it twice
+        if event in self.event_stack:
+            return
+        self.event_stack.add(event)
+        if self._is_eligible(event):
+            self._index_event(event)
+        self.stack_revision += 1
+
+    def remove_event(self, event: Event):
+        """Remove an event from the stack and its context bucket"""
+        if self.event_stack.discard(event):
+            self.stack_revision += 1
+        self._unindex_event(event)
+        if self.conditions is not None and event.conditions:
+            self.conditions.unregister(event)
+
+    def set_stack(self, events: List[Event]):
+        """Replace the whole stack at once, rebuilding the context index in bulk"""
+        self.event_stack = Registry(events)
+        self.context_index = {}
+        if self.conditions is not None:
+            self.conditions = ConditionIndex(self.conditions.state)
+        for event in self.event_stack:
+            if self._is_eligible(event):
+                self.context_index.setdefault(event.context, {})[event] = None
+        self._rate_cache.clear()
+        self.stack_revision += 1
+
+    def bind_state(self, ship, crew_manager):
+        """Evaluate event trigger conditions against this ship and crew"""
+        self.conditions = ConditionIndex(GameState(ship, crew_manager))
+        self.set_stack(self.event_stack)
+
+    def _is_eligible(self, event: Event) -> bool:
+        """Unconditional events are always eligible; conditional ones while their conditions hold"""
+        if not event.conditions:
+            return True
+        if self.conditions is None:
+            return False
+        return self.conditions.register(event)
+
+    def _index_event(self, event: Event):
+        self.context_index.setdefault(event.context, {})[event] = None
+        self._invalidate_rates(event.context)
+
+    def _unindex_event(self, event: Event):
+        bucket = self.context_index.get(event.context)
+        if bucket is not None and event in bucket:
+            del bucket[event]
+            if not bucket:
+                del self.context_index[event.context]
+            self._invalidate_rates(event.context)
+
+    def update_conditions(self):
+        """Re-check conditional events whose state keys changed since the last check"""
+        if self.conditions is None:
+            return
+        became_true, became_false = self.conditions.update()
+        for event in became_false:
+            self._unindex_event(event)
+        for event in became_true:
+            self._index_event(event)
+
+    def get_candidate_events(self, context: str) -> List[Event]:
+        """Get stacked events whose activation context can match the given context"""
+        candidates = list(self.context_index.get(context, []))
+        if context != self.ANY_CONTEXT:
+            candidates.extend(self.context_index.get(self.ANY_CONTEXT, []))
+        return candidates
+
+    def seed(self, seed: Optional[int]):
+        """Reseed the generator used for activation rolls"""
+        self.use_random(RandomService(seed))
+
+    def use_random(self, random_service: RandomService):
+        """Draw activation rolls from a service's "events" stream"""
+        self.random = random_service
+        self.rng = random_service.stream("events")
+
+    def _invalidate_rates(self, context: str):
+        """Drop cached rate arrays affected by a change to a context bucket"""
+        if context == self.ANY_CONTEXT:
+            self._rate_cache.clear()
+        else:
+            self._rate_cache.pop(context, None)
+
+    def get_activation_rates(self, context: str) -> tuple:
+        """Get the candidate events and their activation rates as a contiguous array"""
+        cached = self._rate_cache.get(context)
+        if cached is None:
+            candidates = self.get_candidate_events(context)
+            rates = np.fromiter((event.activation_rate for event in candidates),
+                                dtype=np.float64, count=len(candidates))
+            cached = (candidates, rates)
+            self._rate_cache[context] = cached
+        return cached
+
+    def roll_active_events(self, context: str, ticks: int = 1) -> List[List[Event]]:
+        """Roll activation for every candidate event over several ticks in one draw"""
+        candidates, rates = self.get_activation_rates(context)
+        if not candidates or ticks <= 0:
+            return [[] for _ in range(max(ticks, 0))]
+        mask = self.rng.random((ticks, len(candidates))) < rates
+        return [[candidates[i] for i in np.flatnonzero(row)] for row in mask]
+
+    def schedule_event(self, event: Event, due_time: float) -> TimedEvent:
+        """Schedule an event to fire once game time reaches due_time"""
+        handle = TimedEvent(due_time, next(self._timed_seq), event)
+        heapq.heappush(self.timed_events, handle)
+        self.pending_timed += 1
+        return handle
+
+    def schedule_event_in(self, event: Event, delay: float) -> TimedEvent:
+        """Schedule an event to fire delay time units from now"""
+        return self.schedule_event(event, self.game_time + delay)
+
+    def cancel_event(self, handle: TimedEvent):
+        """Cancel a scheduled event; its heap entry is dropped when it surfaces"""
+        if not handle.cancelled:
+            handle.cancelled = True
+            self.pending_timed -= 1
+        # Keep the heap from filling up with dead entries
+        if len(self.timed_events) > 2 * self.pending_timed + 64:
+            self.timed_events = [entry for entry in self.timed_events if not entry.cancelled]
+            heapq.heapify(self.timed_events)
+
+    def reschedule_event(self, handle: TimedEvent, due_time: float) -> TimedEvent:
+        """Move a scheduled event to a new time and return its new handle"""
+        self.cancel_event(handle)
+        return self.schedule_event(handle.event, due_time)
+
+    def update(self, elapsed: float = 1.0) -> List[Event]:
+        """Advance game time, re-check trigger conditions and fire timed events that have come due"""
+        self.update_conditions()
+        self.game_time += elapsed
+        fired = []
+        heap = self.timed_events
+        while heap and heap[0].due_time <= self.game_time:
+            handle = heapq.heappop(heap)
+            if handle.cancelled:
+                continue
+            handle.cancelled = True  # Spent; cancelling it later is a no-op
+            self.pending_timed -= 1
+            self.active_events.append(handle.event)
+            fired.append(handle.event)
+        metrics.count("events.fired", len(fired))
+        return fired
         
     def get_active_events(self, context: str) -> List[Event]:
         """Get events that should activate in the current context"""
-        print(f"Checking for events in context: {context}")
-        active = [event for event in self.event_stack 
-                 if event.should_activate(context)]
-        print(f"Found {len(active)} active events")
+        if self.batch_activation:
+            active = self.roll_active_events(context)[0]
+        else:
+            active = [event for event in self.get_candidate_events(context)
+                     if event.should_activate(context, self.rng)]
+        metrics.count("events.activated", len(active))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found %d active events in context %s", len(active), context)
         return active
                 
     def resolve_event(self, event: Event, choice_index: int):
         """Resolve an event based on player choice"""
-        print(f"Resolving event: {event}")
+        logger.debug("Resolving event %s with choice %d", event.title, choice_index)
         if event.return_to_stack:
-            self.event_stack.append(event)
-        if event in self.active_events:
-            self.active_events.remove(event)
-        print("Event resolved") 
\ No newline at end of file
+            self.add_event(event)
+        self.active_events.discard(event)
+        metrics.count("events.resolved") 
\ No newline at end of file
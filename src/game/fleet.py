@@ -0,0 +1,211 @@
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+from .rng import RandomService
+from .ship import Ship
+
+Rows = Union[np.ndarray, Sequence[int], None]
+
+class SystemsView(MutableMapping):
+    """A fleet ship's systems dict, reading and writing its row of the health matrix"""
+    __slots__ = ("fleet", "ship")
+
+    def __init__(self, fleet: "Fleet", ship: Ship):
+        self.fleet = fleet
+        self.ship = ship
+
+    def __getitem__(self, system: str) -> float:
+        return float(self.fleet.systems[self.fleet.rows[id(self.ship)],
+                                        self.fleet.system_columns[system]])
+
+    def __setitem__(self, system: str, value: float):
+        self.fleet.systems[self.fleet.rows[id(self.ship)], self.fleet.system_columns[system]] = value
+
+    def __delitem__(self, system: str):
+        raise TypeError("Fleet ship systems cannot be removed")
+
+    def __iter__(self):
+        return iter(self.fleet.system_columns)
+
+    def __len__(self):
+        return len(self.fleet.system_columns)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class Fleet:
+    """Many ships updated together: health, fuel and credits live in columns, one row per ship.
+
+    A ship added to the fleet keeps working as a normal Ship, but its systems,
+    fuel, fuel capacity and credits read and write its row here. Wear, fuel burn
+    and repair then run over every ship in one array pass.
+    """
+    SYSTEMS = ("jump_drive", "life_support", "weapons", "shields", "sensors", "engines")
+    COLUMNS = ("systems", "fuel", "fuel_capacity", "credits", "wear_rate", "fuel_burn",
+               "underway", "npc")
+
+    def __init__(self, capacity: int = 16, random_service: Optional[RandomService] = None):
+        self.ships: List[Ship] = []
+        self.rows: Dict[int, int] = {}  # id(ship): row
+        self.system_columns = {system: i for i, system in enumerate(self.SYSTEMS)}
+        self.systems = np.ones((capacity, len(self.SYSTEMS)), dtype=np.float64)
+        self.fuel = np.zeros(capacity, dtype=np.float64)
+        self.fuel_capacity = np.zeros(capacity, dtype=np.float64)
+        self.credits = np.zeros(capacity, dtype=np.int64)
+        self.wear_rate = np.zeros(capacity, dtype=np.float64)  # Mean health lost per system per tick underway
+        self.fuel_burn = np.zeros(capacity, dtype=np.float64)  # Fuel used per tick underway
+        self.underway = np.zeros(capacity, dtype=bool)
+        self.npc = np.zeros(capacity, dtype=bool)
+        self.rng = (random_service or RandomService()).stream("fleet")
+
+    def __len__(self):
+        return len(self.ships)
+
+    def __contains__(self, ship: Ship) -> bool:
+        return id(ship) in self.rows
+
+    def _grow(self):
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.zeros_like(column)]))
+
+    def add(self, ship: Ship, npc: bool = False, wear_rate: float = 0.0,
+            fuel_burn: float = 0.0) -> int:
+        """Move a ship's state into a new row and return the row"""
+        # Checked before anything moves so a rejected ship leaves both fleets untouched
+        unknown = [system for system in ship.systems if system not in self.system_columns]
+        if unknown:
+            raise ValueError(f"Fleet ships cannot have systems {unknown}; "
+                             f"known systems are {list(self.SYSTEMS)}")
+        if ship.fleet is not None:
+            ship.fleet.remove(ship)
+        systems, fuel, fuel_capacity, credits = (dict(ship.systems), ship.fuel,
+                                                 ship.fuel_capacity, ship.credits)
+        row = len(self.ships)
+        if row >= len(self.fuel):
+            self._grow()
+        self.ships.append(ship)
+        self.rows[id(ship)] = row
+        self.systems[row] = 1.0
+        for system, health in systems.items():
+            self.systems[row, self.system_columns[system]] = health
+        self.fuel[row] = fuel
+        self.fuel_capacity[row] = fuel_capacity
+        self.credits[row] = credits
+        self.wear_rate[row] = wear_rate
+        self.fuel_burn[row] = fuel_burn
+        self.underway[row] = False
+        self.npc[row] = npc
+        ship.fleet = self
+        return row
+
+    def remove(self, ship: Ship):
+        """Hand a ship its state back and move the last row into its place"""
+        row = self.rows.get(id(ship))
+        if row is None:
+            return
+        state = (dict(ship.systems), ship.fuel, ship.fuel_capacity, ship.credits)
+        del self.rows[id(ship)]
+        ship.fleet = None
+        ship.systems, ship.fuel, ship.fuel_capacity, ship.credits = state
+
+        last = len(self.ships) - 1
+        if row != last:
+            moved = self.ships[last]
+            self.ships[row] = moved
+            self.rows[id(moved)] = row
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+        self.ships.pop()
+
+    def row(self, ship: Ship) -> int:
+        return self.rows[id(ship)]
+
+    def systems_view(self, ship: Ship) -> SystemsView:
+        return SystemsView(self, ship)
+
+    def _rows(self, rows: Rows) -> np.ndarray:
+        if rows is None:
+            return np.arange(len(self.ships))
+        return np.asarray(rows, dtype=np.intp)
+
+    def set_underway(self, ship: Ship, underway: bool = True,
+                     wear_rate: Optional[float] = None, fuel_burn: Optional[float] = None):
+        """Mark a ship as travelling (wearing systems and burning fuel each tick) or not"""
+        row = self.rows[id(ship)]
+        self.underway[row] = underway
+        if wear_rate is not None:
+            self.wear_rate[row] = wear_rate
+        if fuel_burn is not None:
+            self.fuel_burn[row] = fuel_burn
+
+    def update(self, ticks: int = 1) -> List[Ship]:
+        """Wear systems and burn fuel on every ship underway; returns ships that ran dry"""
+        count = len(self.ships)
+        rows = np.flatnonzero(self.underway[:count])
+        if len(rows) == 0 or ticks <= 0:
+            return []
+        # Each system wears by a random fraction of up to twice the ship's mean rate
+        wear = self.rng.random((len(rows), len(self.SYSTEMS))) * (2 * ticks * self.wear_rate[rows, None])
+        self.systems[rows] = np.maximum(self.systems[rows] - wear, 0.0)
+        stranded = self.burn_fuel(ticks * self.fuel_burn[rows], rows)
+        self.underway[stranded] = False
+        return [self.ships[row] for row in stranded]
+
+    def burn_fuel(self, amounts, rows: Rows = None) -> np.ndarray:
+        """Burn fuel on the given rows (default: all); returns the rows left with an empty tank"""
+        rows = self._rows(rows)
+        fuel = np.maximum(self.fuel[rows] - amounts, 0.0)
+        self.fuel[rows] = fuel
+        return rows[fuel <= 0.0]
+
+    def damage(self, system: str, amounts, rows: Rows = None):
+        """Damage one system on the given rows"""
+        rows = self._rows(rows)
+        column = self.system_columns[system]
+        self.systems[rows, column] = np.maximum(self.systems[rows, column] - amounts, 0.0)
+
+    def repair(self, amount: float, cost_per_point: float = 0.0, rows: Rows = None,
+               system: Optional[str] = None) -> np.ndarray:
+        """Repair every system (or one) by amount, charging credits per percentage point restored.
+
+        Ships that cannot afford the whole repair are skipped. Returns the rows repaired.
+        """
+        rows = self._rows(rows)
+        columns = slice(None) if system is None else [self.system_columns[system]]
+        current = self.systems[rows][:, columns]
+        restored = np.minimum(amount, 1.0 - current)
+        # Rounded first so float noise in the health values never adds a credit
+        cost = np.ceil(np.round(restored.sum(axis=1) * 100 * cost_per_point, 6)).astype(np.int64)
+        affordable = self.credits[rows] >= cost
+        rows, restored, cost = rows[affordable], restored[affordable], cost[affordable]
+        block = self.systems[rows]
+        block[:, columns] += restored
+        self.systems[rows] = block
+        self.credits[rows] -= cost
+        return rows
+
+    def refuel(self, price_per_ton: float = 0.0, rows: Rows = None) -> np.ndarray:
+        """Fill tanks on the given rows, skipping ships that cannot pay; returns the rows filled"""
+        rows = self._rows(rows)
+        needed = self.fuel_capacity[rows] - self.fuel[rows]
+        cost = np.ceil(np.round(needed * price_per_ton, 6)).astype(np.int64)
+        affordable = self.credits[rows] >= cost
+        rows, cost = rows[affordable], cost[affordable]
+        self.fuel[rows] = self.fuel_capacity[rows]
+        self.credits[rows] -= cost
+        return rows
+
+    def ships_at(self, rows: Iterable[int]) -> List[Ship]:
+        return [self.ships[row] for row in rows]
+
+    def needing_repair(self, threshold: float = 0.5) -> List[Ship]:
+        """Ships with any system below threshold"""
+        count = len(self.ships)
+        return self.ships_at(np.flatnonzero((self.systems[:count] < threshold).any(axis=1)))
+
+    def low_on_fuel(self, fraction: float = 0.25) -> List[Ship]:
+        """Ships whose tanks are below a fraction of capacity"""
+        count = len(self.ships)
+        return self.ships_at(np.flatnonzero(self.fuel[:count] < fraction * self.fuel_capacity[:count]))
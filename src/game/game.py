@@ -1,48 +1,112 @@
+import logging
 import sys
 import pygame
+from .assets import AssetManager
 from .event_manager import EventManager
-from .ship import Ship
-from .crew import CrewManager
+from .metrics import metrics
+from .simulation import Simulation
 from .ui import UIManager
 
+logger = logging.getLogger(__name__)
+
 class Game:
-    def __init__(self):
+    def __init__(self, fps: int = 60, idle_timeout_ms: int = 500, show_metrics: bool = False):
+        # Initialize core systems (these need no display)
+        self.simulation = Simulation(event_manager=EventManager())
+        self.event_manager = self.simulation.event_manager
+        self.ship = self.simulation.ship
+        self.fleet = self.simulation.fleet
+        self.crew_manager = self.simulation.crew_manager
+        
         self.screen = pygame.display.set_mode((1024, 768))
         pygame.display.set_caption("Space Tycoon")
-        
-        # Initialize core systems
-        self.event_manager = EventManager()
-        self.ship = Ship()
-        self.crew_manager = CrewManager()
+        self.assets = AssetManager()
+        self.prefetched: tuple = ()  # (context, stack revision) artwork was last prefetched for
         self.ui_manager = UIManager(self)
+        if show_metrics:
+            self.ui_manager.toggle_overlay()
         
         # Game state
         self.running = True
         self.clock = pygame.time.Clock()
+        self.fps = fps  # Frame-rate cap while active; 0 means uncapped
+        self.idle_timeout_ms = idle_timeout_ms  # Longest idle block before re-checking state
+        self.time_advancing = False  # True while waiting, travelling or working
+        self.animating = False  # True while anything on screen is animating
         
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            self.ui_manager.handle_event(event)
+    def is_idle(self) -> bool:
+        """Idle when no simulation time is passing and nothing is animating"""
+        return not self.time_advancing and not self.animating and not self.simulation.has_pending_work()
+        
+    def set_time_advancing(self, advancing: bool = True):
+        """Start or stop the passage of game time (waiting, travelling or working)"""
+        self.time_advancing = advancing
+        
+    def handle_events(self) -> int:
+        """Process pending input, blocking for the next event while idle"""
+        if self.is_idle():
+            first = pygame.event.wait(self.idle_timeout_ms)
+            events = [first] if first.type != pygame.NOEVENT else []
+            events.extend(pygame.event.get())
+        else:
+            events = pygame.event.get()
+            
+        # Time spent blocked waiting for input is not counted against the handlers
+        with metrics.timer("game.handle_events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    self.set_time_advancing(not self.time_advancing)
+                self.ui_manager.handle_event(event)
+        metrics.count("game.input_events", len(events))
+        return len(events)
             
     def update(self):
         # Update game state
-        self.event_manager.update()
-        self.ship.update()
-        self.crew_manager.update()
+        with metrics.timer("game.update"):
+            self.simulation.update()
+            self.prefetch_artwork()
+            
+    def prefetch_artwork(self):
+        """Start loading art for events that could trigger in the current context"""
+        context = self.simulation.context_at(self.simulation.tick_count)
+        key = (context, self.event_manager.stack_revision)
+        if key != self.prefetched:
+            self.prefetched = key
+            self.assets.prefetch_context(self.event_manager, context)
+            self.assets.prefetch(self.event_manager.active_events)
         
     def render(self):
-        self.screen.fill((0, 0, 0))  # Clear screen
-        self.ui_manager.render(self.screen)
-        pygame.display.flip()
+        # Only panels whose state changed are redrawn and pushed to the display
+        with metrics.timer("game.render"):
+            dirty = self.ui_manager.render(self.screen)
+            if dirty:
+                pygame.display.update(dirty)
         
-    def run(self):
-        while self.running:
-            self.handle_events()
+    def step(self):
+        """Run one frame: input, then simulation and drawing unless idle"""
+        idle = self.is_idle()
+        handled = self.handle_events()
+        # Scheduled events and ships underway keep the simulation ticking even while paused
+        if self.time_advancing or self.simulation.has_pending_work():
             self.update()
+        # Idle frames with no input cannot have changed anything on screen; finished
+        # artwork arrives as an ASSET_LOADED event, so it counts as input here
+        if handled or not idle:
             self.render()
-            self.clock.tick(60)  # Cap at 60 FPS
+        if not idle:
+            self.clock.tick(self.fps)
+        metrics.end_frame()
+        
+    def run(self):
+        self.prefetch_artwork()
+        self.render()
+        while self.running:
+            self.step()
             
+        if metrics.enabled:
+            logger.info("Metrics: %s", metrics.summary())
+        self.assets.close()
         pygame.quit()
-        sys.exit() 
\ No newline at end of file
+        sys.exit()
@@ -0,0 +1,159 @@
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from lxml import etree
+from .rng import RandomService, random_service as global_random_service
+from .world import World, TRADE_CODES
+
+class PriceTable:
+    """Buy and sell prices for every good at one world for the current market"""
+    __slots__ = ("purchase", "sale", "available")
+
+    def __init__(self, purchase: np.ndarray, sale: np.ndarray, available: np.ndarray):
+        self.purchase = purchase
+        self.sale = sale
+        self.available = available
+
+class Market:
+    """Cepheus speculative trade: all goods priced at a world in one vectorized pass.
+
+    Goods, their trade code DMs and the Modified Price table are loaded once into
+    arrays. Price rolls are drawn per world and kept until that world's market shifts,
+    so repeated lookups and route evaluation only do array arithmetic.
+    """
+    def __init__(self, goods_path: str = "data/trade/trade_goods.xml",
+                 seed: Optional[int] = None,
+                 random_service: Optional[RandomService] = None):
+        if seed is None:
+            seed = (random_service or global_random_service).seed_for("trade")
+        self.seed = seed
+        self.code_columns = {code: i for i, code in enumerate(TRADE_CODES)}
+        self.load_goods(goods_path)
+        self.epochs: Dict[str, int] = {}  # world name: times its market has shifted
+        self.global_epoch = 0
+        self._rolls: Dict[str, tuple] = {}  # world name: (epoch, purchase rolls, sale rolls)
+        self._tables: Dict[tuple, tuple] = {}  # (world, broker, dm, black market): (epoch, table)
+        
+    def load_goods(self, goods_path: str):
+        """Load trade goods and the Modified Price table into lookup arrays"""
+        root = etree.parse(goods_path).getroot()
+        
+        results = sorted((int(r.get("value")), float(r.get("purchase")), float(r.get("sale")))
+                         for r in root.iterfind("price_table/result"))
+        self.min_result = results[0][0]
+        self.max_result = results[-1][0]
+        self.purchase_multipliers = np.array([r[1] for r in results])
+        self.sale_multipliers = np.array([r[2] for r in results])
+        
+        goods = list(root.iterfind("goods/good"))
+        self.goods: List[str] = [good.get("name") for good in goods]
+        self.good_index = {name: i for i, name in enumerate(self.goods)}
+        self.tons: List[str] = [good.get("tons") for good in goods]
+        self.base_prices = np.array([float(good.get("base_price")) for good in goods])
+        self.common = np.array([good.get("common") == "true" for good in goods])
+        self.illegal = np.array([good.get("illegal") == "true" for good in goods])
+        shape = (len(goods), len(TRADE_CODES))
+        self.purchase_dms = np.zeros(shape, dtype=np.int8)
+        self.sale_dms = np.zeros(shape, dtype=np.int8)
+        for row, good in enumerate(goods):
+            for dm in good.iterfind("purchase"):
+                self.purchase_dms[row, self.code_columns[dm.get("code")]] = int(dm.get("dm"))
+            for dm in good.iterfind("sale"):
+                self.sale_dms[row, self.code_columns[dm.get("code")]] = int(dm.get("dm"))
+        self.sourced = self.purchase_dms > 0  # Trade goods are found on worlds with a purchase code
+        
+    def code_mask(self, world: World) -> np.ndarray:
+        """Which trade code columns apply to a world"""
+        mask = np.zeros(len(TRADE_CODES), dtype=bool)
+        for code in world.trade_codes:
+            column = self.code_columns.get(code)
+            if column is not None:
+                mask[column] = True
+        return mask
+        
+    def shift(self, world: Optional[World] = None):
+        """Shift one world's market (or every market), so fresh prices are rolled"""
+        if world is None:
+            self.global_epoch += 1
+        else:
+            self.epochs[world.name] = self.epochs.get(world.name, 0) + 1
+            
+    def _epoch(self, world: World) -> tuple:
+        return (self.global_epoch, self.epochs.get(world.name, 0))
+        
+    def _world_rolls(self, world: World) -> tuple:
+        """2D6 purchase and sale rolls for every good, fixed per world until it shifts"""
+        epoch = self._epoch(world)
+        cached = self._rolls.get(world.name)
+        if cached is None or cached[0] != epoch:
+            rng = np.random.default_rng([self.seed, zlib.crc32(world.name.encode("utf-8")), *epoch])
+            dice = rng.integers(1, 7, size=(2, len(self.goods), 2)).sum(axis=2)
+            cached = self._rolls[world.name] = (epoch, dice[0], dice[1])
+        return cached
+        
+    def price_table(self, world: World, broker: int = 0, dm: int = 0,
+                    black_market: bool = False) -> PriceTable:
+        """Prices for all goods at a world; broker is the trader's skill, dm the counterparty's"""
+        key = (world.name, broker, dm, black_market)
+        epoch = self._epoch(world)
+        cached = self._tables.get(key)
+        if cached is not None and cached[0] == epoch:
+            return cached[1]
+            
+        _, purchase_rolls, sale_rolls = self._world_rolls(world)
+        mask = self.code_mask(world)
+        # Only the largest applicable DM from each column counts
+        purchase_dm = np.where(mask, self.purchase_dms, 0).max(axis=1)
+        sale_dm = np.where(mask, self.sale_dms, 0).max(axis=1)
+        purchase_result = purchase_rolls + broker + purchase_dm - sale_dm - dm
+        sale_result = sale_rolls + broker + sale_dm - purchase_dm - dm
+        purchase = self.base_prices * self.purchase_multipliers[
+            np.clip(purchase_result, self.min_result, self.max_result) - self.min_result]
+        sale = self.base_prices * self.sale_multipliers[
+            np.clip(sale_result, self.min_result, self.max_result) - self.min_result]
+        
+        available = self.common | (self.sourced[:, mask].any(axis=1) & ~self.illegal)
+        if black_market:
+            available = available | (self.illegal & self.sourced[:, mask].any(axis=1))
+        table = PriceTable(purchase, sale, available)
+        self._tables[key] = (epoch, table)
+        return table
+        
+    def price_matrix(self, worlds: Sequence[World], broker: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """(worlds x goods) purchase and sale prices, built from the cached per-world tables"""
+        tables = [self.price_table(world, broker) for world in worlds]
+        return (np.array([t.purchase for t in tables]).reshape(len(worlds), len(self.goods)),
+                np.array([t.sale for t in tables]).reshape(len(worlds), len(self.goods)))
+        
+    def best_routes(self, origin: World, destinations: Sequence[World],
+                    broker: int = 0) -> List[Tuple[World, Optional[str], float]]:
+        """For each destination, the good bought at origin with the best profit per ton"""
+        table = self.price_table(origin, broker)
+        _, sale = self.price_matrix(destinations, broker)
+        profit = np.where(table.available, sale - table.purchase, -np.inf)
+        best = profit.argmax(axis=1)
+        best_profit = profit[np.arange(len(destinations)), best]
+        return [(world, self.goods[good] if np.isfinite(value) else None, float(value))
+                for world, good, value in zip(destinations, best.tolist(), best_profit.tolist())]
+        
+    def buy(self, ship, world: World, good: str, tons: int, broker: int = 0) -> bool:
+        """Buy cargo at a world's purchase price if it is available and affordable"""
+        table = self.price_table(world, broker)
+        index = self.good_index.get(good)
+        if index is None or not table.available[index]:
+            return False
+        cost = int(round(table.purchase[index] * tons))
+        if cost > ship.credits:
+            return False
+        ship.credits -= cost
+        ship.add_cargo(good, tons)
+        return True
+        
+    def sell(self, ship, world: World, good: str, tons: int, broker: int = 0) -> bool:
+        """Sell cargo at a world's sale price"""
+        index = self.good_index.get(good)
+        if index is None or ship.cargo.get(good, 0) < tons:
+            return False
+        ship.credits += int(round(self.price_table(world, broker).sale[index] * tons))
+        ship.remove_cargo(good, tons)
+        return True
@@ -0,0 +1,101 @@
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Tuple
+
+class Timer:
+    """Accumulated wall time for one subsystem, per frame and overall"""
+    __slots__ = ("name", "calls", "total", "frame", "average", "start")
+
+    # Weight of the newest frame in the running per-frame average
+    SMOOTHING = 0.1
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.frame = 0.0  # Seconds spent so far in the current frame
+        self.average = 0.0  # Smoothed seconds per frame
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.calls += 1
+        self.total += elapsed
+        self.frame += elapsed
+        return False
+
+    def end_frame(self):
+        self.average += (self.frame - self.average) * self.SMOOTHING
+        self.frame = 0.0
+
+_DISABLED = nullcontext()
+
+class Metrics:
+    """Named subsystem timers and counters; every call is a flag check while disabled"""
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.timers: Dict[str, Timer] = {}
+        self.counters: Dict[str, int] = {}
+        self.frames = 0
+        self.frame_start = time.perf_counter()
+        self.frame_time = Timer("frame")  # Whole frames, including time spent blocked or capped
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+        self.frame_start = time.perf_counter()
+
+    def reset(self):
+        self.timers.clear()
+        self.counters.clear()
+        self.frames = 0
+        self.frame_time = Timer("frame")
+        self.frame_start = time.perf_counter()
+
+    def timer(self, name: str):
+        """Context manager timing a block under name"""
+        if not self.enabled:
+            return _DISABLED
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Timer(name)
+        return timer
+
+    def count(self, name: str, amount: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def end_frame(self):
+        """Fold this frame's timings into the running averages"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frame_time.frame = now - self.frame_start
+        self.frame_time.calls += 1
+        self.frame_time.total += self.frame_time.frame
+        self.frame_time.end_frame()
+        self.frame_start = now
+        self.frames += 1
+        for timer in self.timers.values():
+            timer.end_frame()
+
+    def breakdown(self) -> List[Tuple[str, float]]:
+        """(timer name, smoothed milliseconds per frame), slowest first"""
+        return sorted(((name, timer.average * 1000) for name, timer in self.timers.items()),
+                      key=lambda item: -item[1])
+
+    def summary(self) -> Dict[str, Dict]:
+        """Totals for every timer and counter, for logging or dumping to JSON"""
+        return {
+            "frames": self.frames,
+            "timers": {name: {"calls": timer.calls, "total_ms": timer.total * 1000,
+                              "frame_ms": timer.average * 1000}
+                       for name, timer in self.timers.items()},
+            "counters": dict(self.counters),
+        }
+
+# Shared by every subsystem; off unless the game is started with --metrics
+metrics = Metrics()
@@ -0,0 +1,97 @@
+import itertools
+from typing import Dict, Generic, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Registry(Generic[T]):
+    """Insertion-ordered collection keyed by object identity.
+
+    Adding an item returns an integer handle that stays valid until the item is
+    removed, so membership, lookup and removal are O(1) by handle or by the item
+    itself. Items are matched by identity, never by equality: two equal passenger
+    dicts are two passengers. Iteration, len(), indexing and comparison with lists
+    behave like the plain list this replaces.
+    """
+    __slots__ = ("_items", "_handles", "_next_handle")
+
+    def __init__(self, items: Optional[Iterable[T]] = None):
+        self._items: Dict[int, T] = {}  # handle: item, in insertion order
+        self._handles: Dict[int, int] = {}  # id(item): handle
+        self._next_handle = itertools.count(1)
+        if items is not None:
+            for item in items:
+                self.add(item)
+
+    def add(self, item: T) -> int:
+        """Add an item (once) and return its handle"""
+        handle = self._handles.get(id(item))
+        if handle is None:
+            handle = next(self._next_handle)
+            self._items[handle] = item
+            self._handles[id(item)] = handle
+        return handle
+
+    append = add
+
+    def handle_of(self, item: T) -> Optional[int]:
+        return self._handles.get(id(item))
+
+    def get(self, handle: int) -> Optional[T]:
+        return self._items.get(handle)
+
+    def discard(self, item: T) -> bool:
+        """Remove an item if present; returns whether it was"""
+        handle = self._handles.pop(id(item), None)
+        if handle is None:
+            return False
+        del self._items[handle]
+        return True
+
+    def remove(self, item: T):
+        if not self.discard(item):
+            raise ValueError("item not in registry")
+
+    def pop_handle(self, handle: int) -> Optional[T]:
+        """Remove and return the item with this handle, or None if it is gone"""
+        item = self._items.pop(handle, None)
+        if item is not None:
+            del self._handles[id(item)]
+        return item
+
+    def clear(self):
+        self._items.clear()
+        self._handles.clear()
+
+    def __contains__(self, item) -> bool:
+        return id(item) in self._handles
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items.values())
+
+    def __reversed__(self) -> Iterator[T]:
+        return reversed(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> T:
+        """Positional access; the ends are O(1), anything else walks the collection"""
+        if index == 0 and self._items:
+            return next(iter(self._items.values()))
+        if index == -1 and self._items:
+            return next(reversed(self._items.values()))
+        return list(self._items.values())[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Registry, list, tuple)):
+            return len(self) == len(other) and all(a is b or a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Handles are per-process; a restored registry hands out fresh ones
+        return (Registry, (list(self._items.values()),))
+
+    def __repr__(self):
+        return f"Registry({list(self._items.values())!r})"
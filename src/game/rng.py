@@ -0,0 +1,104 @@
+import zlib
+from typing import Dict, List, Optional
+import numpy as np
+
+class RandomStream:
+    """One subsystem's generator, with scalar draws served from pre-generated blocks.
+
+    Pulling scalars one at a time from numpy is slow, so uniforms and 2D6 rolls are
+    generated a block at a time and handed out from the buffer. The saved state
+    includes the unused part of each buffer, so a restored stream continues exactly.
+    """
+    BLOCK_SIZE = 1024
+
+    def __init__(self, name: str, seed_sequence: np.random.SeedSequence):
+        self.name = name
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self._uniforms: List[float] = []
+        self._dice: List[int] = []
+
+    def reseed(self, seed_sequence: np.random.SeedSequence):
+        self.generator = np.random.Generator(np.random.PCG64(seed_sequence))
+        self._uniforms = []
+        self._dice = []
+
+    def random(self, size=None):
+        """A float in [0, 1), or an array of them when size is given"""
+        if size is not None:
+            return self.generator.random(size)
+        if not self._uniforms:
+            # Reversed so pop() hands values out in generation order
+            self._uniforms = self.generator.random(self.BLOCK_SIZE)[::-1].tolist()
+        return self._uniforms.pop()
+
+    def integers(self, low: int, high: int, size=None):
+        """Integers in [low, high), like numpy's Generator.integers"""
+        return self.generator.integers(low, high, size=size)
+
+    def roll_2d6(self) -> int:
+        """One 2D6 roll"""
+        if not self._dice:
+            self._dice = self.roll_2d6_array(self.BLOCK_SIZE)[::-1].tolist()
+        return self._dice.pop()
+
+    def roll_2d6_array(self, count: int) -> np.ndarray:
+        """count independent 2D6 rolls in one draw"""
+        return self.generator.integers(1, 7, size=(count, 2)).sum(axis=1)
+
+    def get_state(self) -> Dict:
+        return {"generator": self.generator.bit_generator.state,
+                "uniforms": list(self._uniforms), "dice": list(self._dice)}
+
+    def set_state(self, state: Dict):
+        self.generator.bit_generator.state = state["generator"]
+        self._uniforms = list(state["uniforms"])
+        self._dice = list(state["dice"])
+
+class RandomService:
+    """Named random streams for each subsystem, all derived from one root seed.
+
+    A stream's seed depends only on the root seed and its name, so adding a stream
+    or drawing from one never shifts the numbers another subsystem sees.
+    """
+    def __init__(self, seed: Optional[int] = None):
+        self.streams: Dict[str, RandomStream] = {}
+        self.reseed(seed)
+
+    def reseed(self, seed: Optional[int] = None):
+        """Reseed every stream from a new root seed (None draws fresh entropy)"""
+        self.root = np.random.SeedSequence(seed)
+        for name, stream in self.streams.items():
+            stream.reseed(self._sequence(name))
+
+    def _sequence(self, name: str) -> np.random.SeedSequence:
+        return np.random.SeedSequence(self.root.entropy,
+                                      spawn_key=self.root.spawn_key + (zlib.crc32(name.encode("utf-8")),))
+
+    def stream(self, name: str) -> RandomStream:
+        """The stream for a subsystem, created on first use"""
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = self.streams[name] = RandomStream(name, self._sequence(name))
+        return stream
+
+    def seed_for(self, name: str) -> int:
+        """A 32-bit seed derived for a subsystem that manages its own generators"""
+        return int(self._sequence(name).generate_state(1)[0])
+
+    def spawn_seeds(self, count: int) -> List[int]:
+        """Independent root seeds for parallel runs, e.g. one per campaign"""
+        return [int(child.generate_state(1, dtype=np.uint64)[0])
+                for child in self.root.spawn(count)]
+
+    def get_state(self) -> Dict:
+        return {"entropy": self.root.entropy, "spawn_key": self.root.spawn_key,
+                "streams": {name: stream.get_state() for name, stream in self.streams.items()}}
+
+    def set_state(self, state: Dict):
+        """Restore a saved state; streams created since then keep their own state"""
+        self.root = np.random.SeedSequence(state["entropy"], spawn_key=tuple(state["spawn_key"]))
+        for name, stream_state in state["streams"].items():
+            self.stream(name).set_state(stream_state)
+
+# Used by code that is not handed a service of its own, such as a lone CrewMember.skill_check
+random_service = RandomService()
@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Index file layout (little-endian):
+#   header, then for each markdown file its path (relative to the index), size,
+#   modification time and content digest,
+#   then 4-byte aligned arrays: entries, sorted fixed-width terms, term offsets
+#   into the postings array, and postings (entry numbers, ascending per term).
+MAGIC = b"STRI"
+INDEX_VERSION = 2
+HEADER = struct.Struct("<4sHHIIIH")  # magic, version, files, entries, terms, postings, term width
+FILE_ENTRY = struct.Struct("<HQQ16s")  # path length, file size, mtime in ns, blake2b digest
+TERM_WIDTH = 32
+ENTRY_DTYPE = np.dtype([("file", "<u2"), ("kind", "u1"), ("pad", "u1"),
+                        ("start", "<u4"), ("length", "<u4")])
+
+HEADING, TABLE, PARAGRAPH = 0, 1, 2
+KIND_NAMES = {HEADING: "heading", TABLE: "table", PARAGRAPH: "paragraph"}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+TABLE_PATTERN = re.compile(rb"Table: ")
+PARAGRAPH_BREAK = re.compile(rb"\n\s*\n")
+
+class StaleIndexError(ValueError):
+    """Raised when the markdown changed after the rules index was built"""
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _term_key(term: str) -> bytes:
+    return term.encode("utf-8")[:TERM_WIDTH]
+
+def _split_entries(data: bytes) -> List[tuple]:
+    """(kind, start, length) for headings, paragraphs and the tables inside paragraphs"""
+    entries = []
+    start = 0
+    for match in list(PARAGRAPH_BREAK.finditer(data)) + [None]:
+        end = match.start() if match else len(data)
+        block = data[start:end]
+        stripped = block.strip()
+        if stripped:
+            offset = start + (len(block) - len(block.lstrip()))
+            kind = HEADING if stripped.startswith(b"#") else PARAGRAPH
+            entries.append((kind, offset, len(stripped)))
+            if kind == PARAGRAPH:
+                tables = [m.start() for m in TABLE_PATTERN.finditer(stripped)]
+                for i, table_start in enumerate(tables):
+                    table_end = tables[i + 1] if i + 1 < len(tables) else len(stripped)
+                    entries.append((TABLE, offset + table_start, table_end - table_start))
+        start = match.end() if match else end
+    return entries
+
+def build_index(rules_dir: str, index_path: Optional[str] = None) -> str:
+    """Build the inverted index over every markdown file under rules_dir"""
+    rules_dir = Path(rules_dir)
+    index_path = Path(index_path) if index_path else rules_dir / "rules.idx"
+    files = sorted(rules_dir.glob("*/*.md"))
+    
+    entries = []
+    postings: Dict[str, List[int]] = {}
+    fingerprints = []
+    for file_id, path in enumerate(files):
+        data = path.read_bytes()
+        fingerprints.append((len(data), path.stat().st_mtime_ns, _digest(data)))
+        for kind, start, length in _split_entries(data):
+            entry_id = len(entries)
+            entries.append((file_id, kind, 0, start, length))
+            text = data[start:start + length].decode("utf-8", errors="replace")
+            for term in set(tokenize(text)):
+                postings.setdefault(term, []).append(entry_id)
+                
+    # Terms longer than the fixed width share a truncated key
+    merged: Dict[bytes, set] = {}
+    for term, ids in postings.items():
+        merged.setdefault(_term_key(term), set()).update(ids)
+    terms = sorted(merged)
+    offsets = np.zeros(len(terms) + 1, dtype="<u4")
+    flat = []
+    for i, term in enumerate(terms):
+        ids = sorted(merged[term])
+        flat.extend(ids)
+        offsets[i + 1] = len(flat)
+        
+    tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, INDEX_VERSION, len(files), len(entries), len(terms),
+                            len(flat), TERM_WIDTH))
+        for path, (size, mtime, digest) in zip(files, fingerprints):
+            name = os.path.relpath(path, index_path.parent).replace(os.sep, "/").encode("utf-8")
+            f.write(FILE_ENTRY.pack(len(name), size, mtime, digest))
+            f.write(name)
+        for array in (np.array(entries, dtype=ENTRY_DTYPE),
+                      np.array(terms, dtype=f"S{TERM_WIDTH}"),
+                      offsets,
+                      np.array(flat, dtype="<u4")):
+            f.write(b"\0" * (-f.tell() % 4))
+            f.write(array.tobytes())
+    os.replace(tmp_path, index_path)
+    return str(index_path)
+
+class RulesEntry(NamedTuple):
+    """A heading, table or paragraph in the rules corpus"""
+    file: str
+    kind: str
+    start: int
+    length: int
+    text: str
+
+class RulesIndex:
+    """Memory-mapped rules index; lookups touch only the terms and entries they need.
+
+    Entries are byte offsets into the markdown, so they are only valid for the files
+    the index was built from. An index found out of date is rebuilt on open when it
+    sits in its rules directory (unless rebuild is False); otherwise reading entries
+    raises StaleIndexError instead of returning text from the wrong offsets.
+    """
+    def __init__(self, index_path: str = "rules/rules.idx", rebuild: bool = True):
+        self.index_path = Path(index_path)
+        self._open()
+        if self.stale and rebuild:
+            logger.info("Rules index %s is out of date; rebuilding", self.index_path)
+            self.close()
+            build_index(str(self.index_path.parent), str(self.index_path))
+            self._open()
+            
+    def _open(self):
+        with open(self.index_path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, file_count, entry_count, term_count, posting_count, width = \
+            HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"{self.index_path} is not a rules index this version can read")
+        pos = HEADER.size
+        self.files: List[Path] = []
+        self.fingerprints: List[tuple] = []  # (size, mtime in ns, digest) per file
+        for _ in range(file_count):
+            length, size, mtime, digest = FILE_ENTRY.unpack_from(self.data, pos)
+            pos += FILE_ENTRY.size
+            self.files.append(self.index_path.parent / self.data[pos:pos + length].decode("utf-8"))
+            self.fingerprints.append((size, mtime, digest))
+            pos += length
+        self.stale = any(self._changed(file_id) for file_id in range(file_count))
+            
+        def array(dtype, count):
+            nonlocal pos
+            pos += -pos % 4
+            result = np.frombuffer(self.data, dtype=dtype, count=count, offset=pos)
+            pos += result.nbytes
+            return result
+        self.entries = array(ENTRY_DTYPE, entry_count)
+        self.terms = array(f"S{width}", term_count)
+        self.term_offsets = array("<u4", term_count + 1)
+        self.postings = array("<u4", posting_count)
+        self.width = width
+        self._sources: Dict[int, mmap.mmap] = {}
+        
+    def _changed(self, file_id: int) -> bool:
+        """Whether a markdown file differs from the one indexed; only hashed when touched"""
+        path = self.files[file_id]
+        size, mtime, digest = self.fingerprints[file_id]
+        try:
+            stat = path.stat()
+        except OSError:
+            return True
+        if stat.st_size != size:
+            return True
+        return stat.st_mtime_ns != mtime and _digest(path.read_bytes()) != digest
+        
+    def _source(self, file_id: int) -> mmap.mmap:
+        source = self._sources.get(file_id)
+        if source is None:
+            # Also caught here when a file is edited after the index was opened
+            if self.stale or self._changed(file_id):
+                self.stale = True
+                raise StaleIndexError(f"{self.index_path} is out of date with "
+                                      f"{self.files[file_id]}; rebuild it with build_index")
+            with open(self.files[file_id], "rb") as f:
+                source = self._sources[file_id] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return source
+        
+    def postings_for(self, term: str) -> np.ndarray:
+        """Entry numbers containing a term, found by binary search over the sorted terms"""
+        key = term.encode("utf-8")[:self.width]
+        i = int(np.searchsorted(self.terms, key))
+        if i >= len(self.terms) or self.terms[i] != key:
+            return np.empty(0, dtype="<u4")
+        return self.postings[self.term_offsets[i]:self.term_offsets[i + 1]]
+        
+    def entry(self, entry_id: int) -> RulesEntry:
+        file_id, kind, _, start, length = self.entries[entry_id].tolist()
+        text = self._source(file_id)[start:start + length].decode("utf-8", errors="replace")
+        return RulesEntry(str(self.files[file_id]), KIND_NAMES[kind], start, length, text)
+        
+    def search(self, query: str, limit: int = 10,
+               kinds: Optional[Sequence[str]] = None) -> List[RulesEntry]:
+        """Entries containing every word of the query; headings and tables rank first"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        matches = None
+        for term in sorted(set(terms), key=lambda t: len(self.postings_for(t))):
+            ids = self.postings_for(term)
+            matches = ids if matches is None else np.intersect1d(matches, ids, assume_unique=True)
+            if len(matches) == 0:
+                return []
+        found = self.entries[matches]
+        if kinds is not None:
+            wanted = [kind for kind, name in KIND_NAMES.items() if name in kinds]
+            keep = np.isin(found["kind"], wanted)
+            matches, found = matches[keep], found[keep]
+        order = np.lexsort((found["length"], found["kind"]))[:limit]
+        return [self.entry(int(entry_id)) for entry_id in matches[order]]
+        
+    def table(self, name: str) -> Optional[RulesEntry]:
+        """The rules table whose title best matches name"""
+        for entry in self.search(f"table {name}", limit=50, kinds=("table",)):
+            if entry.text[len("Table: "):].lower().startswith(name.lower()):
+                return entry
+        results = self.search(f"table {name}", limit=1, kinds=("table",))
+        return results[0] if results else None
+        
+    def close(self):
+        for source in self._sources.values():
+            source.close()
+        self._sources.clear()
+        self.entries = self.terms = self.term_offsets = self.postings = None
+        self.data.close()
+
+if __name__ == "__main__":
+    import sys
+    rules_dir = sys.argv[1] if len(sys.argv) > 1 else "rules"
+    print(f"Wrote {build_index(rules_dir)}")
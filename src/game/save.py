@@ -0,0 +1,295 @@
+import hashlib
+import io
+import logging
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .crew import CrewRoster, RelationshipGraph
+from .event_manager import Event
+from .registry import Registry
+
+logger = logging.getLogger(__name__)
+
+# A save file is a sequence of records. A full snapshot writes one record; incremental
+# autosaves append records holding only the sections that changed. When loading,
+# later records override earlier ones section by section. A record cut short by a crash
+# mid-append is ignored, leaving the state as of the last complete record.
+MAGIC = b"STSV"
+FORMAT_VERSION = 1
+RECORD_HEADER = struct.Struct("<4sHI")  # magic, format version, section count
+SECTION_ENTRY = struct.Struct("<HQQ")   # name length, offset in record, length
+SECTIONS = ("ship", "crew", "event_stack", "event_state")
+
+class SaveError(Exception):
+    """Raised when a save file cannot be read"""
+
+class _StackPickler(pickle.Pickler):
+    """Pickles events that sit on the stack as references to their stack position"""
+    def __init__(self, file, stack_positions: Dict[int, int]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.stack_positions = stack_positions
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Event):
+            position = self.stack_positions.get(id(obj))
+            if position is not None:
+                return position
+        return None
+
+class _StackUnpickler(pickle.Unpickler):
+    def __init__(self, file, stack: List[Event]):
+        super().__init__(file)
+        self.stack = stack
+
+    def persistent_load(self, pid):
+        return self.stack[pid]
+
+def _dumps(obj) -> bytes:
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+def capture_sections(simulation, sections=SECTIONS) -> Dict[str, bytes]:
+    """Serialize the requested sections of a simulation's state"""
+    ship = simulation.ship
+    crew_manager = simulation.crew_manager
+    event_manager = simulation.event_manager
+    blobs = {}
+    if "ship" in sections:
+        blobs["ship"] = _dumps({
+            "name": ship.name, "cargo": ship.cargo, "passengers": list(ship.passengers),
+            "systems": dict(ship.systems), "fuel": ship.fuel, "fuel_capacity": ship.fuel_capacity,
+            "jump_rating": ship.jump_rating, "credits": ship.credits,
+            "location": ship.location, "reputation": ship.reputation,
+        })
+    if "crew" in sections:
+        if crew_manager.relationships.dirty:
+            crew_manager.relationships.write_back()
+        # Members are stored once; the ship and the manager refer to them by index
+        members = list(crew_manager.crew)
+        positions = {id(member): i for i, member in enumerate(members)}
+        for member in ship.crew:
+            if id(member) not in positions:
+                positions[id(member)] = len(members)
+                members.append(member)
+        roster, graph = crew_manager.roster, crew_manager.relationships
+        count = len(graph)
+        rows, columns = np.nonzero(graph.linked[:count, :count])
+        # Stored as arrays so loading never rebuilds them member by member; the mostly
+        # empty relationship matrix keeps only its linked cells
+        blobs["crew"] = _dumps({
+            "members": members,
+            "manager": list(range(len(crew_manager.crew))),
+            "ship": [positions[id(member)] for member in ship.crew],
+            "roster": {
+                "rows": [positions[id(member)] for member in roster.members],
+                "skills": roster.skills[:len(roster)],
+                "characteristics": roster.characteristics[:len(roster)],
+                "skill_columns": roster.skill_columns,
+                "characteristic_columns": roster.characteristic_columns,
+            },
+            "relationships": {
+                "rows": [positions[id(member)] for member in graph.members],
+                "linked": (rows.astype(np.int32), columns.astype(np.int32)),
+                "values": graph.matrix[rows, columns],
+            },
+        })
+    if "event_stack" in sections:
+        blobs["event_stack"] = _dumps(list(event_manager.event_stack))
+    if "event_state" in sections:
+        buffer = io.BytesIO()
+        positions = {id(event): i for i, event in enumerate(event_manager.event_stack)}
+        _StackPickler(buffer, positions).dump({
+            "active": list(event_manager.active_events),
+            "game_time": event_manager.game_time,
+            "timed": [(h.due_time, h.event) for h in sorted(event_manager.timed_events)
+                      if not h.cancelled],
+            "rng": event_manager.random.get_state(),
+        })
+        blobs["event_state"] = buffer.getvalue()
+    return blobs
+
+def write_record(f, blobs: Dict[str, bytes]):
+    """Append one record holding the given section blobs"""
+    names = [name.encode("utf-8") for name in blobs]
+    table_size = RECORD_HEADER.size + sum(SECTION_ENTRY.size + len(n) for n in names)
+    f.write(RECORD_HEADER.pack(MAGIC, FORMAT_VERSION, len(blobs)))
+    offset = table_size
+    for name, blob in zip(names, blobs.values()):
+        f.write(SECTION_ENTRY.pack(len(name), offset, len(blob)))
+        f.write(name)
+        offset += len(blob)
+    for blob in blobs.values():
+        f.write(blob)
+
+class SaveFile:
+    """Memory-mapped view of a save file; sections are only decoded when requested"""
+    def __init__(self, path: str):
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SaveError(f"Cannot open save {self.path}: {e}") from e
+        self.sections: Dict[str, memoryview] = {}
+        self.records = 0
+        self.end = 0  # Byte offset just past the last complete record
+        self._read_tables()
+
+    def _read_tables(self):
+        view = memoryview(self.data)
+        pos = 0
+        while pos < len(view):
+            record = self._read_record(view, pos)
+            if record is None:
+                if not self.records:
+                    raise SaveError(f"Truncated first record in {self.path}")
+                logger.warning("Ignoring truncated record at byte %d of %s", pos, self.path)
+                break
+            sections, pos = record
+            self.sections.update(sections)
+            self.records += 1
+            self.end = pos
+
+    def _read_record(self, view: memoryview, pos: int):
+        """The sections of the record at pos and the offset past it, or None if it is cut short"""
+        if len(view) - pos < RECORD_HEADER.size:
+            return None
+        magic, version, count = RECORD_HEADER.unpack_from(view, pos)
+        if magic != MAGIC:
+            raise SaveError(f"{self.path} is not a Space Tycoon save")
+        if version > FORMAT_VERSION:
+            raise SaveError(f"{self.path} uses newer save format {version}")
+        sections = {}
+        entry_pos = pos + RECORD_HEADER.size
+        end = entry_pos
+        for _ in range(count):
+            if len(view) - entry_pos < SECTION_ENTRY.size:
+                return None
+            name_len, offset, length = SECTION_ENTRY.unpack_from(view, entry_pos)
+            entry_pos += SECTION_ENTRY.size
+            if entry_pos + name_len > len(view) or pos + offset + length > len(view):
+                return None
+            name = bytes(view[entry_pos:entry_pos + name_len]).decode("utf-8")
+            entry_pos += name_len
+            sections[name] = view[pos + offset:pos + offset + length]
+            end = max(end, pos + offset + length)
+        return sections, max(end, entry_pos)
+
+    def raw(self, name: str) -> memoryview:
+        if name not in self.sections:
+            raise SaveError(f"Section {name!r} missing from {self.path}")
+        return self.sections[name]
+
+    def load(self, name: str):
+        """Decode a plain section"""
+        return pickle.loads(self.raw(name))
+
+    def close(self):
+        self.sections.clear()
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def save_game(path: str, simulation, blobs: Optional[Dict[str, bytes]] = None):
+    """Write a full snapshot, replacing any previous save and autosave records"""
+    if blobs is None:
+        blobs = capture_sections(simulation)
+    tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        write_record(f, blobs)
+    os.replace(tmp_path, path)
+
+def load_game(path: str, simulation):
+    """Restore a simulation's ship, crew and events from a save file"""
+    with SaveFile(path) as save:
+        ship = simulation.ship
+        state = save.load("ship")
+        for key, value in state.items():
+            setattr(ship, key, value)
+            
+        crew = save.load("crew")
+        members = crew["members"]
+        crew_manager = simulation.crew_manager
+        crew_manager.crew = Registry(members[i] for i in crew["manager"])
+        roster = crew["roster"]
+        crew_manager.roster = CrewRoster.from_arrays(
+            [members[i] for i in roster["rows"]], roster["skills"], roster["characteristics"],
+            roster["skill_columns"], roster["characteristic_columns"], rng=crew_manager.rng)
+        graph = crew["relationships"]
+        crew_manager.relationships = RelationshipGraph.from_arrays(
+            [members[i] for i in graph["rows"]], graph["linked"], graph["values"])
+        ship.crew = Registry(members[i] for i in crew["ship"])
+        
+        event_manager = simulation.event_manager
+        event_manager.set_stack(save.load("event_stack"))
+        state = _StackUnpickler(io.BytesIO(save.raw("event_state")),
+                                list(event_manager.event_stack)).load()
+        event_manager.active_events = Registry(state["active"])
+        event_manager.game_time = state["game_time"]
+        event_manager.timed_events = []
+        event_manager.pending_timed = 0
+        for due_time, event in state["timed"]:
+            event_manager.schedule_event(event, due_time)
+        event_manager.random.set_state(state["rng"])
+
+class Autosaver:
+    """Appends only the sections that changed since the last save to a save file"""
+    def __init__(self, path: str, simulation, compact_ratio: float = 2.0):
+        self.path = path
+        self.simulation = simulation
+        self.compact_ratio = compact_ratio  # Rewrite in full once appended records outgrow this
+        self.digests: Dict[str, bytes] = {}
+        self.stack_revision: Optional[int] = None
+        self.full_size = 0
+        self.size = 0  # Bytes of complete records written so far
+
+    def _changed_sections(self) -> Tuple[Dict[str, bytes], Dict[str, bytes]]:
+        """Blobs that differ from the last save, and their digests"""
+        event_manager = self.simulation.event_manager
+        wanted = [name for name in SECTIONS
+                  if name != "event_stack" or event_manager.stack_revision != self.stack_revision]
+        # A changed stack moves event positions, so event_state must be written with it
+        blobs = capture_sections(self.simulation, wanted)
+        changed, digests = {}, {}
+        for name, blob in blobs.items():
+            digest = hashlib.blake2b(blob, digest_size=16).digest()
+            if (name == "event_state" and "event_stack" in blobs) or self.digests.get(name) != digest:
+                changed[name] = blob
+                digests[name] = digest
+        return changed, digests
+
+    def save(self, full: bool = False) -> int:
+        """Autosave; returns the number of bytes written"""
+        exists = os.path.exists(self.path)
+        if full or not exists or not self.digests:
+            blobs = capture_sections(self.simulation)
+            self.digests = {name: hashlib.blake2b(blob, digest_size=16).digest()
+                            for name, blob in blobs.items()}
+            self.stack_revision = self.simulation.event_manager.stack_revision
+            save_game(self.path, self.simulation, blobs)
+            self.full_size = self.size = os.path.getsize(self.path)
+            return self.full_size
+        changed, digests = self._changed_sections()
+        if not changed:
+            self.stack_revision = self.simulation.event_manager.stack_revision
+            return 0
+        if self.size > self.full_size * self.compact_ratio:
+            return self.save(full=True)
+        with open(self.path, "r+b") as f:
+            # Write over whatever a failed earlier append left after the last complete record
+            f.seek(self.size)
+            f.truncate()
+            write_record(f, changed)
+            written = f.tell() - self.size
+            self.size = f.tell()
+        # Only a record that was written in full counts as saved
+        self.digests.update(digests)
+        self.stack_revision = self.simulation.event_manager.stack_revision
+        return written
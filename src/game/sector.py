@@ -0,0 +1,191 @@
+import heapq
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from lxml import etree
+from .world import World
+
+SUBSECTOR_COLUMNS = 8
+SUBSECTOR_ROWS = 10
+SUBSECTORS_ACROSS = 4
+
+def parse_hex(hex_code: str) -> Tuple[int, int]:
+    """Split a "CCRR" hex location into (column, row)"""
+    return int(hex_code[:2]), int(hex_code[2:])
+
+def to_cube(column: int, row: int) -> Tuple[int, int, int]:
+    """Cube coordinates for a hex; even columns sit half a hex lower, as on Traveller maps"""
+    x = column - 1
+    z = (row - 1) - (x - (x & 1)) // 2
+    return x, -x - z, z
+
+def hex_distance(a: Tuple[int, int, int], b: Tuple[int, int, int]) -> int:
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]), abs(a[2] - b[2]))
+
+def subsector_of(hex_code: str) -> str:
+    """Subsector letter (A-P) of a hex within its sector"""
+    column, row = parse_hex(hex_code)
+    index = ((row - 1) // SUBSECTOR_ROWS) * SUBSECTORS_ACROSS + (column - 1) // SUBSECTOR_COLUMNS
+    return "ABCDEFGHIJKLMNOP"[index]
+
+class SectorMap:
+    """Worlds on a hex map, with jump-route planning.
+
+    Routes are found with Dijkstra (fewest jumps, then fewest parsecs). Each search
+    produces a shortest-path tree for its origin that is cached per jump range, so
+    further queries from the same origin are just a walk up the tree. Changing the
+    map only drops the trees that could route through the changed hex.
+    """
+    def __init__(self, name: str = "Sector", fuel_per_parsec: float = 10.0):
+        self.name = name
+        self.fuel_per_parsec = fuel_per_parsec  # Fuel burnt per parsec jumped
+        self.worlds: Dict[str, World] = {}
+        self.by_cube: Dict[Tuple[int, int, int], World] = {}
+        self.cubes: Dict[str, Tuple[int, int, int]] = {}  # world name: cube coordinates
+        # (first hop range, jump range): {origin name: (costs, parents)}
+        self._trees: Dict[Tuple[int, int], Dict[str, tuple]] = {}
+        
+    def add_world(self, world: World):
+        """Place a world on the map (replacing any world in the same hex)"""
+        column, row = parse_hex(world.hex)
+        cube = to_cube(column, row)
+        if world.name in self.worlds:
+            self.remove_world(world.name)
+        if cube in self.by_cube:
+            self.remove_world(self.by_cube[cube].name)
+        self.worlds[world.name] = world
+        self.by_cube[cube] = world
+        self.cubes[world.name] = cube
+        self._invalidate_near(cube)
+        
+    def remove_world(self, name: str):
+        world = self.worlds.pop(name, None)
+        if world is None:
+            return
+        cube = self.cubes.pop(name)
+        del self.by_cube[cube]
+        self._invalidate_near(cube)
+        
+    def update_world(self, world: World):
+        """Re-index a world after its hex, starport or gas giant changed"""
+        self.remove_world(world.name)
+        self.add_world(world)
+        
+    def _invalidate_near(self, cube: Tuple[int, int, int]):
+        """Drop cached trees that reach any hex within jump range of a changed hex"""
+        for (first_range, jump_range), trees in self._trees.items():
+            reach = max(first_range, jump_range)
+            for origin in list(trees):
+                costs = trees[origin][0]
+                if any(hex_distance(self.cubes[name], cube) <= reach
+                       for name in costs if name in self.cubes) or origin not in self.worlds:
+                    del trees[origin]
+                    
+    def get(self, name: str) -> Optional[World]:
+        return self.worlds.get(name)
+        
+    def world_at(self, hex_code: str) -> Optional[World]:
+        return self.by_cube.get(to_cube(*parse_hex(hex_code)))
+        
+    def distance(self, a: World, b: World) -> int:
+        """Distance between two worlds in parsecs"""
+        return hex_distance(self.cubes[a.name], self.cubes[b.name])
+        
+    def worlds_within(self, world: World, parsecs: int) -> Iterator[Tuple[World, int]]:
+        """Other worlds within range, found by looking up the hexes in range"""
+        cx, cy, cz = self.cubes[world.name]
+        for dx in range(-parsecs, parsecs + 1):
+            for dy in range(max(-parsecs, -dx - parsecs), min(parsecs, -dx + parsecs) + 1):
+                if dx == 0 and dy == 0:
+                    continue
+                other = self.by_cube.get((cx + dx, cy + dy, cz - dx - dy))
+                if other is not None:
+                    yield other, max(abs(dx), abs(dy), abs(dx + dy))
+                    
+    def _tree(self, origin: World, first_range: int, jump_range: int) -> tuple:
+        """Shortest-path tree from origin; only worlds that sell fuel can be passed through"""
+        trees = self._trees.setdefault((first_range, jump_range), {})
+        tree = trees.get(origin.name)
+        if tree is not None:
+            return tree
+        costs: Dict[str, Tuple[int, int]] = {origin.name: (0, 0)}
+        parents: Dict[str, Optional[str]] = {origin.name: None}
+        queue = [(0, 0, origin.name)]
+        done: Set[str] = set()
+        while queue:
+            jumps, parsecs, name = heapq.heappop(queue)
+            if name in done:
+                continue
+            done.add(name)
+            world = self.worlds[name]
+            if name != origin.name and not world.can_refuel:
+                continue  # Reachable, but the ship cannot refuel to go further
+            reach = first_range if name == origin.name else jump_range
+            for other, distance in self.worlds_within(world, reach):
+                cost = (jumps + 1, parsecs + distance)
+                if other.name not in costs or cost < costs[other.name]:
+                    costs[other.name] = cost
+                    parents[other.name] = name
+                    heapq.heappush(queue, (cost[0], cost[1], other.name))
+        tree = trees[origin.name] = (costs, parents)
+        return tree
+        
+    def plan_route(self, origin: World, destination: World, jump_rating: int,
+                   fuel: float, fuel_capacity: Optional[float] = None) -> Optional[List[World]]:
+        """Plan the route with the fewest jumps, refuelling at every stop along the way.
+
+        Each jump is limited by the jump rating and the fuel a full tank holds; the
+        first jump is also limited by the fuel currently aboard.
+        Returns the worlds visited including origin and destination, or None.
+        """
+        if fuel_capacity is None:
+            fuel_capacity = fuel
+        jump_range = int(min(jump_rating, fuel_capacity // self.fuel_per_parsec))
+        first_range = int(min(jump_rating, fuel // self.fuel_per_parsec))
+        if origin.name == destination.name:
+            return [origin]
+        if first_range <= 0:
+            return None
+        _, parents = self._tree(origin, first_range, jump_range)
+        if destination.name not in parents:
+            return None
+        route = []
+        name = destination.name
+        while name is not None:
+            route.append(self.worlds[name])
+            name = parents[name]
+        route.reverse()
+        return route
+        
+    def jump(self, ship, destination: World) -> bool:
+        """Make a single jump, burning fuel; returns False if out of range"""
+        origin = self.worlds.get(ship.location)
+        if origin is None:
+            return False
+        distance = self.distance(origin, destination)
+        fuel = distance * self.fuel_per_parsec
+        if distance > ship.jump_rating or fuel > ship.fuel:
+            return False
+        ship.fuel -= fuel
+        ship.location = destination.name
+        return True
+        
+    def refuel(self, ship) -> bool:
+        """Fill the tank if the current world sells fuel or has a gas giant"""
+        world = self.worlds.get(ship.location)
+        if world is None or not world.can_refuel:
+            return False
+        ship.fuel = ship.fuel_capacity
+        return True
+
+def load_sector(path: str, fuel_per_parsec: float = 10.0) -> SectorMap:
+    """Load a sector map from XML (<sector name=...><world name hex starport ... /></sector>)"""
+    root = etree.parse(path).getroot()
+    sector = SectorMap(root.get("name", "Sector"), fuel_per_parsec)
+    for elem in root.iterfind("world"):
+        sector.add_world(World(
+            name=elem.get("name"),
+            trade_codes=elem.get("trade_codes", "").split(),
+            starport=elem.get("starport", "X"),
+            hex=elem.get("hex"),
+            gas_giant=elem.get("gas_giant") == "true",
+        ))
+    return sector
@@ -1,12 +1,15 @@
-from typing import Dict, List
+from typing import Dict
 from .crew import CrewMember
+from .registry import Registry
 
 class Ship:
     def __init__(self):
+        # Set while the ship belongs to a Fleet, which then holds its systems, fuel and credits
+        self.fleet = None
         self.name = "Default Ship"
-        self.crew: List[CrewMember] = []
+        self.crew: Registry[CrewMember] = Registry()
         self.cargo: Dict[str, int] = {}  # item: quantity
-        self.passengers: List[Dict] = []
+        self.passengers = Registry()
         self.systems: Dict[str, float] = {
             "jump_drive": 1.0,  # System health/status (0.0 to 1.0)
             "life_support": 1.0,
@@ -16,8 +19,73 @@ class Ship:
             "engines": 1.0
         }
         self.fuel = 100.0
+        self.fuel_capacity = 100.0
+        self.jump_rating = 2  # Longest single jump in parsecs
         self.credits = 1000
         self.location = "Start System"
+        self.reputation: Dict[str, float] = {}  # faction: standing
+        
+    @property
+    def passengers(self) -> Registry:
+        return self._passengers
+        
+    @passengers.setter
+    def passengers(self, passengers):
+        self._passengers: Registry[Dict] = (passengers if isinstance(passengers, Registry)
+                                            else Registry(passengers))
+        # name: passengers aboard with it, kept current by add_passenger and remove_passenger
+        self.passenger_names: Dict[str, int] = {}
+        for passenger in self._passengers:
+            name = passenger.get("name")
+            self.passenger_names[name] = self.passenger_names.get(name, 0) + 1
+        
+    @property
+    def systems(self) -> Dict[str, float]:
+        return self._systems if self.fleet is None else self.fleet.systems_view(self)
+        
+    @systems.setter
+    def systems(self, systems: Dict[str, float]):
+        if self.fleet is None:
+            self._systems = dict(systems)
+        else:
+            view = self.fleet.systems_view(self)
+            for system, health in systems.items():
+                view[system] = health
+                
+    @property
+    def fuel(self) -> float:
+        return self._fuel if self.fleet is None else float(self.fleet.fuel[self.fleet.row(self)])
+        
+    @fuel.setter
+    def fuel(self, fuel: float):
+        if self.fleet is None:
+            self._fuel = fuel
+        else:
+            self.fleet.fuel[self.fleet.row(self)] = fuel
+            
+    @property
+    def fuel_capacity(self) -> float:
+        if self.fleet is None:
+            return self._fuel_capacity
+        return float(self.fleet.fuel_capacity[self.fleet.row(self)])
+        
+    @fuel_capacity.setter
+    def fuel_capacity(self, fuel_capacity: float):
+        if self.fleet is None:
+            self._fuel_capacity = fuel_capacity
+        else:
+            self.fleet.fuel_capacity[self.fleet.row(self)] = fuel_capacity
+            
+    @property
+    def credits(self) -> int:
+        return self._credits if self.fleet is None else int(self.fleet.credits[self.fleet.row(self)])
+        
+    @credits.setter
+    def credits(self, credits: int):
+        if self.fleet is None:
+            self._credits = credits
+        else:
+            self.fleet.credits[self.fleet.row(self)] = credits
         
     def update(self):
         """Update ship systems and status"""
@@ -26,14 +94,13 @@ class Ship:
         # Update fuel consumption
         pass
         
-    def add_crew(self, crew_member: CrewMember):
-        """Add a crew member to the ship"""
-        self.crew.append(crew_member)
+    def add_crew(self, crew_member: CrewMember) -> int:
+        """Add a crew member to the ship and return their handle"""
+        return self.crew.add(crew_member)
         
     def remove_crew(self, crew_member: CrewMember):
         """Remove a crew member from the ship"""
-        if crew_member in self.crew:
-            self.crew.remove(crew_member)
+        self.crew.discard(crew_member)
             
     def add_cargo(self, item: str, quantity: int):
         """Add cargo to the ship"""
@@ -46,14 +113,20 @@ class Ship:
             if self.cargo[item] <= 0:
                 del self.cargo[item]
                 
-    def add_passenger(self, passenger: Dict):
-        """Add a passenger to the ship"""
-        self.passengers.append(passenger)
+    def add_passenger(self, passenger: Dict) -> int:
+        """Add a passenger to the ship and return their handle"""
+        if passenger not in self._passengers:
+            name = passenger.get("name")
+            self.passenger_names[name] = self.passenger_names.get(name, 0) + 1
+        return self._passengers.add(passenger)
         
     def remove_passenger(self, passenger: Dict):
-        """Remove a passenger from the ship"""
-        if passenger in self.passengers:
-            self.passengers.remove(passenger)
+        """Remove a passenger from the ship (the same dict that was added, not an equal one)"""
+        if self._passengers.discard(passenger):
+            name = passenger.get("name")
+            self.passenger_names[name] -= 1
+            if not self.passenger_names[name]:
+                del self.passenger_names[name]
             
     def repair_system(self, system: str, amount: float):
         """Repair a ship system"""
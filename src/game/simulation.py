@@ -0,0 +1,124 @@
+from itertools import groupby
+from typing import Callable, Dict, List, Optional, Sequence, Union
+from .event_manager import EventManager, Event
+from .ship import Ship
+from .crew import CrewManager
+from .fleet import Fleet
+from .metrics import metrics
+from .rng import RandomService
+
+ContextSchedule = Union[Sequence[str], Callable[[int], str]]
+
+class ShipOperations:
+    """How a headless run flies the player's ship as the schedule moves between contexts.
+
+    In a travel context the ship is underway, wearing its systems and burning fuel
+    each tick; entering a dock context refuels it and repairs it in full, paid for
+    from its credits when it can afford to.
+    """
+    def __init__(self, travel_contexts: Sequence[str] = ("In Space",),
+                 dock_contexts: Sequence[str] = ("Docked",), wear_rate: float = 0.0,
+                 fuel_burn: float = 0.0, fuel_price: float = 0.0, repair_cost: float = 0.0):
+        self.travel_contexts = tuple(travel_contexts)
+        self.dock_contexts = tuple(dock_contexts)
+        self.wear_rate = wear_rate  # Mean health lost per system per tick underway
+        self.fuel_burn = fuel_burn  # Fuel used per tick underway
+        self.fuel_price = fuel_price  # Credits per ton when refuelling
+        self.repair_cost = repair_cost  # Credits per percentage point of health restored
+
+class Simulation:
+    """Headless game loop that ticks the core systems without a display or clock"""
+    ROLL_BLOCK = 1024  # Most ticks rolled in one array, bounding it to ROLL_BLOCK x candidates
+    
+    def __init__(self, seed: Optional[int] = None,
+                 context_schedule: Optional[ContextSchedule] = None,
+                 event_manager: Optional[EventManager] = None,
+                 ship: Optional[Ship] = None,
+                 crew_manager: Optional[CrewManager] = None,
+                 on_event: Optional[Callable[[int, str, Event], None]] = None,
+                 operations: Optional[ShipOperations] = None):
+        self.seed = seed
+        # Every subsystem draws from its own stream of this one service
+        self.random = RandomService(seed)
+        self.event_manager = event_manager or EventManager(batch_activation=True,
+                                                           random_service=self.random)
+        if event_manager is not None and seed is not None:
+            self.event_manager.use_random(self.random)
+        self.ship = ship or Ship()
+        # The player's ship is row 0 of the fleet; NPC traders join it with add(..., npc=True)
+        self.fleet = Fleet(random_service=self.random)
+        self.fleet.add(self.ship)
+        self.crew_manager = crew_manager or CrewManager(random_service=self.random)
+        self.event_manager.bind_state(self.ship, self.crew_manager)
+        self.context_schedule = context_schedule or ["In Space"]
+        self.on_event = on_event
+        self.operations = operations  # None leaves the ship where it is for the whole run
+        
+        self.tick_count = 0
+        # context: {event title: times triggered}
+        self.trigger_counts: Dict[str, Dict[str, int]] = {}
+        self.context_ticks: Dict[str, int] = {}
+        
+    def context_at(self, tick: int) -> str:
+        """Get the activation context for a tick from the schedule"""
+        if callable(self.context_schedule):
+            return self.context_schedule(tick)
+        return self.context_schedule[tick % len(self.context_schedule)]
+        
+    def has_pending_work(self) -> bool:
+        """True while timed events are scheduled or any ship is underway"""
+        return (self.event_manager.pending_timed > 0
+                or bool(self.fleet.underway[:len(self.fleet)].any()))
+        
+    def update(self) -> List[Event]:
+        """Advance the core systems by one tick and return timed events that fired"""
+        with metrics.timer("events.update"):
+            fired = self.event_manager.update()
+        with metrics.timer("fleet.update"):
+            self.fleet.update()
+        with metrics.timer("crew.update"):
+            self.crew_manager.update()
+        return fired
+        
+    def run(self, ticks: int) -> Dict[str, Dict[str, int]]:
+        """Run the given number of ticks as fast as possible and return trigger counts"""
+        start = self.tick_count
+        contexts = [self.context_at(tick) for tick in range(start, start + ticks)]
+        # Consecutive ticks in the same context share vectorized activation rolls of up to
+        # ROLL_BLOCK ticks; condition changes take effect from the next block or context
+        for context, run in groupby(contexts):
+            length = len(list(run))
+            self.context_ticks[context] = self.context_ticks.get(context, 0) + length
+            self.enter_context(context)
+            for block in range(0, length, self.ROLL_BLOCK):
+                rolls = self.event_manager.roll_active_events(
+                    context, min(self.ROLL_BLOCK, length - block))
+                for triggered in rolls:
+                    fired = self.update()
+                    if fired:
+                        # Nothing presents timed events headlessly, so don't hold them open
+                        self.event_manager.active_events.clear()
+                        triggered = triggered + fired
+                    self.record(context, triggered)
+                    self.tick_count += 1
+        return self.trigger_counts
+        
+    def enter_context(self, context: str):
+        """Set the player's ship underway or service it in port, per the ship operations"""
+        operations = self.operations
+        if operations is None:
+            return
+        self.fleet.set_underway(self.ship, context in operations.travel_contexts,
+                                operations.wear_rate, operations.fuel_burn)
+        if context in operations.dock_contexts:
+            rows = [self.fleet.row(self.ship)]
+            self.fleet.refuel(operations.fuel_price, rows)
+            self.fleet.repair(1.0, operations.repair_cost, rows)
+        
+    def record(self, context: str, triggered: List[Event]):
+        """Tally triggered events and pass them to the event callback"""
+        counts = self.trigger_counts.setdefault(context, {})
+        for event in triggered:
+            counts[event.title] = counts.get(event.title, 0) + 1
+            if self.on_event:
+                self.on_event(self.tick_count, context, event)
@@ -1,18 +1,70 @@
 import pygame
-from typing import List, Dict
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from .event_manager import Event
+from .metrics import metrics
+
+class LabelCache:
+    """LRU cache of rendered text surfaces keyed by text and colour"""
+    def __init__(self, font, max_size: int = 512):
+        self.font = font
+        self.max_size = max_size
+        self.surfaces: "OrderedDict[Tuple[str, Tuple[int, int, int]], pygame.Surface]" = OrderedDict()
+        
+    def get(self, text: str, color: Tuple[int, int, int] = (255, 255, 255)) -> pygame.Surface:
+        """Get the surface for a label, rendering it only on a cache miss"""
+        key = (text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.font.render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+        
+    def clear(self):
+        self.surfaces.clear()
 
 class UIManager:
+    BACKGROUND = (0, 0, 0)
+    OVERLAY_WIDTH = 280
+    OVERLAY_COLOR = (255, 255, 0)
+    PLACEHOLDER_COLOR = (40, 40, 60)
+    
     def __init__(self, game):
         self.game = game
         self.font = pygame.font.Font(None, 24)
+        self.labels = LabelCache(self.font)
+        # Background artwork loader; without one events are drawn without art
+        self.assets = getattr(game, "assets", None)
         self.active_event = None
         self.screen_state = "main"  # main, event, crew, ship, etc.
+        # Panel name: state it was last drawn from; missing means it must be redrawn
+        self.panel_state: Dict[str, tuple] = {}
+        self.drawn_screen: Optional[str] = None
+        # Frame-time and event-stack overlay, toggled with F3
+        self.show_overlay = False
+        
+    def invalidate(self):
+        """Force every panel to redraw on the next render"""
+        self.panel_state.clear()
         
     def handle_event(self, pygame_event):
         """Handle pygame events"""
         if pygame_event.type == pygame.MOUSEBUTTONDOWN:
             self.handle_click(pygame_event.pos)
+        elif pygame_event.type == pygame.KEYDOWN and pygame_event.key == pygame.K_F3:
+            self.toggle_overlay()
+        elif pygame_event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.invalidate()
+            
+    def toggle_overlay(self):
+        """Show or hide the performance overlay; timing is only collected while it is shown"""
+        self.show_overlay = not self.show_overlay
+        metrics.enable(self.show_overlay)
+        self.invalidate()
             
     def handle_click(self, pos):
         """Handle mouse clicks"""
@@ -23,12 +75,84 @@ class UIManager:
             # Handle main screen clicks
             pass
             
-    def render(self, screen):
-        """Render the current UI state"""
+    def render(self, screen) -> List[pygame.Rect]:
+        """Redraw panels whose backing state changed and return the dirty rects"""
+        if self.assets is not None:
+            self.assets.poll()
+        width, height = screen.get_size()
         if self.active_event:
-            self.render_event(screen)
+            panels = [("event", pygame.Rect(0, 0, width, height),
+                       self.event_state(), self.render_event)]
         else:
-            self.render_main_screen(screen)
+            panels = [
+                ("ship", pygame.Rect(0, 0, width, 200), self.ship_state(), self.render_ship_status),
+                ("crew", pygame.Rect(0, 200, width, 200), self.crew_state(), self.render_crew_list),
+                ("cargo", pygame.Rect(0, 400, width, height - 400), self.cargo_state(),
+                 self.render_cargo),
+            ]
+        # Switching between screens redraws everything
+        screen_name = "event" if self.active_event else "main"
+        if screen_name != self.drawn_screen:
+            self.invalidate()
+            self.drawn_screen = screen_name
+            
+        dirty = []
+        for name, rect, state, draw in panels:
+            if self.panel_state.get(name) == state:
+                continue
+            screen.set_clip(rect)
+            screen.fill(self.BACKGROUND, rect)
+            draw(screen)
+            screen.set_clip(None)
+            self.panel_state[name] = state
+            dirty.append(rect)
+            
+        if self.show_overlay:
+            rect = pygame.Rect(width - self.OVERLAY_WIDTH, 0, self.OVERLAY_WIDTH, height)
+            state = self.overlay_state()
+            # Panels drawn underneath it this frame paint over the overlay too
+            if self.panel_state.get("overlay") != state or rect.collidelist(dirty) != -1:
+                screen.set_clip(rect)
+                screen.fill(self.BACKGROUND, rect)
+                self.render_overlay(screen, rect)
+                screen.set_clip(None)
+                self.panel_state["overlay"] = state
+                dirty.append(rect)
+        return dirty
+        
+    def ship_state(self) -> tuple:
+        ship = self.game.ship
+        return (ship.name, ship.location, tuple(ship.systems.items()))
+        
+    def crew_state(self) -> tuple:
+        return tuple((member.name, member.health, member.morale) for member in self.game.ship.crew)
+        
+    def cargo_state(self) -> tuple:
+        ship = self.game.ship
+        return (tuple(ship.cargo.items()),
+                tuple(passenger.get("name", "Unknown") for passenger in ship.passengers))
+        
+    def event_state(self) -> tuple:
+        # Redraw once the event's artwork finishes loading, or fails to
+        artwork = self.active_event.artwork if self.active_event else None
+        if not (self.assets and artwork):
+            return (id(self.active_event), None, None)
+        return (id(self.active_event), self.assets.is_ready(artwork), self.assets.is_missing(artwork))
+        
+    def overlay_state(self) -> tuple:
+        return tuple(self.overlay_lines())
+        
+    def overlay_lines(self) -> List[str]:
+        """Frame-time breakdown and event-stack statistics"""
+        lines = [f"Frame: {metrics.frame_time.average * 1000:.1f} ms"]
+        lines.extend(f"{name}: {ms:.2f} ms" for name, ms in metrics.breakdown())
+        event_manager = getattr(self.game, "event_manager", None)
+        if event_manager is not None:
+            lines.append(f"Stack: {len(event_manager.event_stack)} events")
+            lines.append(f"Active: {len(event_manager.active_events)}")
+            lines.append(f"Scheduled: {event_manager.pending_timed}")
+        lines.extend(f"{name}: {count}" for name, count in sorted(metrics.counters.items()))
+        return lines
             
     def render_main_screen(self, screen):
         """Render the main game screen"""
@@ -46,15 +170,13 @@ class UIManager:
         y = 10
         # Ship name and location
         text = f"{self.game.ship.name} - {self.game.ship.location}"
-        text_surface = self.font.render(text, True, (255, 255, 255))
-        screen.blit(text_surface, (10, y))
+        screen.blit(self.labels.get(text), (10, y))
         
         # Systems status
         y += 30
         for system, status in self.game.ship.systems.items():
             text = f"{system}: {status*100:.0f}%"
-            text_surface = self.font.render(text, True, (255, 255, 255))
-            screen.blit(text_surface, (10, y))
+            screen.blit(self.labels.get(text), (10, y))
             y += 20
             
     def render_crew_list(self, screen):
@@ -62,56 +184,70 @@ class UIManager:
         y = 200
         for member in self.game.ship.crew:
             text = f"{member.name} - Health: {member.health*100:.0f}% Morale: {member.morale*100:.0f}%"
-            text_surface = self.font.render(text, True, (255, 255, 255))
-            screen.blit(text_surface, (10, y))
+            screen.blit(self.labels.get(text), (10, y))
             y += 20
             
     def render_cargo(self, screen):
         """Render cargo and passenger information"""
         y = 400
         # Cargo
-        text = "Cargo:"
-        text_surface = self.font.render(text, True, (255, 255, 255))
-        screen.blit(text_surface, (10, y))
+        screen.blit(self.labels.get("Cargo:"), (10, y))
         y += 20
         
         for item, quantity in self.game.ship.cargo.items():
             text = f"{item}: {quantity}"
-            text_surface = self.font.render(text, True, (255, 255, 255))
-            screen.blit(text_surface, (10, y))
+            screen.blit(self.labels.get(text), (10, y))
             y += 20
             
         # Passengers
         y += 20
-        text = "Passengers:"
-        text_surface = self.font.render(text, True, (255, 255, 255))
-        screen.blit(text_surface, (10, y))
+        screen.blit(self.labels.get("Passengers:"), (10, y))
         y += 20
         
         for passenger in self.game.ship.passengers:
             text = passenger.get("name", "Unknown")
-            text_surface = self.font.render(text, True, (255, 255, 255))
-            screen.blit(text_surface, (10, y))
+            screen.blit(self.labels.get(text), (10, y))
             y += 20
             
+    def render_overlay(self, screen, rect: pygame.Rect):
+        """Render the performance overlay down the right edge"""
+        y = rect.y + 10
+        for line in self.overlay_lines():
+            screen.blit(self.labels.get(line, self.OVERLAY_COLOR), (rect.x + 10, y))
+            y += 20
+            
+    def render_artwork(self, screen, path: str):
+        """Draw artwork in the box to the right of the event text"""
+        width, height = self.assets.art_size
+        rect = pygame.Rect(screen.get_width() - width - 10, 50, width, height)
+        surface = self.assets.get(path)
+        if surface is None:
+            # Art that failed to load is never retried, so say so rather than wait forever
+            screen.fill(self.PLACEHOLDER_COLOR, rect)
+            label = self.labels.get("No artwork" if self.assets.is_missing(path) else "Loading...")
+            screen.blit(label, label.get_rect(center=rect.center))
+        else:
+            screen.blit(surface, surface.get_rect(center=rect.center))
+            
     def render_event(self, screen):
         """Render an active event"""
         if not self.active_event:
             return
             
+        # Event artwork, or a placeholder until the loader has it
+        if self.assets is not None and self.active_event.artwork:
+            self.render_artwork(screen, self.active_event.artwork)
+            
         # Event title
-        title = self.font.render(self.active_event.title, True, (255, 255, 255))
-        screen.blit(title, (10, 10))
+        screen.blit(self.labels.get(self.active_event.title), (10, 10))
         
         # Event description
         y = 50
-        description = self.font.render(self.active_event.description, True, (255, 255, 255))
-        screen.blit(description, (10, y))
+        screen.blit(self.labels.get(self.active_event.description), (10, y))
         
         # Event choices
         y += 100
         for i, choice in enumerate(self.active_event.choices):
             text = f"{i+1}. {choice['text']}"
-            text_surface = self.font.render(text, True, (255, 255, 255))
-            screen.blit(text_surface, (10, y))
-            y += 30 
\ No newline at end of file
+            screen.blit(self.labels.get(text), (10, y))
+            y += 30
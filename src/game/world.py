@@ -0,0 +1,25 @@
+from typing import Iterable, Optional
+
+# Cepheus Engine trade classifications
+TRADE_CODES = ("Ag", "As", "Ba", "De", "Fl", "Ga", "Hi", "Ht", "Ic",
+               "In", "Lo", "Lt", "Na", "Ni", "Po", "Ri", "Va", "Wa")
+
+# Starports that sell fuel; worlds with a gas giant can be skimmed instead
+REFUELING_STARPORTS = ("A", "B", "C", "D")
+
+class World:
+    """A world the ship can visit, with the data trade and travel rules need"""
+    def __init__(self, name: str, trade_codes: Iterable[str] = (), starport: str = "C",
+                 hex: Optional[str] = None, gas_giant: bool = False):
+        self.name = name
+        self.trade_codes = tuple(trade_codes)
+        self.starport = starport
+        self.hex = hex  # Sector hex location as "CCRR", e.g. "0101"
+        self.gas_giant = gas_giant
+        
+    @property
+    def can_refuel(self) -> bool:
+        return self.starport in REFUELING_STARPORTS or self.gas_giant
+        
+    def __repr__(self):
+        return f"World(name='{self.name}', hex='{self.hex}', trade_codes={self.trade_codes}, starport='{self.starport}')"
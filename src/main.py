@@ -1,11 +1,25 @@
+import argparse
+import logging
 import pygame
 import sys
 from game.game import Game
 
 def main():
+    parser = argparse.ArgumentParser(description="Space Tycoon")
+    parser.add_argument("--fps", type=int, default=60, help="frame-rate cap while active (0 = uncapped)")
+    parser.add_argument("--idle-timeout", type=int, default=500,
+                        help="milliseconds to block waiting for input while idle")
+    parser.add_argument("--log-level", default="INFO",
+                        choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="logging verbosity")
+    parser.add_argument("--metrics", action="store_true",
+                        help="collect subsystem timings and show the overlay (F3 toggles it)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=args.log_level, format="%(levelname)s %(name)s: %(message)s")
+    
     pygame.init()
-    game = Game()
+    game = Game(fps=args.fps, idle_timeout_ms=args.idle_timeout, show_metrics=args.metrics)
     game.run()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
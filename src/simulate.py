@@ -0,0 +1,25 @@
+import argparse
+import time
+from game.simulation import Simulation
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Space Tycoon headless at full speed")
+    parser.add_argument("--ticks", type=int, default=10000, help="number of ticks to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--schedule", default="In Space",
+                        help="comma separated activation contexts, cycled per tick")
+    args = parser.parse_args()
+    
+    simulation = Simulation(seed=args.seed, context_schedule=args.schedule.split(","))
+    start = time.perf_counter()
+    counts = simulation.run(args.ticks)
+    elapsed = time.perf_counter() - start
+    
+    print(f"Simulated {args.ticks} ticks in {elapsed:.2f}s")
+    for context, events in counts.items():
+        print(f"{context}:")
+        for title, count in sorted(events.items(), key=lambda item: -item[1]):
+            print(f"  {title}: {count}")
+
+if __name__ == "__main__":
+    main()
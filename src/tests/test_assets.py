@@ -0,0 +1,130 @@
+import sys
+import os
+import tempfile
+import time
+import unittest
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from game.assets import ASSET_LOADED, AssetManager, TextureCache
+from game.event_manager import Event
+from game.ship import Ship
+from game.ui import UIManager
+
+def wait_for(assets, path, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        assets.poll()
+        if assets.is_ready(path) or path in assets.missing:
+            return
+        time.sleep(0.01)
+
+class FakeEventManager:
+    def __init__(self, events):
+        self.events = events
+
+    def get_candidate_events(self, context):
+        return [event for event in self.events if event.context in (context, "Any")]
+
+class TestAssets(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for name, size in (("pirates.png", (800, 300)), ("small.png", (40, 30))):
+            pygame.image.save(pygame.Surface(size), os.path.join(self.tmp.name, name))
+        self.assets = AssetManager(self.tmp.name, art_size=(400, 300))
+
+    def tearDown(self):
+        self.assets.close()
+        self.tmp.cleanup()
+
+    def test_loaded_artwork_wakes_an_idle_loop(self):
+        """Test the loader posts an event an idle pygame.event.wait can wake on"""
+        pygame.event.clear()
+        self.assets.request("small.png")
+        event = pygame.event.wait(5000)
+        while event.type not in (ASSET_LOADED, pygame.NOEVENT):
+            event = pygame.event.wait(5000)
+        self.assertEqual(event.type, ASSET_LOADED)
+        self.assertEqual(event.path, "small.png")
+        self.assertEqual(self.assets.poll(), 1)
+        self.assertTrue(self.assets.is_ready("small.png"))
+
+    def test_texture_cache_evicts_by_size(self):
+        """Test the cache stays within its byte budget, evicting least recently used"""
+        surface = pygame.Surface((10, 10), depth=32)
+        cache = TextureCache(max_bytes=2 * TextureCache.surface_bytes(surface))
+        cache.put("a", surface)
+        cache.put("b", surface.copy())
+        cache.get("a")
+        cache.put("c", surface.copy())
+        self.assertEqual(list(cache.surfaces), ["a", "c"])
+        self.assertEqual(cache.size, cache.max_bytes)
+        cache.put("huge", pygame.Surface((100, 100), depth=32))
+        self.assertNotIn("huge", cache)
+
+    def test_background_load_and_scale(self):
+        """Test images load off the main thread, scaled to fit the art box"""
+        self.assertIsNone(self.assets.get("pirates.png"))
+        self.assertIn("pirates.png", self.assets.pending)
+        wait_for(self.assets, "pirates.png")
+        self.assertEqual(self.assets.get("pirates.png").get_size(), (400, 150))
+        self.assertNotIn("pirates.png", self.assets.pending)
+
+    def test_missing_art_is_not_retried(self):
+        """Test a missing image is remembered rather than requested again"""
+        self.assets.request("absent.png")
+        wait_for(self.assets, "absent.png")
+        self.assertIn("absent.png", self.assets.missing)
+        self.assets.request("absent.png")
+        self.assertNotIn("absent.png", self.assets.pending)
+
+    def test_prefetch_context(self):
+        """Test prefetching requests art for events that can trigger in a context"""
+        events = [Event("random", 0.5, "In Space", "Pirates", "", [], artwork="pirates.png",
+                        conclusion_artwork="small.png"),
+                  Event("trade", 0.5, "Docked", "Market", "", [], artwork="market.png")]
+        self.assets.prefetch_context(FakeEventManager(events), "In Space")
+        self.assertEqual(self.assets.pending, {"pirates.png", "small.png"})
+
+    def test_event_screen_shows_placeholder_until_ready(self):
+        """Test the event panel redraws once its artwork arrives"""
+        class FakeGame:
+            ship = Ship()
+            assets = self.assets
+        ui = UIManager(FakeGame())
+        screen = pygame.Surface((1024, 768))
+        ui.active_event = Event("random", 1.0, "Any", "Pirates", "Ships approach.", [],
+                                artwork="pirates.png")
+        self.assertEqual(len(ui.render(screen)), 1)
+        self.assertEqual(screen.get_at((620, 60))[:3], UIManager.PLACEHOLDER_COLOR)
+        wait_for(self.assets, "pirates.png")
+        self.assertEqual(len(ui.render(screen)), 1)
+        self.assertEqual(screen.get_at((620, 60))[:3], (0, 0, 0))
+
+    def test_event_screen_falls_back_when_art_is_missing(self):
+        """Test art that failed to load replaces the loading placeholder for good"""
+        class FakeGame:
+            ship = Ship()
+            assets = self.assets
+        ui = UIManager(FakeGame())
+        screen = pygame.Surface((1024, 768))
+        ui.active_event = Event("random", 1.0, "Any", "Pirates", "Ships approach.", [],
+                                artwork="absent.png")
+        ui.render(screen)
+        wait_for(self.assets, "absent.png")
+        ui.render(screen)
+        self.assertIn(("No artwork", (255, 255, 255)), ui.labels.surfaces)
+        self.assertEqual(self.assets.pending, set())
+        self.assertEqual(ui.render(screen), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import sys
+import os
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.balance import BalanceRunner
+
+class TestBalanceRunner(unittest.TestCase):
+    def test_campaign_seeds_are_independent(self):
+        """Test that every campaign gets its own reproducible seed"""
+        runner = BalanceRunner(8, 10, seed=5)
+        seeds = runner.campaign_seeds()
+        self.assertEqual(len(set(seeds)), 8)
+        self.assertEqual(seeds, BalanceRunner(8, 10, seed=5).campaign_seeds())
+    
+    def test_pooled_run_writes_columns(self):
+        """Test a pooled batch run aggregates statistics and writes NPZ and CSV"""
+        with tempfile.TemporaryDirectory() as tmp:
+            runner = BalanceRunner(4, 250, seed=1, context_schedule=["In Space", "Docked"],
+                                   sample_every=100, workers=2,
+                                   cache_path=str(Path(tmp) / "events.pickle"))
+            results = runner.run()
+            self.assertEqual(results.trigger_counts.shape, (4, 2))
+            self.assertEqual(results.credits.shape, (4, 4))
+            self.assertEqual(list(results.sample_ticks), [0, 100, 200, 250])
+            np.testing.assert_allclose(results.trigger_frequencies(), [1.0, 1.0])
+            # Every docking pays for the fuel burnt on the way in
+            self.assertTrue((np.diff(results.credits, axis=1) < 0).all())
+            
+            npz_path = Path(tmp) / "balance.npz"
+            results.write_npz(str(npz_path))
+            with np.load(npz_path) as data:
+                self.assertEqual(list(data["event_contexts"]), ["Docked", "In Space"])
+                self.assertEqual(data["systems"].shape, (4, 6))
+            
+            csv_path = Path(tmp) / "balance.csv"
+            results.write_csv(str(csv_path))
+            with open(csv_path, newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(rows[1]["title"], "Test Space Event")
+            self.assertEqual(float(rows[1]["mean_triggers"]), 125.0)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
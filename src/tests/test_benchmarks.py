@@ -0,0 +1,37 @@
+import sys
+import os
+import unittest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_suite import compare
+
+class TestBaselineComparison(unittest.TestCase):
+    def setUp(self):
+        self.baseline = {
+            "events.1000.load_cold_s": {"value": 1.0, "unit": "s", "better": "lower"},
+            "headless.ticks_per_s": {"value": 1000.0, "unit": "ticks/s", "better": "higher"},
+        }
+
+    def test_within_tolerance(self):
+        results = {
+            "events.1000.load_cold_s": {"value": 1.2, "unit": "s", "better": "lower"},
+            "headless.ticks_per_s": {"value": 850.0, "unit": "ticks/s", "better": "higher"},
+        }
+        self.assertEqual(compare(results, self.baseline, 0.25), [])
+
+    def test_regressions_in_either_direction(self):
+        results = {
+            "events.1000.load_cold_s": {"value": 1.5, "unit": "s", "better": "lower"},
+            "headless.ticks_per_s": {"value": 500.0, "unit": "ticks/s", "better": "higher"},
+        }
+        regressions = compare(results, self.baseline, 0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("events.1000.load_cold_s"))
+        self.assertIn("100% worse", regressions[1])
+
+    def test_new_metrics_are_ignored(self):
+        results = {"crew.1000.add_crew_us": {"value": 5.0, "unit": "us", "better": "lower"}}
+        self.assertEqual(compare(results, self.baseline, 0.25), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import sys
+import os
+import unittest
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.crew import CrewMember, CrewManager
+
+def make_member(name, skills):
+    return CrewMember(name, skills, {"STR": 7, "DEX": 8, "EDU": 9})
+
+class TestCrewRoster(unittest.TestCase):
+    def setUp(self):
+        self.manager = CrewManager(seed=1)
+        self.medic = make_member("Ana", {"Medical": 2, "Admin": 0})
+        self.pilot = make_member("Bo", {"Pilot": 3})
+        self.doc = make_member("Cy", {"Medical": 1})
+        for member in (self.medic, self.pilot, self.doc):
+            self.manager.add_crew(member)
+    
+    def test_skill_queries(self):
+        """Test skill lookups at minimum levels"""
+        self.assertEqual(self.manager.get_crew_with_skill("Medical"), [self.medic, self.doc])
+        self.assertEqual(self.manager.get_crew_with_skill("Medical", 2), [self.medic])
+        self.assertEqual(self.manager.get_crew_with_skill("Admin"), [self.medic])
+        self.assertEqual(self.manager.get_crew_with_skill("Gunnery"), [])
+    
+    def test_roster_follows_changes(self):
+        """Test that removals and skill changes update the index"""
+        self.manager.remove_crew(self.medic)
+        self.assertEqual(self.manager.get_crew_with_skill("Medical"), [self.doc])
+        self.assertEqual(list(self.manager.roster.characteristic("DEX")), [8, 8])
+        self.manager.set_skill(self.pilot, "Medical", 4)
+        self.assertEqual(self.manager.get_crew_with_skill("Medical", 3), [self.pilot])
+        # Many new skills grow the matrix
+        for i in range(20):
+            self.manager.set_skill(self.doc, f"Skill {i}", i)
+        self.assertEqual(self.manager.get_crew_with_skill("Skill 19"), [self.doc])
+    
+    def test_group_skill_check(self):
+        """Test vectorized skill checks follow the 2d6 + skill >= 8 rule"""
+        # Untrained always fails, +6 always succeeds, -10 always fails
+        self.assertEqual(self.manager.group_skill_check("Pilot", 2), [False, True, False])
+        self.assertEqual(self.manager.group_skill_check("Medical", 6), [True, False, True])
+        self.assertEqual(self.manager.group_skill_check("Medical", -10, [self.doc]), [False])
+        rates = [self.manager.group_skill_check("Pilot", 0)[1] for _ in range(2000)]
+        # 2d6 + 3 >= 8 needs 5+, which is 30/36
+        self.assertAlmostEqual(sum(rates) / len(rates), 30 / 36, delta=0.04)
+
+class TestRelationshipGraph(unittest.TestCase):
+    def setUp(self):
+        self.manager = CrewManager()
+        self.a = make_member("Ana", {})
+        self.b = make_member("Bo", {})
+        self.c = make_member("Cy", {})
+        # Existing dict relationships are imported when members join
+        self.a.relationships = {"Bo": -0.8, "Cy": 0.4}
+        self.c.relationships = {"Ana": 0.6}
+        for member in (self.a, self.b, self.c):
+            self.manager.add_crew(member)
+    
+    def test_queries(self):
+        """Test top-k, threshold and average queries"""
+        self.manager.set_relationship(self.b, self.c, -0.5)
+        worst = self.manager.most_hostile_pairs(2)
+        self.assertEqual([(x.name, y.name) for x, y, _ in worst], [("Ana", "Bo"), ("Bo", "Cy")])
+        best = self.manager.relationships.top_k(1, hostile=False)
+        self.assertEqual([(x.name, y.name) for x, y, _ in best], [("Cy", "Ana")])
+        self.assertEqual(len(self.manager.relationships_below(0.0)), 2)
+        self.assertAlmostEqual(float(self.manager.relationships.average()[0]), -0.2, places=5)
+    
+    def test_bulk_updates_write_back(self):
+        """Test decay and adjust reach the per-member dicts"""
+        self.manager.decay_relationships(0.5)
+        self.assertEqual(self.a.relationships["Bo"], -0.8)
+        relationships = self.manager.get_crew_relationships(self.a)
+        self.assertAlmostEqual(relationships["Bo"], -0.4, places=5)
+        self.manager.relationships.adjust(np.array([1, 1]), np.array([0, 0]), np.array([0.7, 0.7]))
+        self.assertAlmostEqual(self.manager.get_crew_relationships(self.b)["Ana"], 1.0)
+        # Clamping only applies to the adjusted cells
+        self.manager.relationships.adjust(np.array([2]), np.array([0]), np.array([0.5]), 0.0, 0.5)
+        self.assertAlmostEqual(self.manager.get_crew_relationships(self.c)["Ana"], 0.5)
+        self.assertAlmostEqual(self.manager.get_crew_relationships(self.a)["Bo"], -0.4, places=5)
+    
+    def test_rejoining_member_relinks_by_name(self):
+        """Test links to and from a member are restored when they rejoin"""
+        self.manager.set_relationship(self.b, self.c, -0.2)
+        self.manager.remove_crew(self.b)
+        self.assertNotIn("Bo", self.manager.relationships.named)
+        self.manager.add_crew(self.b)
+        self.assertEqual(self.manager.relationships.get(self.a, self.b), -0.8)
+        self.assertEqual(self.manager.relationships.get(self.b, self.c), -0.2)
+        # Links are by name, so a second Bo inherits how others feel about the first
+        twin = make_member("Bo", {})
+        self.manager.add_crew(twin)
+        self.assertEqual(self.manager.relationships.get(self.a, twin), -0.8)
+        self.assertEqual(self.manager.relationships.named["Bo"], [self.b, twin])
+    
+    def test_removal(self):
+        """Test removing a member drops their row and column"""
+        self.manager.remove_crew(self.a)
+        self.assertEqual(self.manager.most_hostile_pairs(5), [])
+        self.manager.set_relationship(self.c, self.b, -0.3)
+        self.assertEqual(self.manager.relationships.get(self.c, self.b), -0.3)
+        self.assertIsNone(self.manager.relationships.get(self.b, self.c))
+        # Large crews grow the matrix
+        for i in range(40):
+            self.manager.add_crew(make_member(f"Extra {i}", {}))
+        self.manager.set_relationship(self.b, self.manager.crew[-1], -0.9)
+        self.assertEqual(self.manager.most_hostile_pairs(1)[0][1].name, "Extra 39")
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
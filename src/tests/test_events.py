@@ -2,8 +2,11 @@ import sys
 import os
 from pathlib import Path
 import unittest
+import tempfile
+from unittest import mock
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from game import event_manager
 from game.event_manager import EventManager, Event
 
 def print_separator():
@@ -114,6 +117,249 @@ class TestEventSystem(unittest.TestCase):
                         "Event not removed from active events")
         print("Event successfully resolved")
 
+    def test_context_index(self):
+        """Test that the context index tracks loads, re-insertion and removal"""
+        print("\nTesting context index...")
+        
+        space_candidates = self.manager.get_candidate_events("In Space")
+        self.assertTrue(all(e.context in ("In Space", "Any") for e in space_candidates),
+                        "Candidate from wrong context returned")
+        self.assertEqual(len(space_candidates), 1, "Expected 1 space candidate")
+        
+        # "Any" events are candidates for every context
+        any_event = Event("crew", 1.0, "Any", "Crew Conflict", "Tempers flare.", [])
+        self.manager.add_event(any_event)
+        self.assertIn(any_event, self.manager.get_candidate_events("Docked"))
+        self.assertIn(any_event, self.manager.get_active_events("In Space"))
+        
+        # Removal drops the event from its bucket
+        self.manager.remove_event(any_event)
+        self.assertNotIn(any_event, self.manager.event_stack)
+        self.assertNotIn(any_event, self.manager.get_candidate_events("Docked"))
+        
+        # Resolution re-indexes events that return to the stack
+        dock_event = self.manager.get_candidate_events("Docked")[0]
+        self.manager.remove_event(dock_event)
+        self.manager.active_events.append(dock_event)
+        self.manager.resolve_event(dock_event, 0)
+        self.assertIn(dock_event, self.manager.get_candidate_events("Docked"))
+        print("Context index consistent")
+
+    def test_batch_activation(self):
+        """Test vectorized batch activation rolls"""
+        print("\nTesting batch activation...")
+        
+        manager = EventManager(batch_activation=True, seed=42)
+        manager.add_event(Event("random", 0.0, "In Space", "Never", "Never fires.", []))
+        
+        # Rate 1.0 always fires, rate 0.0 never does
+        rolls = manager.roll_active_events("In Space", ticks=50)
+        self.assertEqual(len(rolls), 50)
+        for triggered in rolls:
+            self.assertEqual([e.title for e in triggered], ["Test Space Event"])
+        self.assertEqual([e.context for e in manager.get_active_events("Docked")], ["Docked"])
+        
+        # Same seed gives the same rolls
+        half = Event("random", 0.5, "In Space", "Coin Flip", "Maybe.", [])
+        first = EventManager(batch_activation=True, seed=7)
+        second = EventManager(batch_activation=True, seed=7)
+        first.add_event(half)
+        second.add_event(half)
+        titles = lambda rolls: [[e.title for e in triggered] for triggered in rolls]
+        self.assertEqual(titles(first.roll_active_events("In Space", ticks=20)),
+                         titles(second.roll_active_events("In Space", ticks=20)))
+        print("Batch activation consistent")
+
+    def test_event_cache(self):
+        """Test that unchanged event files load from the compiled cache"""
+        print("\nTesting compiled event cache...")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            events_dir = Path(tmp) / "events"
+            events_dir.mkdir()
+            source = Path("data/events/test_events.xml").read_text()
+            (events_dir / "base.xml").write_text(source)
+            (events_dir / "mod.xml").write_text(source)
+            cache_path = Path(tmp) / "cache" / "events.pickle"
+            
+            def load():
+                with mock.patch.object(event_manager, "parse_event_file",
+                                       side_effect=event_manager.parse_event_file) as parse:
+                    manager = EventManager(events_dir=str(events_dir), cache_path=str(cache_path),
+                                           load_workers=1)
+                return manager, [Path(call.args[0]).name for call in parse.call_args_list]
+            
+            manager, parsed = load()
+            self.assertEqual(sorted(parsed), ["base.xml", "mod.xml"])
+            self.assertTrue(cache_path.exists(), "Cache file not written")
+            
+            # Nothing changed: no XML parsing at all
+            manager, parsed = load()
+            self.assertEqual(parsed, [])
+            self.assertEqual(len(manager.event_stack), 4)
+            self.assertEqual(len(manager.event_stack[0].choices), 2)
+            
+            # Only the edited file is re-parsed
+            (events_dir / "mod.xml").write_text(source.replace("Test Dock Event", "Modded Dock Event"))
+            manager, parsed = load()
+            self.assertEqual(parsed, ["mod.xml"])
+            self.assertIn("Modded Dock Event", [e.title for e in manager.event_stack])
+        print("Event cache consistent")
+
+    def test_parallel_loading(self):
+        """Test that pooled loading matches serial loading and reports bad files"""
+        print("\nTesting parallel event loading...")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            events_dir = Path(tmp)
+            source = Path("data/events/test_events.xml").read_text()
+            for i in range(4):
+                (events_dir / f"pack_{i}.xml").write_text(
+                    source.replace("Test Space Event", f"Space Event {i}"))
+            (events_dir / "broken.xml").write_text("<events><event>")
+            
+            serial = EventManager(events_dir=str(events_dir), cache_path=None, load_workers=1)
+            pooled = EventManager(events_dir=str(events_dir), cache_path=None, load_workers=2)
+            self.assertEqual(len(pooled.event_stack), 8)
+            self.assertEqual([e.title for e in serial.event_stack],
+                             [e.title for e in pooled.event_stack])
+            self.assertEqual(pooled.event_stack[0].title, "Space Event 0")
+        print("Parallel loading consistent")
+
+    def test_timed_events(self):
+        """Test scheduling, cancelling and rescheduling timed events"""
+        print("\nTesting timed events...")
+        
+        make = lambda title: Event("timed", 1.0, "Any", title, "Tick tock.", [])
+        war = self.manager.schedule_event(make("Civil War"), 3)
+        bomb = self.manager.schedule_event_in(make("Device Activates"), 2)
+        audit = self.manager.schedule_event(make("Audit"), 2)
+        self.manager.cancel_event(audit)
+        
+        self.assertEqual(self.manager.update(), [])
+        fired = self.manager.update()
+        self.assertEqual([e.title for e in fired], ["Device Activates"])
+        self.assertIn(bomb.event, self.manager.active_events)
+        
+        war = self.manager.reschedule_event(war, 10)
+        self.assertEqual(self.manager.update(5), [])
+        self.assertEqual([e.title for e in self.manager.update(3)], ["Civil War"])
+        self.assertEqual(self.manager.pending_timed, 0)
+        
+        # Cancelling many events compacts the heap
+        handles = [self.manager.schedule_event(make(str(i)), 100 + i) for i in range(500)]
+        for handle in handles[:-1]:
+            self.manager.cancel_event(handle)
+        self.assertLess(len(self.manager.timed_events), 100)
+        self.assertEqual([e.title for e in self.manager.update(1000)], ["499"])
+        print("Timed events consistent")
+
+    def test_trigger_conditions(self):
+        """Test that conditional events stack only while their conditions hold"""
+        print("\nTesting trigger conditions...")
+        
+        from game.crew import CrewManager, CrewMember
+        from game.ship import Ship
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "conditional.xml").write_text("""<?xml version="1.0" encoding="UTF-8"?>
+<events>
+    <event source="skill" activation_rate="1.0" context="Any">
+        <title>Outbreak Spotted</title>
+        <description>The medic notices something.</description>
+        <condition key="skill.Medical" op="ge" value="2" />
+        <choice text="Quarantine" outcome="quarantine" />
+    </event>
+    <event source="resource" activation_rate="1.0" context="In Space">
+        <title>Misjump Risk</title>
+        <description>The drive is failing.</description>
+        <condition key="system.jump_drive" op="lt" value="0.5" />
+        <condition key="cargo.Radioactives" />
+    </event>
+</events>""")
+            manager = EventManager(events_dir=tmp, cache_path=None)
+            self.assertEqual(manager.get_active_events("In Space"), [])
+            
+            ship, crew = Ship(), CrewManager()
+            manager.bind_state(ship, crew)
+            self.assertEqual(manager.get_active_events("In Space"), [])
+            
+            crew.add_crew(CrewMember("Doc", {"Medical": 2}, {}))
+            ship.damage_system("jump_drive", 0.6)
+            manager.update()
+            self.assertEqual([e.title for e in manager.get_active_events("In Space")],
+                             ["Outbreak Spotted"])
+            
+            ship.add_cargo("Radioactives", 3)
+            manager.update()
+            self.assertEqual(len(manager.get_active_events("In Space")), 2)
+            
+            ship.repair_system("jump_drive", 1.0)
+            manager.update()
+            self.assertEqual([e.title for e in manager.get_active_events("In Space")],
+                             ["Outbreak Spotted"])
+            
+            # Only events reading a changed key are re-evaluated
+            with mock.patch.object(manager.conditions, "predicates",
+                                   wraps=manager.conditions.predicates) as predicates:
+                ship.credits += 100
+                manager.update()
+                predicates.__getitem__.assert_not_called()
+        print("Trigger conditions consistent")
+
+    def test_bad_condition_key_is_a_file_error(self):
+        """Test an unknown condition key fails its own file at load time, not the game"""
+        from game.simulation import Simulation
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "a_broken_mod.xml").write_text("""<?xml version="1.0" encoding="UTF-8"?>
+<events>
+    <event source="skill" activation_rate="1.0" context="Any">
+        <title>Typo</title>
+        <description>Misspelt key.</description>
+        <condition key="skil.Medical" />
+    </event>
+</events>""")
+            (Path(tmp) / "b_good.xml").write_text("""<?xml version="1.0" encoding="UTF-8"?>
+<events>
+    <event source="random" activation_rate="1.0" context="Any">
+        <title>Fine</title>
+        <description>Loads.</description>
+    </event>
+</events>""")
+            with self.assertLogs("game.event_manager", "ERROR") as logs:
+                manager = EventManager(events_dir=tmp, cache_path=None, load_workers=1)
+            self.assertIn("skil.Medical", logs.output[0])
+            self.assertEqual([e.title for e in manager.event_stack], ["Fine"])
+            Simulation(event_manager=manager)
+
+    def test_resolved_conditional_event_stacks_once(self):
+        """Test resolving an event still on the stack does not index a second copy"""
+        from game.crew import CrewManager
+        from game.ship import Ship
+        from game.conditions import make_condition
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = EventManager(events_dir=tmp, cache_path=None)
+            ship = Ship()
+            manager.bind_state(ship, CrewManager())
+            failing = Event("resource", 1.0, "In Space", "Drive Failing", "Sparks.", [],
+                            conditions=[make_condition("system.jump_drive", "lt", "0.5")])
+            manager.add_event(failing)
+            ship.damage_system("jump_drive", 0.6)
+            manager.update()
+            
+            active = manager.get_active_events("In Space")
+            self.assertEqual(active, [failing])
+            manager.active_events.append(failing)
+            manager.resolve_event(failing, 0)
+            self.assertEqual(manager.event_stack, [failing])
+            self.assertEqual(manager.get_candidate_events("In Space"), [failing])
+            
+            ship.repair_system("jump_drive", 1.0)
+            manager.update()
+            self.assertEqual(manager.get_active_events("In Space"), [])
+
 if __name__ == "__main__":
     print("\nRunning event system tests...")
     unittest.main(verbosity=2) 
\ No newline at end of file
@@ -0,0 +1,93 @@
+import sys
+import os
+import unittest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from game.fleet import Fleet
+from game.rng import RandomService
+from game.ship import Ship
+
+class TestFleet(unittest.TestCase):
+    def setUp(self):
+        self.fleet = Fleet(capacity=2, random_service=RandomService(1))
+        self.player = Ship()
+        self.player.damage_system("shields", 0.5)
+        self.fleet.add(self.player)
+        self.traders = [Ship() for _ in range(3)]
+        for trader in self.traders:
+            self.fleet.add(trader, npc=True, wear_rate=0.01, fuel_burn=10.0)
+
+    def test_ships_read_and_write_their_row(self):
+        """Test ship attributes go through the fleet columns"""
+        self.assertEqual(len(self.fleet), 4)
+        self.assertEqual(self.player.systems["shields"], 0.5)
+        self.player.fuel -= 30
+        self.player.credits += 500
+        self.player.repair_system("shields", 0.2)
+        row = self.fleet.row(self.player)
+        self.assertEqual(self.fleet.fuel[row], 70.0)
+        self.assertEqual(self.fleet.credits[row], 1500)
+        self.assertAlmostEqual(self.fleet.systems[row, self.fleet.system_columns["shields"]], 0.7)
+        self.assertEqual(dict(self.player.systems)["engines"], 1.0)
+
+    def test_update_wears_and_burns_ships_underway(self):
+        """Test only ships underway wear and burn fuel, and empty tanks strand them"""
+        for trader in self.traders:
+            self.fleet.set_underway(trader)
+        stranded = self.fleet.update(ticks=5)
+        self.assertEqual(stranded, [])
+        self.assertEqual(self.player.fuel, 100.0)
+        self.assertEqual([trader.fuel for trader in self.traders], [50.0] * 3)
+        worn = self.fleet.systems[1:4]
+        self.assertTrue(np.all(worn < 1.0) and np.all(worn >= 0.9))
+        
+        self.assertEqual(self.fleet.update(ticks=5), self.traders)
+        self.assertFalse(self.fleet.underway[:4].any())
+
+    def test_repair_charges_credits(self):
+        """Test fleet repair restores health and skips ships that cannot pay"""
+        self.traders[0].credits = 0
+        self.fleet.damage("engines", 0.25)
+        repaired = self.fleet.repair(0.1, cost_per_point=2.0)
+        self.assertEqual(self.fleet.ships_at(repaired), [self.player] + self.traders[1:])
+        # Shields (0.5) and engines (0.75) each recover 10 points at 2 credits a point
+        self.assertEqual(self.player.credits, 960)
+        self.assertAlmostEqual(self.player.systems["engines"], 0.85)
+        self.assertEqual(self.traders[0].systems["engines"], 0.75)
+        self.assertEqual(self.fleet.needing_repair(0.8), [self.player, self.traders[0]])
+
+    def test_refuel_and_low_fuel(self):
+        """Test refuelling fills tanks for ships that can pay"""
+        self.fleet.burn_fuel(90.0)
+        self.assertEqual(len(self.fleet.low_on_fuel()), 4)
+        self.traders[2].credits = 10
+        self.fleet.refuel(price_per_ton=5.0)
+        self.assertEqual(self.fleet.low_on_fuel(), [self.traders[2]])
+        self.assertEqual(self.player.credits, 550)
+
+    def test_unknown_system_is_rejected_untouched(self):
+        """Test a ship with a system the fleet has no column for is refused before any change"""
+        ship = Ship()
+        ship.systems = {**ship.systems, "cloak": 0.5}
+        with self.assertRaises(ValueError):
+            self.fleet.add(ship)
+        self.assertIsNone(ship.fleet)
+        self.assertEqual(ship.systems["cloak"], 0.5)
+        self.assertEqual(len(self.fleet), 4)
+        self.assertNotIn(ship, self.fleet)
+
+    def test_remove_hands_back_state(self):
+        """Test a removed ship keeps its values and the last row fills the gap"""
+        self.player.fuel = 42.0
+        self.fleet.remove(self.player)
+        self.assertIsNone(self.player.fleet)
+        self.assertEqual(self.player.fuel, 42.0)
+        self.assertEqual(self.player.systems["shields"], 0.5)
+        self.assertIsInstance(self.player.systems, dict)
+        self.assertEqual(self.fleet.row(self.traders[2]), 0)
+        self.assertEqual(self.traders[2].fuel, 100.0)
+        self.assertNotIn(self.player, self.fleet)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import os
+import unittest
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from game.event_manager import Event
+from game.game import Game
+
+class TestGameLoop(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.game = Game(idle_timeout_ms=10)
+        self.calls = []
+        self.game.update = lambda: self.calls.append("update")
+        self.game.render = lambda: self.calls.append("render")
+        pygame.event.clear()
+        
+    def tearDown(self):
+        self.game.assets.close()
+        pygame.quit()
+        
+    def test_idle_frame_skips_update_and_render(self):
+        """Test that an idle frame with no input does no work"""
+        self.assertTrue(self.game.is_idle())
+        self.game.step()
+        self.assertEqual(self.calls, [])
+        
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1), rel=(1, 1), buttons=(0, 0, 0)))
+        self.game.step()
+        self.assertEqual(self.calls, ["render"])
+        
+    def test_space_toggles_time_advancement(self):
+        """Test that pressing space starts the simulation ticking and pressing it again stops it"""
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0))
+        self.game.step()
+        self.assertTrue(self.game.time_advancing)
+        self.assertEqual(self.calls, ["update", "render"])
+        
+        self.game.step()
+        self.assertEqual(self.calls, ["update", "render"] * 2)
+        
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0))
+        self.game.step()
+        self.assertFalse(self.game.time_advancing)
+        self.assertTrue(self.game.is_idle())
+        
+    def test_pending_timed_event_keeps_simulation_running(self):
+        """Test that a scheduled event is updated towards even while time is paused"""
+        self.game.event_manager.schedule_event_in(
+            Event("timed", 0.0, "Any", "Later", "Soon.", []), 1.0)
+        self.assertFalse(self.game.is_idle())
+        self.game.step()
+        self.assertEqual(self.calls, ["update", "render"])
+        
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import sys
+import os
+import unittest
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.market import Market
+from game.ship import Ship
+from game.world import World
+
+class TestMarket(unittest.TestCase):
+    def setUp(self):
+        self.market = Market(seed=9)
+        self.industrial = World("Regina", ["In", "Ht"], "A")
+        self.agricultural = World("Efate", ["Ag", "Ni"], "B")
+        
+    def test_goods_loaded(self):
+        """Test the trade goods tables load into arrays"""
+        self.assertEqual(len(self.market.goods), 6 + 35)
+        index = self.market.good_index["Radioactives"]
+        self.assertEqual(self.market.base_prices[index], 1_000_000)
+        self.assertEqual(self.market.purchase_dms[index, self.market.code_columns["Ni"]], 3)
+        self.assertEqual(list(self.market.purchase_multipliers[[0, 6, -1]]), [2.0, 1.0, 0.2])
+        
+    def test_prices_follow_modified_price_table(self):
+        """Test prices match the scalar Cepheus procedure"""
+        table = self.market.price_table(self.industrial, broker=1)
+        _, purchase_rolls, sale_rolls = self.market._world_rolls(self.industrial)
+        index = self.market.good_index["Advanced Electronics"]
+        # Purchase: roll + broker + largest purchase DM (In +3) - largest sale DM (none)
+        result = min(max(purchase_rolls[index] + 1 + 3, 2), 16)
+        expected = 100_000 * self.market.purchase_multipliers[result - 2]
+        self.assertAlmostEqual(table.purchase[index], expected)
+        result = min(max(sale_rolls[index] + 1 - 3, 2), 16)
+        self.assertAlmostEqual(table.sale[index], 100_000 * self.market.sale_multipliers[result - 2])
+        
+    def test_availability(self):
+        """Test common goods everywhere, trade goods by code, illegal goods on the black market"""
+        table = self.market.price_table(self.agricultural)
+        goods = self.market.good_index
+        self.assertTrue(table.available[goods["Basic Electronics"]])
+        self.assertTrue(table.available[goods["Grocery Products"]])
+        self.assertFalse(table.available[goods["Robots & Drones"]])
+        self.assertFalse(table.available[goods["Illicit Luxury Goods"]])
+        black = self.market.price_table(self.agricultural, black_market=True)
+        self.assertTrue(black.available[goods["Illicit Luxury Goods"]])
+        
+    def test_tables_cached_until_shift(self):
+        """Test per-world tables are reused until the market shifts"""
+        first = self.market.price_table(self.industrial)
+        self.assertIs(self.market.price_table(self.industrial), first)
+        self.market.shift(self.agricultural)
+        self.assertIs(self.market.price_table(self.industrial), first)
+        self.market.shift(self.industrial)
+        self.assertIsNot(self.market.price_table(self.industrial), first)
+        # Same seed, same world and same shift count give the same prices
+        again = Market(seed=9)
+        again.shift(self.industrial)
+        np.testing.assert_array_equal(again.price_table(self.industrial).purchase,
+                                      self.market.price_table(self.industrial).purchase)
+        
+    def test_routes_and_trading(self):
+        """Test route evaluation and buying and selling cargo"""
+        worlds = [World(f"World {i}", codes) for i, codes in
+                  enumerate([["Ag"], ["In", "Ri"], ["Ni", "Po"], []])]
+        routes = self.market.best_routes(self.industrial, worlds)
+        self.assertEqual(len(routes), 4)
+        purchase = self.market.price_table(self.industrial).purchase
+        for world, good, profit in routes:
+            sale = self.market.price_table(world).sale
+            index = self.market.good_index[good]
+            self.assertAlmostEqual(profit, sale[index] - purchase[index])
+            
+        ship = Ship()
+        ship.credits = 10_000_000
+        self.assertTrue(self.market.buy(ship, self.industrial, "Basic Electronics", 10))
+        self.assertFalse(self.market.buy(ship, self.industrial, "Grocery Products", 1))
+        self.assertEqual(ship.cargo, {"Basic Electronics": 10})
+        self.assertTrue(self.market.sell(ship, self.agricultural, "Basic Electronics", 10))
+        self.assertEqual(ship.cargo, {})
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,45 @@
+import sys
+import os
+import unittest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.metrics import Metrics
+
+class TestMetrics(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        metrics = Metrics()
+        with metrics.timer("game.update"):
+            pass
+        metrics.count("events.resolved")
+        metrics.end_frame()
+        self.assertEqual(metrics.timers, {})
+        self.assertEqual(metrics.counters, {})
+        self.assertEqual(metrics.frames, 0)
+
+    def test_timers_and_counters(self):
+        metrics = Metrics(enabled=True)
+        for _ in range(3):
+            with metrics.timer("game.update"):
+                pass
+        metrics.count("events.activated", 4)
+        metrics.count("events.activated")
+        timer = metrics.timers["game.update"]
+        self.assertEqual(timer.calls, 3)
+        self.assertGreater(timer.frame, 0.0)
+        self.assertEqual(metrics.counters, {"events.activated": 5})
+
+    def test_end_frame_folds_into_average(self):
+        metrics = Metrics(enabled=True)
+        with metrics.timer("game.render"):
+            pass
+        frame = metrics.timers["game.render"].frame
+        metrics.end_frame()
+        timer = metrics.timers["game.render"]
+        self.assertEqual(timer.frame, 0.0)
+        self.assertAlmostEqual(timer.average, frame * timer.SMOOTHING)
+        self.assertEqual(metrics.frames, 1)
+        self.assertEqual([name for name, _ in metrics.breakdown()], ["game.render"])
+        self.assertEqual(metrics.summary()["timers"]["game.render"]["calls"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+import os
+import pickle
+import unittest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.registry import Registry
+from game.ship import Ship
+
+class TestRegistry(unittest.TestCase):
+    def test_identity_not_equality(self):
+        """Test equal dicts are distinct members and removal takes the right one"""
+        first, second = {"name": "Nelegar"}, {"name": "Nelegar"}
+        registry = Registry([first, second])
+        self.assertEqual(len(registry), 2)
+        registry.remove(second)
+        self.assertIs(registry[0], first)
+        self.assertNotIn(second, registry)
+        self.assertFalse(registry.discard(second))
+        with self.assertRaises(ValueError):
+            registry.remove(second)
+
+    def test_handles_are_stable(self):
+        """Test handles survive other removals and are not reused"""
+        registry = Registry()
+        a, b, c = object(), object(), object()
+        handles = [registry.add(item) for item in (a, b, c)]
+        self.assertEqual(registry.add(b), handles[1])
+        registry.remove(a)
+        self.assertIs(registry.get(handles[2]), c)
+        self.assertIs(registry.pop_handle(handles[1]), b)
+        self.assertIsNone(registry.pop_handle(handles[1]))
+        self.assertNotIn(registry.add(a), handles)
+        self.assertEqual(list(registry), [c, a])
+        self.assertIs(registry[-1], a)
+
+    def test_list_compatibility(self):
+        """Test comparison with lists and pickling round trips"""
+        registry = Registry([{"name": "A"}, {"name": "B"}])
+        self.assertEqual(registry, [{"name": "A"}, {"name": "B"}])
+        self.assertEqual(registry[1], {"name": "B"})
+        restored = pickle.loads(pickle.dumps(registry))
+        self.assertIsInstance(restored, Registry)
+        self.assertEqual(restored, registry)
+
+    def test_ship_passengers(self):
+        """Test ships remove the exact passenger they were given"""
+        ship = Ship()
+        first, second = {"name": "Twin"}, {"name": "Twin"}
+        ship.add_passenger(first)
+        handle = ship.add_passenger(second)
+        ship.remove_passenger({"name": "Twin"})
+        self.assertEqual(len(ship.passengers), 2)
+        ship.remove_passenger(first)
+        self.assertIs(ship.passengers.get(handle), second)
+
+    def test_passenger_name_counts(self):
+        """Test ships count passengers by name as they board and leave"""
+        ship = Ship()
+        first, second = {"name": "Twin"}, {"name": "Twin"}
+        ship.add_passenger(first)
+        ship.add_passenger(first)
+        ship.add_passenger(second)
+        self.assertEqual(ship.passenger_names, {"Twin": 2})
+        ship.remove_passenger({"name": "Twin"})
+        ship.remove_passenger(first)
+        ship.remove_passenger(second)
+        self.assertEqual(ship.passenger_names, {})
+        ship.passengers = [{"name": "Ada"}, {"name": "Ada"}]
+        self.assertIsInstance(ship.passengers, Registry)
+        self.assertEqual(ship.passenger_names, {"Ada": 2})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import sys
+import os
+import unittest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.crew import CrewMember
+from game.event_manager import Event
+from game.rng import RandomService
+
+class TestRandomService(unittest.TestCase):
+    def test_streams_are_reproducible_and_independent(self):
+        """Test a stream's draws depend only on the root seed and its name"""
+        first = RandomService(5)
+        second = RandomService(5)
+        # Drawing from another stream first must not shift the crew stream
+        second.stream("events").random(100)
+        crew = [first.stream("crew").roll_2d6() for _ in range(10)]
+        self.assertEqual([second.stream("crew").roll_2d6() for _ in range(10)], crew)
+        self.assertNotEqual(first.stream("trade").random(10).tolist(),
+                            first.stream("events").random(10).tolist())
+        self.assertNotEqual(RandomService(6).stream("crew").roll_2d6_array(10).tolist(),
+                            RandomService(5).stream("crew").roll_2d6_array(10).tolist())
+
+    def test_bulk_rolls(self):
+        """Test 2D6 blocks stay in range and use the full distribution"""
+        rolls = RandomService(1).stream("crew").roll_2d6_array(10000)
+        self.assertEqual(rolls.min(), 2)
+        self.assertEqual(rolls.max(), 12)
+        self.assertAlmostEqual(rolls.mean(), 7.0, delta=0.1)
+
+    def test_state_round_trip(self):
+        """Test a restored service continues mid-block exactly where it was saved"""
+        service = RandomService(9)
+        events = service.stream("events")
+        crew = service.stream("crew")
+        events.random()
+        crew.roll_2d6()
+        state = service.get_state()
+        expected = ([events.random() for _ in range(5)], [crew.roll_2d6() for _ in range(5)])
+        
+        restored = RandomService()
+        restored.set_state(state)
+        self.assertEqual(([restored.stream("events").random() for _ in range(5)],
+                          [restored.stream("crew").roll_2d6() for _ in range(5)]), expected)
+        self.assertEqual(restored.seed_for("trade"), service.seed_for("trade"))
+
+    def test_spawned_seeds(self):
+        """Test parallel runs get distinct, reproducible seeds"""
+        seeds = RandomService(3).spawn_seeds(4)
+        self.assertEqual(len(set(seeds)), 4)
+        self.assertEqual(seeds, RandomService(3).spawn_seeds(4))
+
+    def test_callers_take_explicit_streams(self):
+        """Test skill checks and activation rolls are reproducible given a stream"""
+        member = CrewMember("Ana", {"Pilot": 1}, {})
+        event = Event("random", 0.5, "Any", "Coin Flip", "Maybe.", [])
+        def draws(seed):
+            service = RandomService(seed)
+            return ([member.skill_check("Pilot", 0, service.stream("crew")) for _ in range(20)],
+                    [event.should_activate("Docked", service.stream("events")) for _ in range(20)])
+        self.assertEqual(draws(2), draws(2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+import unittest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.rules_index import RulesIndex, StaleIndexError, build_index, tokenize
+
+SKILLS = """# Skills Rules
+
+Admin: The character is used to dealing with bureaucracies.
+
+Medic: The character is trained in first aid. Table: Healing Roll Result 2- Patient dies 8+ Patient recovers Table: Surgery Roll Result 10+ Limb saved
+"""
+
+SPACE = """# Space Rules
+
+Fuel for a jump is ten percent of the hull per parsec of jump distance.
+"""
+
+class TestRulesIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for section, text in (("skills", SKILLS), ("space", SPACE)):
+            os.makedirs(os.path.join(self.tmp.name, section))
+            with open(os.path.join(self.tmp.name, section, f"{section}.md"), "w") as f:
+                f.write(text)
+        self.index = RulesIndex(build_index(self.tmp.name))
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Jump-2 Drive, 10%"), ["jump", "2", "drive", "10"])
+
+    def test_search_returns_text_at_offsets(self):
+        results = self.index.search("jump parsec")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].kind, "paragraph")
+        self.assertTrue(results[0].text.startswith("Fuel for a jump"))
+        self.assertTrue(results[0].file.endswith("space.md"))
+
+    def test_search_requires_every_term(self):
+        self.assertEqual(self.index.search("jump medic"), [])
+        self.assertEqual(self.index.search("nonexistent"), [])
+        self.assertEqual(self.index.search(""), [])
+
+    def test_headings_and_tables_rank_first(self):
+        kinds = [entry.kind for entry in self.index.search("patient")]
+        self.assertEqual(kinds, ["table", "paragraph"])
+        self.assertEqual(self.index.search("skills")[0].kind, "heading")
+
+    def test_table_lookup(self):
+        table = self.index.table("Surgery")
+        self.assertEqual(table.text, "Table: Surgery Roll Result 10+ Limb saved")
+        self.assertTrue(self.index.table("Healing").text.startswith("Table: Healing"))
+        self.assertIsNone(self.index.table("Gunnery"))
+
+    def test_stale_when_markdown_changes(self):
+        self.assertFalse(self.index.stale)
+        path = os.path.join(self.tmp.name, "skills", "skills.md")
+        with open(path, "w") as f:
+            f.write("# Skill Rules\n\n# New\n\n" + SKILLS[len("# Skills Rules\n\n"):])
+        with self.assertRaises(StaleIndexError):
+            self.index.table("Surgery")
+        reopened = RulesIndex(os.path.join(self.tmp.name, "rules.idx"), rebuild=False)
+        self.assertTrue(reopened.stale)
+        with self.assertRaises(StaleIndexError):
+            reopened.search("patient")
+        reopened.close()
+        
+        # Opening normally rebuilds the index against the edited file
+        rebuilt = RulesIndex(os.path.join(self.tmp.name, "rules.idx"))
+        self.assertFalse(rebuilt.stale)
+        self.assertEqual(rebuilt.table("Surgery").text, "Table: Surgery Roll Result 10+ Limb saved")
+        rebuilt.close()
+        
+    def test_same_size_edit_is_stale(self):
+        path = os.path.join(self.tmp.name, "space", "space.md")
+        with open(path, "w") as f:
+            f.write(SPACE.replace("ten", "six"))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        edited = RulesIndex(os.path.join(self.tmp.name, "rules.idx"), rebuild=False)
+        self.assertTrue(edited.stale)
+        edited.close()
+        # Touching a file without changing it does not make the index stale
+        with open(path, "w") as f:
+            f.write(SPACE)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+        touched = RulesIndex(os.path.join(self.tmp.name, "rules.idx"), rebuild=False)
+        self.assertFalse(touched.stale)
+        touched.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.crew import CrewMember
+from game.event_manager import EventManager, Event
+from game.save import save_game, load_game, Autosaver, SaveFile, SaveError
+from game.simulation import Simulation
+
+def make_simulation(seed=None):
+    return Simulation(seed=seed, event_manager=EventManager(cache_path=None))
+
+class TestSaveGame(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "game.stsv")
+        self.simulation = make_simulation(seed=4)
+        ship = self.simulation.ship
+        ship.add_cargo("Ore", 12)
+        ship.add_passenger({"name": "Nelegar"})
+        ship.damage_system("jump_drive", 0.25)
+        ship.credits = 4200
+        medic = CrewMember("Ana", {"Medical": 2}, {"EDU": 9})
+        medic.relationships["Bo"] = 0.5
+        self.simulation.crew_manager.add_crew(medic)
+        ship.add_crew(medic)
+        
+    def tearDown(self):
+        self.tmp.cleanup()
+        
+    def test_round_trip(self):
+        """Test that ship, crew and event state survive a save and load"""
+        manager = self.simulation.event_manager
+        manager.active_events.append(manager.event_stack[1])
+        manager.schedule_event(Event("timed", 1.0, "Any", "Civil War", "War.", []), 20)
+        manager.update(5)
+        save_game(self.path, self.simulation)
+        
+        restored = make_simulation()
+        load_game(self.path, restored)
+        self.assertEqual(restored.ship.cargo, {"Ore": 12})
+        self.assertEqual(restored.ship.passengers, [{"name": "Nelegar"}])
+        self.assertEqual(restored.ship.systems["jump_drive"], 0.75)
+        self.assertEqual(restored.ship.credits, 4200)
+        # Crew members are shared between the ship and the crew manager
+        self.assertIs(restored.ship.crew[0], restored.crew_manager.crew[0])
+        self.assertEqual(restored.crew_manager.get_crew_with_skill("Medical", 2), restored.ship.crew)
+        self.assertEqual(restored.ship.crew[0].relationships, {"Bo": 0.5})
+        
+        events = restored.event_manager
+        self.assertEqual([e.title for e in events.event_stack], [e.title for e in manager.event_stack])
+        self.assertIs(events.active_events[0], events.event_stack[1])
+        self.assertEqual(events.game_time, 5)
+        self.assertEqual([e.title for e in events.update(15)], ["Civil War"])
+        # The batch activation generator continues where it left off
+        self.assertEqual(restored.event_manager.rng.random(), manager.rng.random())
+        
+    def test_crew_arrays_restore_in_bulk(self):
+        """Test the roster and relationship matrices load whole, keeping their row order"""
+        crew_manager = self.simulation.crew_manager
+        extras = [CrewMember(f"Hand {i}", {"Pilot": i % 3}, {"DEX": 7}) for i in range(20)]
+        for member in extras:
+            crew_manager.add_crew(member)
+        crew_manager.remove_crew(extras[0])
+        crew_manager.set_relationship(extras[5], extras[19], -0.7)
+        save_game(self.path, self.simulation)
+        
+        restored = make_simulation()
+        with mock.patch("game.save.CrewRoster.add", side_effect=AssertionError), \
+             mock.patch("game.save.RelationshipGraph.add", side_effect=AssertionError):
+            load_game(self.path, restored)
+        manager = restored.crew_manager
+        self.assertEqual([m.name for m in manager.roster.members],
+                         [m.name for m in crew_manager.roster.members])
+        self.assertEqual([m.name for m in manager.get_crew_with_skill("Pilot", 2)],
+                         [m.name for m in crew_manager.get_crew_with_skill("Pilot", 2)])
+        worst = manager.most_hostile_pairs(1)[0]
+        self.assertEqual((worst[0].name, worst[1].name, worst[2]), ("Hand 5", "Hand 19", -0.7))
+        # Joining after a load still links through the restored name index
+        bo = CrewMember("Bo", {}, {})
+        manager.add_crew(bo)
+        self.assertEqual(manager.relationships.get(manager.crew[0], bo), 0.5)
+        
+    def test_incremental_autosave(self):
+        """Test that autosaves append only changed sections"""
+        autosaver = Autosaver(self.path, self.simulation)
+        full_size = autosaver.save()
+        self.assertGreater(full_size, 0)
+        self.assertEqual(autosaver.save(), 0)
+        
+        self.simulation.ship.add_cargo("Ore", 1)
+        written = autosaver.save()
+        self.assertLess(written, full_size)
+        with SaveFile(self.path) as save:
+            self.assertEqual(save.records, 2)
+        
+        self.simulation.event_manager.add_event(Event("random", 0.1, "Docked", "Inspection", "Papers.", []))
+        autosaver.save()
+        restored = make_simulation()
+        load_game(self.path, restored)
+        self.assertEqual(restored.ship.cargo, {"Ore": 13})
+        self.assertEqual(restored.event_manager.event_stack[-1].title, "Inspection")
+        
+    def test_truncated_autosave_keeps_last_complete_record(self):
+        """Test that a record cut short mid-append is ignored rather than failing the load"""
+        autosaver = Autosaver(self.path, self.simulation)
+        autosaver.save()
+        self.simulation.ship.add_cargo("Ore", 1)
+        autosaver.save()
+        complete = os.path.getsize(self.path)
+        self.simulation.ship.add_cargo("Ore", 1)
+        autosaver.save()
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+        
+        with self.assertLogs("game.save", "WARNING"):
+            with SaveFile(self.path) as save:
+                self.assertEqual(save.records, 2)
+                self.assertEqual(save.end, complete)
+            restored = make_simulation()
+            load_game(self.path, restored)
+        self.assertEqual(restored.ship.cargo, {"Ore": 13})
+        
+    def test_failed_append_is_retried(self):
+        """Test that an autosave interrupted mid-write is overwritten by the next one"""
+        autosaver = Autosaver(self.path, self.simulation)
+        autosaver.save()
+        self.simulation.ship.add_cargo("Ore", 1)
+        def interrupted(f, blobs):
+            f.write(b"STSV")
+            raise OSError("disk full")
+        with mock.patch("game.save.write_record", interrupted):
+            with self.assertRaises(OSError):
+                autosaver.save()
+        
+        self.assertGreater(autosaver.save(), 0)
+        restored = make_simulation()
+        load_game(self.path, restored)
+        self.assertEqual(restored.ship.cargo, {"Ore": 13})
+        
+    def test_rejects_bad_file(self):
+        """Test that unreadable saves raise SaveError"""
+        Path(self.path).write_bytes(b"not a save file")
+        with self.assertRaises(SaveError):
+            load_game(self.path, make_simulation())
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
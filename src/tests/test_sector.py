@@ -0,0 +1,96 @@
+import sys
+import os
+import tempfile
+import unittest
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.sector import SectorMap, load_sector, subsector_of, to_cube, parse_hex, hex_distance
+from game.ship import Ship
+from game.world import World
+
+def distance(a, b):
+    return hex_distance(to_cube(*parse_hex(a)), to_cube(*parse_hex(b)))
+
+class TestSectorMap(unittest.TestCase):
+    def setUp(self):
+        self.sector = SectorMap()
+        # A chain of worlds one or two parsecs apart along row 01
+        for name, hex_code, starport in [("Alpha", "0101", "A"), ("Beta", "0201", "B"),
+                                         ("Gamma", "0401", "C"), ("Delta", "0601", "X"),
+                                         ("Epsilon", "0801", "A"), ("Zeta", "1001", "A")]:
+            self.sector.add_world(World(name, [], starport, hex_code))
+        
+    def names(self, route):
+        return [world.name for world in route] if route is not None else None
+        
+    def test_hex_geometry(self):
+        """Test Traveller hex distances and subsectors"""
+        self.assertEqual(distance("0101", "0201"), 1)
+        self.assertEqual(distance("0101", "0202"), 2)
+        self.assertEqual(distance("0201", "0102"), 1)
+        self.assertEqual(distance("0101", "0104"), 3)
+        self.assertEqual(subsector_of("0101"), "A")
+        self.assertEqual(subsector_of("0911"), "F")
+        self.assertEqual(subsector_of("3240"), "P")
+        found = {w.name: d for w, d in self.sector.worlds_within(self.sector.get("Gamma"), 2)}
+        self.assertEqual(found, {"Beta": 2, "Delta": 2})
+        
+    def test_plan_route(self):
+        """Test routes respect jump rating, fuel and refuelling stops"""
+        get = self.sector.get
+        self.assertEqual(self.names(self.sector.plan_route(get("Alpha"), get("Gamma"), 2, 100)),
+                         ["Alpha", "Beta", "Gamma"])
+        self.assertEqual(self.names(self.sector.plan_route(get("Alpha"), get("Gamma"), 3, 100)),
+                         ["Alpha", "Gamma"])
+        # Delta has no fuel, so a jump-2 ship cannot pass through it
+        self.assertIsNone(self.sector.plan_route(get("Alpha"), get("Zeta"), 2, 100))
+        self.assertEqual(self.names(self.sector.plan_route(get("Alpha"), get("Zeta"), 4, 100)),
+                         ["Alpha", "Gamma", "Epsilon", "Zeta"])
+        # Fuel aboard limits the first jump; the ship refuels at Beta
+        self.assertEqual(self.names(self.sector.plan_route(get("Alpha"), get("Gamma"), 3, 15, 100)),
+                         ["Alpha", "Beta", "Gamma"])
+        self.assertIsNone(self.sector.plan_route(get("Alpha"), get("Gamma"), 3, 5, 100))
+        
+    def test_incremental_invalidation(self):
+        """Test map changes only drop cached trees near the change"""
+        get = self.sector.get
+        self.sector.plan_route(get("Alpha"), get("Gamma"), 2, 100)
+        self.sector.plan_route(get("Zeta"), get("Epsilon"), 2, 100)
+        trees = self.sector._trees[(2, 2)]
+        self.assertEqual(set(trees), {"Alpha", "Zeta"})
+        # Refuelling at Delta opens the route, and only trees near Delta are dropped
+        self.sector.add_world(World("Far", [], "A", "3240"))
+        self.assertEqual(set(trees), {"Alpha", "Zeta"})
+        delta = get("Delta")
+        delta.starport = "B"
+        self.sector.update_world(delta)
+        self.assertEqual(self.names(self.sector.plan_route(get("Alpha"), get("Zeta"), 2, 100)),
+                         ["Alpha", "Beta", "Gamma", "Delta", "Epsilon", "Zeta"])
+        
+    def test_jump_and_refuel(self):
+        """Test jumping burns fuel and refuelling fills the tank"""
+        ship = Ship()
+        ship.location = "Alpha"
+        ship.jump_rating = 3
+        self.assertFalse(self.sector.jump(ship, self.sector.get("Delta")))
+        self.assertTrue(self.sector.jump(ship, self.sector.get("Gamma")))
+        self.assertEqual((ship.location, ship.fuel), ("Gamma", 70.0))
+        self.assertTrue(self.sector.refuel(ship))
+        self.assertEqual(ship.fuel, 100.0)
+        
+    def test_load_sector(self):
+        """Test loading worlds from XML"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sector.xml"
+            path.write_text("""<sector name="Spinward Test">
+    <world name="Regina" hex="1910" starport="A" trade_codes="Hi Ri" gas_giant="true" />
+    <world name="Efate" hex="1705" starport="A" trade_codes="Hi In" />
+</sector>""")
+            sector = load_sector(str(path))
+        self.assertEqual(sector.name, "Spinward Test")
+        self.assertEqual(sector.world_at("1910").trade_codes, ("Hi", "Ri"))
+        self.assertTrue(sector.get("Regina").gas_giant)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,74 @@
+import sys
+import os
+import math
+import unittest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.event_manager import EventManager, Event
+from game.simulation import ShipOperations, Simulation
+
+class TestSimulation(unittest.TestCase):
+    def make_manager(self) -> EventManager:
+        manager = EventManager(cache_path=None)
+        manager.add_event(Event("random", 0.5, "In Space", "Distress Signal", "A faint beacon.", []))
+        manager.add_event(Event("crew", 0.25, "Any", "Crew Conflict", "Tempers flare.", []))
+        return manager
+    
+    def test_run_counts_ticks_and_triggers(self):
+        """Test that a headless run ticks and tallies triggers per context"""
+        simulation = Simulation(seed=3, context_schedule=["In Space", "Docked"],
+                                event_manager=self.make_manager())
+        counts = simulation.run(1000)
+        self.assertEqual(simulation.tick_count, 1000)
+        # The rate 1.0 test events fire on every tick of their context
+        self.assertEqual(counts["In Space"]["Test Space Event"], 500)
+        self.assertEqual(counts["Docked"]["Test Dock Event"], 500)
+        self.assertNotIn("Distress Signal", counts["Docked"])
+        self.assertGreater(counts["Docked"]["Crew Conflict"], 0)
+    
+    def test_long_context_rolls_in_blocks(self):
+        """Test that a long stretch in one context is rolled at most ROLL_BLOCK ticks at a time"""
+        simulation = Simulation(seed=1, event_manager=self.make_manager())
+        sizes = []
+        roll = simulation.event_manager.roll_active_events
+        simulation.event_manager.roll_active_events = lambda context, ticks: (
+            sizes.append(ticks) or roll(context, ticks))
+        counts = simulation.run(2500)
+        self.assertEqual(sizes, [1024, 1024, 452])
+        self.assertEqual(counts["In Space"]["Test Space Event"], 2500)
+    
+    def test_operations_fly_and_service_the_ship(self):
+        """Test travel contexts wear the ship and burn fuel, and docking pays to restore it"""
+        operations = ShipOperations(wear_rate=0.01, fuel_burn=1.0, fuel_price=2.0, repair_cost=1.0)
+        simulation = Simulation(seed=2, context_schedule=["In Space"] * 10 + ["Weekly"],
+                                event_manager=self.make_manager(), operations=operations)
+        ship = simulation.ship
+        simulation.run(11)
+        self.assertEqual(ship.fuel, 90.0)
+        self.assertLess(min(ship.systems.values()), 1.0)
+        self.assertFalse(simulation.has_pending_work())
+        
+        simulation.context_schedule = ["Docked"]
+        worn = sum(1.0 - health for health in ship.systems.values())
+        simulation.run(1)
+        self.assertEqual(ship.fuel, 100.0)
+        self.assertEqual(min(ship.systems.values()), 1.0)
+        self.assertEqual(ship.credits, 1000 - 20 - math.ceil(round(worn * 100, 6)))
+    
+    def test_seed_is_reproducible(self):
+        """Test that the same seed and schedule give the same run"""
+        schedule = lambda tick: "In Space" if (tick // 10) % 2 == 0 else "Docked"
+        first = Simulation(seed=11, context_schedule=schedule, event_manager=self.make_manager())
+        second = Simulation(seed=11, context_schedule=schedule, event_manager=self.make_manager())
+        self.assertEqual(first.run(500), second.run(500))
+    
+    def test_on_event_callback(self):
+        """Test that triggered events are passed to the callback with their tick"""
+        seen = []
+        simulation = Simulation(seed=0, context_schedule=["Docked"], event_manager=self.make_manager(),
+                                on_event=lambda tick, context, event: seen.append((tick, event.title)))
+        simulation.run(3)
+        self.assertIn((2, "Test Dock Event"), seen)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,85 @@
+import sys
+import os
+import unittest
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from game.crew import CrewMember
+from game.event_manager import Event
+from game.metrics import metrics
+from game.ship import Ship
+from game.ui import UIManager
+
+class FakeGame:
+    def __init__(self):
+        self.ship = Ship()
+
+class TestUIManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        
+    @classmethod
+    def tearDownClass(cls):
+        pygame.quit()
+        
+    def setUp(self):
+        self.screen = pygame.Surface((1024, 768))
+        self.game = FakeGame()
+        self.ui = UIManager(self.game)
+        
+    def test_only_changed_panels_redraw(self):
+        """Test dirty-rect tracking per panel"""
+        self.assertEqual(len(self.ui.render(self.screen)), 3)
+        self.assertEqual(self.ui.render(self.screen), [])
+        
+        self.game.ship.add_cargo("Ore", 5)
+        dirty = self.ui.render(self.screen)
+        self.assertEqual([rect.y for rect in dirty], [400])
+        
+        self.game.ship.add_crew(CrewMember("Ana", {}, {}))
+        self.game.ship.damage_system("shields", 0.5)
+        self.assertEqual([rect.y for rect in self.ui.render(self.screen)], [0, 200])
+        
+    def test_screen_switch_redraws(self):
+        """Test switching to an event screen and back redraws everything"""
+        self.ui.render(self.screen)
+        self.ui.active_event = Event("random", 1.0, "Any", "Pirates", "Ships approach.",
+                                     [{"text": "Run", "outcome": "flee"}])
+        self.assertEqual(self.ui.render(self.screen), [pygame.Rect(0, 0, 1024, 768)])
+        self.assertEqual(self.ui.render(self.screen), [])
+        self.ui.active_event = None
+        self.assertEqual(len(self.ui.render(self.screen)), 3)
+        
+    def test_overlay_toggle(self):
+        """Test the F3 overlay draws over the panels and collects metrics only while shown"""
+        self.ui.render(self.screen)
+        self.ui.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3))
+        try:
+            self.assertTrue(metrics.enabled)
+            dirty = self.ui.render(self.screen)
+            self.assertEqual(len(dirty), 4)
+            self.assertEqual(dirty[-1], pygame.Rect(1024 - UIManager.OVERLAY_WIDTH, 0,
+                                                    UIManager.OVERLAY_WIDTH, 768))
+            self.assertIn("Frame: 0.0 ms", self.ui.overlay_lines())
+            
+            # Redrawing a panel underneath also redraws the overlay
+            self.game.ship.add_cargo("Ore", 5)
+            self.assertEqual([rect.y for rect in self.ui.render(self.screen)], [400, 0])
+        finally:
+            self.ui.toggle_overlay()
+        self.assertFalse(metrics.enabled)
+        self.assertEqual(len(self.ui.render(self.screen)), 3)
+        
+    def test_label_cache_lru(self):
+        """Test labels are reused and evicted least recently used first"""
+        self.ui.labels.max_size = 2
+        first = self.ui.labels.get("a")
+        self.ui.labels.get("b")
+        self.assertIs(self.ui.labels.get("a"), first)
+        self.ui.labels.get("c")
+        self.assertEqual(list(self.ui.labels.surfaces), [("a", (255, 255, 255)), ("c", (255, 255, 255))])
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)